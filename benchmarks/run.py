@@ -0,0 +1,130 @@
+"""
+Benchmark das etapas da simulação sobre dados sintéticos.
+
+Exemplo:
+    python -m benchmarks.run --sizes 100 1000 10000 100000 1000000 --output bench.json
+
+Para cada tamanho mede o tempo (melhor de `--repeat` execuções) e o pico de memória
+(tracemalloc, em uma execução separada) de cada etapa, salvando tudo em JSON para
+comparar entre commits.
+"""
+import argparse
+import datetime
+import json
+import platform
+import subprocess
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from benchmarks.synthetic import generate
+from src.data_loaders import Data
+from src.sim import Indexes, Simulator
+
+
+def _stages(demand_df, curriculum_df, camaras_df):
+    """Etapas do pipeline, na ordem de simulate_by_component_and_practice."""
+    estado = {}
+
+    def load():
+        estado['data'] = Data.from_frames(demand_df, curriculum_df, camaras_df)
+        return len(demand_df), len(estado['data'].demand_df)
+
+    def demand_by_component():
+        data = estado['data']
+        data.clear_cache()
+        estado['df'] = data.get_demand_by_component(use_elective=False)
+        return len(data.demand_df), len(estado['df'])
+
+    def index():
+        estado['df_ip'] = Indexes.IP_TEORICA(estado['df'].copy())
+        return len(estado['df']), len(estado['df_ip'])
+
+    def distribute_by_practice():
+        simulator = Simulator(estado['data'])
+        total = int(len(estado['df_ip']) * 1.5)
+        estado['df_pratica'], estado['remaining'] = simulator.distribute_by_practice(estado['df_ip'].copy(), total)
+        return len(estado['df_ip']), len(estado['df_pratica'])
+
+    def distribute():
+        simulator = Simulator(estado['data'])
+        df = simulator.distribute(estado['df_pratica'].copy(), estado['remaining'], 'IP', min_by_compulsory=1)
+        return len(estado['df_pratica']), len(df)
+
+    return [
+        ('Data.from_frames', load),
+        ('Data.get_demand_by_component', demand_by_component),
+        ('Indexes.IP_TEORICA', index),
+        ('Simulator.distribute_by_practice', distribute_by_practice),
+        ('Simulator.distribute', distribute),
+    ]
+
+
+def run_size(n_rows, repeat, seed):
+    demand_df, curriculum_df, camaras_df = generate(n_rows, seed=seed)
+    tempos = {}
+    linhas = {}
+    for _ in range(repeat):
+        for name, stage in _stages(demand_df, curriculum_df, camaras_df):
+            inicio = time.perf_counter()
+            linhas[name] = stage()
+            tempos[name] = min(tempos.get(name, np.inf), time.perf_counter() - inicio)
+
+    picos = {}
+    for name, stage in _stages(demand_df, curriculum_df, camaras_df):
+        tracemalloc.start()
+        stage()
+        picos[name] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return [
+        {
+            'n_rows': n_rows,
+            'n_components': len(curriculum_df),
+            'stage': name,
+            'seconds': tempos[name],
+            'peak_bytes': picos[name],
+            'rows_in': int(linhas[name][0]),
+            'rows_out': int(linhas[name][1]),
+        }
+        for name in tempos
+    ]
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10 ** k for k in range(2, 7)])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='bench_output.json')
+    args = parser.parse_args(argv)
+
+    resultados = []
+    for n_rows in args.sizes:
+        novos = run_size(n_rows, args.repeat, args.seed)
+        resultados.extend(novos)
+        for r in novos:
+            print(f"{r['n_rows']:>9} {r['stage']:<36} {r['seconds']:>9.4f}s {r['peak_bytes'] / 2 ** 20:>9.1f} MiB")
+
+    relatorio = {
+        'commit': _git_commit(),
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'results': resultados,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(relatorio, f, indent=2)
+    print(f"Resultados salvos em '{args.output}'.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""
+Gerador de dados sintéticos com a mesma estrutura de data/cleaned/<study>:
+currículo (pré-requisitos separados por ';', fração de carga horária prática),
+demanda por turma/subturma em vários períodos e tabela de câmaras.
+"""
+import pandas as pd
+import numpy as np
+
+CAMARAS = [
+    'Matemática', 'Negócios', 'Computação', 'PLE', 'CTS', 'Física',
+    'Química', 'Meio Ambiente', 'Engenharias', 'Inglês'
+]
+
+# Proporções observadas em data/cleaned/study2: ~11 linhas de turma por componente
+ROWS_PER_COMPONENT = 11
+ELECTIVE_FRACTION = 0.1
+# Semestres gerados por tamanho (as linhas de cada componente se espalham entre eles)
+N_PERIODOS = 4
+
+# Distribuição dos códigos de horário em study2: dias, turno e aulas de cada código,
+# e quantos códigos (encontros) cada turma tem
+HORARIO_DIAS = {'35': 0.28, '24': 0.1, '46': 0.06, '246': 0.02, '2': 0.09, '3': 0.11, '4': 0.1, '5': 0.09, '6': 0.12, '7': 0.03}
+HORARIO_TURNOS = {'M': 0.32, 'T': 0.39, 'N': 0.29}
+HORARIO_AULAS = {'12': 0.28, '34': 0.39, '56': 0.29, '1234': 0.02, '3456': 0.02}
+# O turno N só vai até a 4ª aula
+HORARIO_AULAS_NOTURNO = {'12': 0.47, '34': 0.5, '1234': 0.03}
+HORARIO_CODIGOS = {1: 0.85, 2: 0.15}
+
+
+def generate_curriculum(n_components, rng):
+    codigos = np.array([f"ECT{i:04d}" for i in range(1000, 1000 + n_components)])
+    ch_total = rng.choice([30, 60, 90], size=n_components, p=[0.25, 0.6, 0.15])
+    pratico = rng.random(n_components) < 0.3
+    ch_pratica = np.where(pratico, np.minimum(ch_total, rng.choice([15, 30], size=n_components)), 0)
+
+    # Pré-requisitos só entre componentes anteriores (grafo acíclico), 0 a 3 por componente
+    n_prereqs = np.minimum(rng.integers(0, 4, size=n_components), np.arange(n_components))
+    pre_requisitos = []
+    for i, k in enumerate(n_prereqs):
+        if k == 0:
+            pre_requisitos.append(np.nan)
+        else:
+            escolhidos = rng.choice(i, size=k, replace=False)
+            pre_requisitos.append(';'.join(codigos[escolhidos]))
+
+    obrigatorio_generalista = (rng.random(n_components) < 0.4).astype(int)
+    obrigatorio_enfase = np.where(obrigatorio_generalista == 1, 14, rng.integers(0, 9, size=n_components))
+    return pd.DataFrame({
+        'periodo': rng.integers(1, 11, size=n_components),
+        'codigo': codigos,
+        'nome': np.char.add('COMPONENTE ', codigos),
+        'pre_requisitos': pre_requisitos,
+        'ch_total': ch_total,
+        'ch_pratica': ch_pratica,
+        'obrigatorio_generalista': obrigatorio_generalista,
+        'obrigatorio_enfase': obrigatorio_enfase,
+        'camara': rng.choice(CAMARAS, size=n_components),
+    })
+
+
+def _choice(distribution, size, rng):
+    valores = np.array(list(distribution))
+    pesos = np.array(list(distribution.values()))
+    return rng.choice(valores, size=size, p=pesos / pesos.sum())
+
+
+def generate_horarios(n_rows, rng):
+    """Horários como '35N12' ou '24M34 6T12', sorteados pelas frequências de study2."""
+    def codigo():
+        turnos = _choice(HORARIO_TURNOS, n_rows, rng)
+        aulas = np.where(turnos == 'N', _choice(HORARIO_AULAS_NOTURNO, n_rows, rng), _choice(HORARIO_AULAS, n_rows, rng))
+        return np.char.add(np.char.add(_choice(HORARIO_DIAS, n_rows, rng), turnos), aulas)
+
+    horarios = codigo()
+    dois = _choice(HORARIO_CODIGOS, n_rows, rng) == 2
+    return np.where(dois, np.char.add(np.char.add(horarios, ' '), codigo()), horarios)
+
+
+def generate_demand(curriculum_df, n_rows, rng, n_periodos=N_PERIODOS):
+    n_components = len(curriculum_df)
+    n_electives = max(1, int(n_components * ELECTIVE_FRACTION))
+    codigos = np.concatenate([
+        curriculum_df['codigo'].to_numpy(),
+        np.array([f"ECT{i:04d}" for i in range(90000, 90000 + n_electives)])
+    ])
+    pratico = np.concatenate([curriculum_df['ch_pratica'].to_numpy() > 0, np.zeros(n_electives, dtype=bool)])
+
+    componente = rng.integers(0, len(codigos), size=n_rows)
+    periodos = np.array([f"{2000 + p // 2}-{p % 2 + 1}" for p in range(n_periodos)])
+    turma_principal = rng.integers(1, 9, size=n_rows)
+    # Componentes práticos têm subturmas (01A, 01B, ...)
+    sufixo = np.where(pratico[componente], rng.choice(list('ABCDE'), size=n_rows), '')
+    turma = np.char.add(np.char.zfill(turma_principal.astype(str), 2), sufixo)
+    capacidade = rng.choice([25, 50, 100], size=n_rows)
+    return pd.DataFrame({
+        'codigo': codigos[componente],
+        'nome': np.char.add('COMPONENTE ', codigos[componente]),
+        'turma': turma,
+        'horario': generate_horarios(n_rows, rng),
+        'capacidade': capacidade,
+        'matriculados': rng.binomial(capacidade, 0.8),
+        'periodo': periodos[rng.integers(0, n_periodos, size=n_rows)],
+    })
+
+
+def generate_camaras(rng):
+    return pd.DataFrame({'camara': CAMARAS, 'n_professores': rng.integers(5, 21, size=len(CAMARAS))})
+
+
+def generate(n_rows, seed=0, n_periodos=N_PERIODOS):
+    """
+    Returns:
+        tuple: (demand_df, curriculum_df, camaras_df) com cerca de `n_rows` linhas de turma
+        distribuídas em `n_periodos` semestres.
+    """
+    rng = np.random.default_rng(seed)
+    n_components = max(10, n_rows // ROWS_PER_COMPONENT)
+    curriculum_df = generate_curriculum(n_components, rng)
+    demand_df = generate_demand(curriculum_df, n_rows, rng, n_periodos)
+    return demand_df, curriculum_df, generate_camaras(rng)
@@ -1,6 +1,7 @@
 from src.sim import Simulator
 from src.data_loaders import Data
 from src.sim import Indexes
+from src.result_cache import ResultCache
 from src.plotter import plot_simulation_by_area, plot_simulation_by_component, plot_component_demand_distribution
 
 data = Data(
@@ -9,7 +10,7 @@ data = Data(
     camaras_file_path="data/cleaned/study2/camaras.xlsx"
 )
 
-s = Simulator(data)
+s = Simulator(data, cache=ResultCache())
 
 df_component = s.simulate_by_component_and_practice(
     Indexes.IP_TEORICA,
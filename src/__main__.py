@@ -0,0 +1,170 @@
+"""
+Linha de comando do simulador de bolsas de monitoria.
+
+Exemplo:
+    python -m src simulate --study study2 --total 80 --index IP_TEORICA --no-plots
+    python -m src cache list
+
+Dependências pesadas (camelot, matplotlib/seaborn) só são importadas nos caminhos
+que as usam.
+"""
+import argparse
+import inspect
+import os
+import sys
+
+# Mesmo valor de src.result_cache.DEFAULT_ROOT, sem importar pandas para montar o parser
+DEFAULT_CACHE_DIR = os.path.join('.cache', 'resultados')
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m src', description='Simulador de bolsas de monitoria da ECT.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    simulate = subparsers.add_parser('simulate', help='Executa a simulação por componente e por câmara.')
+    simulate.add_argument('--study', default='study2', help="Pasta em data/cleaned com as entradas (padrão: study2).")
+    simulate.add_argument('--demanda', help='Planilha de demanda (sobrepõe --study).')
+    simulate.add_argument('--curriculo', help='Planilha do currículo (sobrepõe --study).')
+    simulate.add_argument('--camaras', help='Planilha das câmaras (sobrepõe --study).')
+    simulate.add_argument('--total', type=int, required=True, help='Total de bolsas a distribuir.')
+    simulate.add_argument('--index', default='IP_TEORICA', help='Nome da função de índice em Indexes.')
+    simulate.add_argument('--min-by-compulsory', type=int, default=1)
+    simulate.add_argument('--min-by-project', type=int, default=0)
+    simulate.add_argument('--max-anual-monitor', type=int, default=600)
+    simulate.add_argument('--strategy', choices=('hamilton', 'dhondt', 'sainte-lague', 'huntington-hill'), default='hamilton',
+                          help='Rateio teórico: maiores restos (padrão) ou método de divisores com restrições.')
+    simulate.add_argument('--projetos', help='Planilha de projetos para --min-by-project (padrão: projetos.xlsx do estudo, se existir).')
+    simulate.add_argument('--output-dir', help='Pasta dos resultados (padrão: results/<study>).')
+    simulate.add_argument('--format', choices=('xlsx', 'parquet', 'csv'), default='xlsx',
+                          help="Formato dos resultados: bolsas.xlsx com as abas 'componente' e 'camara', ou um diretório bolsas/ com um arquivo por aba.")
+    simulate.add_argument('--no-plots', action='store_true', help='Modo em lote: não gera gráficos.')
+    simulate.add_argument('--quiet', action='store_true', help='Não imprime as tabelas resultantes.')
+    simulate.add_argument('--trace', metavar='ARQUIVO', help='Salva o trace das etapas (Chrome/Perfetto JSON) e imprime o resumo.')
+    simulate.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help=f"Cache de resultados (padrão: {DEFAULT_CACHE_DIR}).")
+    simulate.add_argument('--no-cache', action='store_true', help='Recalcula mesmo que o resultado esteja no cache.')
+    simulate.set_defaults(func=run_simulate)
+
+    cache = subparsers.add_parser('cache', help='Lista ou limpa o cache de resultados de simulação.')
+    cache.add_argument('action', choices=('list', 'prune'))
+    cache.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help=f"Pasta do cache (padrão: {DEFAULT_CACHE_DIR}).")
+    cache.add_argument('--max-mb', type=float, default=0,
+                       help='prune: mantém as entradas usadas mais recentemente até este tamanho (padrão: 0, remove todas).')
+    cache.set_defaults(func=run_cache)
+    return parser
+
+
+def run_simulate(args):
+    from src.data_loaders import Data
+    from src.instrumentation import Tracer
+    from src.result_cache import ResultCache
+    from src.result_writer import ResultWriter
+    from src.sim import Indexes, Simulator
+
+    index_function = getattr(Indexes, args.index, None)
+    if index_function is None or args.index.startswith('_'):
+        print(f"ERRO: Índice '{args.index}' não existe em Indexes.")
+        return 2
+    # Só índices que recebem o DataFrame por componente; IP_TEORICA_ARRAY recebe
+    # vetores de proporções e pesos, que a linha de comando não tem como validar
+    if not _is_dataframe_index(index_function):
+        validos = ', '.join(_dataframe_indexes(Indexes))
+        print(f"ERRO: '{args.index}' não é uma função de índice sobre o DataFrame por componente. Use um de: {validos}.")
+        return 2
+
+    base = os.path.join('data', 'cleaned', args.study)
+    data = Data(
+        demand_file_path=args.demanda or os.path.join(base, 'demanda.xlsx'),
+        curriculum_file_path=args.curriculo or os.path.join(base, 'curriculo.xlsx'),
+        camaras_file_path=args.camaras or os.path.join(base, 'camaras.xlsx'),
+        tracer=Tracer() if args.trace else None
+    )
+    output_dir = args.output_dir or os.path.join('results', args.study)
+    os.makedirs(output_dir, exist_ok=True)
+
+    constraints = None
+    projetos = args.projetos or os.path.join(base, 'projetos.xlsx')
+    if args.strategy != 'hamilton' and os.path.exists(projetos):
+        from src.data_loaders import load_projects
+        constraints = {'projects': load_projects(projetos)}
+
+    cache = None if args.no_cache else ResultCache(args.cache_dir)
+    simulator = Simulator(data, MAX_ANUAL_MONITOR=args.max_anual_monitor, cache=cache)
+    output_path = os.path.join(output_dir, 'bolsas.xlsx' if args.format == 'xlsx' else 'bolsas')
+    with ResultWriter(output_path, format=args.format) as writer:
+        df_component = simulator.simulate_by_component_and_practice(
+            index_function,
+            total=args.total,
+            min_by_compulsory=args.min_by_compulsory,
+            min_by_project=args.min_by_project,
+            writer=writer,
+            strategy=args.strategy,
+            constraints=constraints
+        )
+        df_area = Simulator.aggregate_by_area(df_component)
+        writer.write('camara', df_area)
+        restricoes = df_component.attrs.get('restricoes')
+        if restricoes is not None:
+            writer.write('restricoes', restricoes.astype({'alvo': str}))
+    print(f"Resultados salvos em '{output_path}'.")
+    if cache is not None:
+        stats = cache.stats()
+        print(f"Cache de resultados: {stats['hits']} acerto(s), {stats['misses']} falha(s), {stats['entries']} entrada(s).")
+
+    if not args.quiet:
+        print("SIMULAÇÃO POR COMPONENTE: ")
+        print(df_component.to_string())
+        print("\n\n\n")
+        print("SIMULAÇÃO POR ÁREA: ")
+        print(df_area.to_string())
+        if restricoes is not None:
+            print("\n\nRESTRIÇÕES ATIVAS: ")
+            print(restricoes.to_string())
+
+    if args.trace:
+        data.tracer.export_chrome_trace(args.trace)
+        print(f"Trace salvo em '{args.trace}'.")
+        data.tracer.print_summary()
+
+    if not args.no_plots:
+        from src.plotter import generate_all_simulation_visualizations
+        generate_all_simulation_visualizations(df_component, df_area)
+    return 0
+
+
+def _is_dataframe_index(function):
+    try:
+        return callable(function) and len(inspect.signature(function).parameters) == 1
+    except (TypeError, ValueError):
+        return False
+
+
+def _dataframe_indexes(indexes):
+    return [nome for nome in vars(indexes) if not nome.startswith('_') and _is_dataframe_index(getattr(indexes, nome))]
+
+
+def run_cache(args):
+    from src.result_cache import ResultCache
+
+    cache = ResultCache(args.cache_dir)
+    if args.action == 'list':
+        entries = cache.entries()
+        if entries.empty:
+            print(f"Cache vazio em '{args.cache_dir}'.")
+            return 0
+        colunas = [c for c in ('chave', 'bytes', 'ultimo_uso', 'indice', 'total', 'min_by_compulsory', 'min_by_project',
+                               'MAX_ANUAL_MONITOR', 'strategy', 'linhas') if c in entries.columns]
+        print(entries[colunas].to_string(index=False))
+        print(f"\n{len(entries)} entrada(s), {entries['bytes'].sum() / 2**20:.2f} MiB.")
+        return 0
+    removidas = cache.prune(int(args.max_mb * 2**20))
+    print(f"{len(removidas)} entrada(s) removida(s) de '{args.cache_dir}'.")
+    return 0
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,196 @@
+import pandas as pd
+import numpy as np
+import heapq
+
+# Divisores d(k) da k-ésima bolsa (k = bolsas já recebidas) de cada método
+DIVISOR_METHODS = {
+    'dhondt': lambda k: k + 1.0,
+    'sainte-lague': lambda k: k + 0.5,
+    'huntington-hill': lambda k: np.sqrt(k * (k + 1.0)),
+}
+
+
+def _seats_above(weights, divisor, method):
+    """Quantas prioridades weights/d(k), k = 0, 1, ..., são >= divisor (vetorizado)."""
+    x = weights / divisor
+    if method == 'dhondt':
+        seats = np.floor(x)
+    elif method == 'sainte-lague':
+        seats = np.floor(x + 0.5)
+    else:
+        seats = np.floor((np.sqrt(1 + 4 * x * x) - 1) / 2) + 1
+    return np.where(weights > 0, seats, 0)
+
+
+class DivisorAllocator:
+    """
+    Rateio por método de divisores (D'Hondt, Sainte-Laguë ou Huntington-Hill) com
+    restrições, atribuindo uma bolsa por vez ao item de maior prioridade peso/d(k)
+    numa fila de prioridade, em O(n log n + total log n).
+
+    Restrições:
+        - piso e teto por item (componente);
+        - piso e teto por câmara (soma dos itens da câmara);
+        - piso por projeto (soma dos itens do projeto).
+
+    Os pisos são atendidos antes do rateio livre (componentes, depois câmaras, depois
+    projetos), sempre pela maior prioridade, e os tetos são respeitados em todas as
+    etapas. Empates vão para o item que aparece primeiro.
+    """
+
+    def __init__(self, method='dhondt'):
+        if method not in DIVISOR_METHODS:
+            raise ValueError(f"Método de divisores desconhecido: {method}")
+        self.method = method
+        self.divisor = DIVISOR_METHODS[method]
+
+    def priority(self, weight, seats):
+        d = self.divisor(seats)
+        if weight <= 0:
+            return 0.0
+        return np.inf if d == 0 else weight / d
+
+    def allocate(self, weights, total, floors=None, caps=None, camaras=None, camara_floors=None,
+                 camara_caps=None, projects=None, project_floors=None):
+        """
+        Args:
+            weights (array): Pesos (n,) dos itens (ex.: IP).
+            total (int): Bolsas a distribuir.
+            floors (array): Piso (n,) por item. Opcional.
+            caps (array): Teto (n,) por item. Opcional.
+            camaras (array): Câmara (n,) de cada item, para as restrições por câmara.
+            camara_floors (dict): {camara: piso}.
+            camara_caps (dict): {camara: teto}.
+            projects (dict): {projeto: posições dos itens do projeto}.
+            project_floors (dict | int): {projeto: piso}, ou um piso único para todos.
+
+        Returns:
+            tuple: (numpy.ndarray, pandas.DataFrame) com a alocação (n,) e as
+            restrições ativas (tipo, alvo, limite, alocado).
+        """
+        weights = np.nan_to_num(np.asarray(weights, dtype=float))
+        n = len(weights)
+        total = int(total)
+        floors = np.zeros(n, dtype=np.int64) if floors is None else np.asarray(floors, dtype=np.int64)
+        caps = np.full(n, np.iinfo(np.int64).max) if caps is None else np.asarray(caps, dtype=np.int64)
+        floors = np.minimum(floors, caps)
+        camaras = np.full(n, None, dtype=object) if camaras is None else np.asarray(camaras, dtype=object)
+        camara_caps = dict(camara_caps or {})
+        camara_floors = dict(camara_floors or {})
+        projects = dict(projects or {})
+        if not isinstance(project_floors, dict):
+            project_floors = {project: int(project_floors or 0) for project in projects}
+
+        self._allocation = np.zeros(n, dtype=np.int64)
+        self._remaining = total
+        self._weights = weights
+        self._caps = caps
+        self._camaras = camaras
+        self._camara_caps = camara_caps
+        self._camara_sums = {camara: 0 for camara in camara_caps}
+        self._binding = []
+        self._capped = set()
+        self._camara_capped = set()
+        self._threshold = np.inf
+
+        # 1. Pisos por componente, pela ordem de prioridade enquanto houver bolsas
+        for i in np.argsort(-weights, kind='stable'):
+            if floors[i] > 0:
+                self.__give(i, min(floors[i], self.__room(i)))
+
+        # 2. Pisos por câmara e 3. por projeto
+        groups = [('piso_camara', camara, np.flatnonzero(camaras == camara), floor) for camara, floor in camara_floors.items()]
+        groups += [('piso_projeto', project, np.asarray(projects[project], dtype=np.int64), floor) for project, floor in project_floors.items()]
+        for tipo, alvo, members, floor in groups:
+            falta = int(floor) - int(self._allocation[members].sum())
+            if falta > 0:
+                self.__greedy(members, falta)
+                self._binding.append((tipo, alvo, floor, int(self._allocation[members].sum())))
+
+        # 4. Rateio livre
+        if self._remaining > 0:
+            if not camara_caps:
+                self.__jump_start()
+            self.__greedy(np.arange(n), self._remaining, free=True)
+            if self._remaining > 0:
+                # Sobraram bolsas: todo item com peso recebeu o que os tetos permitem
+                self._threshold = 0.0
+
+        # Piso de componente ativo: não atendido, ou acima do que o rateio livre daria
+        # (item sem peso, ou a última bolsa do piso com prioridade menor que a última livre)
+        for i in np.flatnonzero(floors > 0):
+            acima = weights[i] <= 0 or self.priority(weights[i], floors[i] - 1) < self._threshold
+            if self._allocation[i] < floors[i] or (self._allocation[i] == floors[i] and acima):
+                self._binding.insert(0, ('piso_componente', i, floors[i], self._allocation[i]))
+        for i in sorted(self._capped):
+            self._binding.append(('teto_componente', i, caps[i], self._allocation[i]))
+        for camara in sorted(self._camara_capped, key=str):
+            self._binding.append(('teto_camara', camara, camara_caps[camara], self._camara_sums[camara]))
+        if self._remaining > 0:
+            self._binding.append(('sobra', None, total, total - self._remaining))
+        report = pd.DataFrame(self._binding, columns=['tipo', 'alvo', 'limite', 'alocado'])
+        return self._allocation, report
+
+    def __room(self, i):
+        room = self._caps[i] - self._allocation[i]
+        camara = self._camaras[i]
+        if camara in self._camara_caps:
+            room = min(room, self._camara_caps[camara] - self._camara_sums[camara])
+        return max(0, min(room, self._remaining))
+
+    def __give(self, i, seats):
+        self._allocation[i] += seats
+        self._remaining -= seats
+        camara = self._camaras[i]
+        if camara in self._camara_sums:
+            self._camara_sums[camara] += seats
+
+    def __greedy(self, members, seats, free=False):
+        # Fila de prioridade: (-prioridade, posição); empate fica com a menor posição
+        heap = [(-self.priority(self._weights[i], self._allocation[i]), i)
+                for i in members.tolist() if self._weights[i] > 0]
+        heapq.heapify(heap)
+        while seats > 0 and self._remaining > 0 and heap:
+            prioridade, i = heapq.heappop(heap)
+            if self._allocation[i] >= self._caps[i]:
+                self._capped.add(i)
+                continue
+            camara = self._camaras[i]
+            if camara in self._camara_caps and self._camara_sums[camara] >= self._camara_caps[camara]:
+                self._camara_capped.add(camara)
+                continue
+            self.__give(i, 1)
+            seats -= 1
+            if free:
+                self._threshold = -prioridade
+            heapq.heappush(heap, (-self.priority(self._weights[i], self._allocation[i]), i))
+
+    def __jump_start(self):
+        # Sem tetos por câmara, o resultado sequencial contém todas as prioridades
+        # acima de qualquer divisor cujo conjunto (limitado pelos tetos e pelo que já
+        # foi dado) caiba no saldo; esse conjunto pode ser aplicado de uma vez. Uma
+        # bolsa a menos por item absorve erros de arredondamento; o heap completa.
+        atual = self._allocation
+        budget = self._remaining + atual.sum()
+        if not (self._weights > 0).any():
+            return
+
+        def alocacao(divisor, margem=0):
+            seats = np.maximum(_seats_above(self._weights, divisor, self.method) - margem, 0)
+            return np.maximum(atual, np.minimum(self._caps, seats).astype(np.int64))
+
+        low, high = 0.0, self._weights.max() * 2 + 1
+        if alocacao(high).sum() > budget:
+            return
+        with np.errstate(divide='ignore', over='ignore'):
+            for _ in range(100):
+                mid = (low + high) / 2
+                if mid <= low or mid >= high:
+                    break
+                if alocacao(mid).sum() > budget:
+                    low = mid
+                else:
+                    high = mid
+        inicial = alocacao(high, margem=1)
+        self._remaining -= int((inicial - atual).sum())
+        self._allocation = inicial
@@ -0,0 +1,99 @@
+import numpy as np
+
+
+def compulsory_floors(obrigatorio_generalista, matriculados, totals, min_by_compulsory=0):
+    """
+    Pré-alocação de 1 bolsa para cada obrigatória do generalista com matriculados,
+    aplicada apenas aos orçamentos maiores que o número de obrigatórias.
+
+    Args:
+        obrigatorio_generalista (array): Indicador (n,) de obrigatória do generalista.
+        matriculados (array): Matriculados (n,) por componente.
+        totals (array): Orçamentos (m,).
+        min_by_compulsory (int): Se 0, não há pré-alocação.
+
+    Returns:
+        numpy.ndarray: Matriz (n, m) de bolsas pré-alocadas.
+    """
+    obrigatorio = np.asarray(obrigatorio_generalista) == 1
+    elegivel = obrigatorio & (np.asarray(matriculados) != 0)
+    totals = np.atleast_1d(np.asarray(totals))
+    ativo = (totals > np.sum(obrigatorio)) & (min_by_compulsory > 0)
+    return np.where(ativo[None, :], elegivel[:, None], 0).astype(np.int64)
+
+
+def descending_order(values):
+    """
+    Permutação de DataFrame.sort_values(ascending=False) aplicada a cada linha de
+    `values` (n_linhas, n). O rateio acontece nessa ordem, que define os desempates.
+    """
+    n = values.shape[1]
+    ordem = values[:, ::-1].argsort(axis=1, kind='quicksort')
+    return (n - 1 - ordem)[:, ::-1]
+
+
+def largest_remainder(weights, totals, floors=None):
+    """
+    Método de Hamilton (maiores restos) para vários orçamentos de uma só vez.
+
+    As bolsas pré-alocadas em `floors` são descontadas de cada orçamento e o saldo
+    é dividido proporcionalmente aos pesos; sobras vão para os maiores resíduos,
+    com empates resolvidos pela ordem dos componentes (como em Series.nlargest).
+
+    Args:
+        weights (array): Pesos (n,) ou (n, m), um vetor por orçamento.
+        totals (array): Orçamento escalar ou vetor (m,).
+        floors (array): Pré-alocação (n,) ou (n, m). Opcional.
+
+    Returns:
+        numpy.ndarray: Matriz (n, m) de bolsas por componente e orçamento.
+    """
+    totals = np.atleast_1d(np.asarray(totals))
+    weights = np.asarray(weights, dtype=float)
+    if weights.ndim == 1:
+        weights = weights[:, None]
+    n, m = weights.shape[0], totals.shape[0]
+    # Layout (m, n): cada orçamento é uma linha contígua, com a mesma soma que o pandas faria
+    pesos = np.ascontiguousarray(np.broadcast_to(weights, (n, m)).T)
+    if floors is None:
+        pisos = np.zeros((m, n), dtype=np.int64)
+    else:
+        floors = np.asarray(floors, dtype=np.int64)
+        pisos = np.broadcast_to(floors if floors.ndim == 2 else floors[:, None], (n, m)).T
+    vagas = totals - pisos.sum(axis=1)
+
+    soma = pesos.sum(axis=1, keepdims=True)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        proporcao = np.where(soma > 0, pesos / soma, 0.0)
+    ideal = proporcao * vagas[:, None]
+    base = np.floor(ideal).astype(np.int64)
+    residuo = ideal - base
+    restantes = vagas - base.sum(axis=1)
+
+    ordem = np.argsort(-residuo, axis=1, kind='stable')
+    posicao = np.empty_like(ordem)
+    np.put_along_axis(posicao, ordem, np.arange(n)[None, :], axis=1)
+    extra = posicao < restantes[:, None]
+    return (pisos + base + extra).T
+
+
+def alabama_paradox(allocation, totals):
+    """
+    Indica onde um componente perde bolsa quando o orçamento aumenta.
+
+    Args:
+        allocation (array): Matriz (n, m) retornada por largest_remainder.
+        totals (array): Orçamentos (m,) correspondentes às colunas.
+
+    Returns:
+        numpy.ndarray: Matriz booleana (n, m); True na coluna do orçamento em que o
+        componente recebeu menos do que no orçamento imediatamente menor.
+    """
+    totals = np.asarray(totals)
+    ordem = np.argsort(totals, kind='stable')
+    ordenada = np.asarray(allocation)[:, ordem]
+    perdas = np.zeros(ordenada.shape, dtype=bool)
+    perdas[:, 1:] = ordenada[:, 1:] < ordenada[:, :-1]
+    resultado = np.empty_like(perdas)
+    resultado[:, ordem] = perdas
+    return resultado
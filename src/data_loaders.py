@@ -1,27 +1,279 @@
 import pandas as pd
-from io import StringIO
+import hashlib
+import os
 import re
+import time
 import numpy as np
-import camelot
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from src.xlsx_cache import read_excel_cached
+from src.instrumentation import NULL_TRACER
+from src.prerequisites import PrerequisiteGraph
+from src.timetable import parse_horarios, peak_load, weekly_hours
+from src.schema import CAMARAS_SCHEMA, CURRICULUM_SCHEMA, DEMAND_SCHEMA, apply_schema, decode, fill_category, memory_report, share_categories
+from src.emphasis import TRILHAS, N_TRILHAS, masks_from_columns, parse_grade, popcount, unpack
+
+
+# Assinaturas de pré-requisitos cujos ciclos já foram avisados neste processo
+_CYCLES_WARNED = set()
+
+
+def _copy_on_write_enabled():
+    if int(pd.__version__.split('.')[0]) >= 3:
+        return True
+    return pd.get_option('mode.copy_on_write') is True
+
+class DataLoadError(Exception):
+    """
+    Falha ao carregar ou pré-processar entradas de Data, com todas as entradas que
+    falharam (e não só a primeira).
+
+    Attributes:
+        failures (list): [{'entrada': 'demanda' | 'curriculo' | 'camaras', 'arquivo': ..., 'erro': ...}].
+    """
+
+    def __init__(self, failures):
+        self.failures = list(failures)
+        linhas = [f"- {f['entrada']} ({f['arquivo']}): {f['erro']}" for f in self.failures]
+        super().__init__("ERRO: Falha ao carregar as entradas:\n" + "\n".join(linhas))
+
 
 class Data:
-    
-    def __init__(self, demand_file_path, curriculum_file_path, camaras_file_path):
+
+    # Entrada, atributo com o DataFrame e etapa de pré-processamento
+    INPUTS = (
+        ('curriculo', 'curriculum_df', 'pre_process_curriculum'),
+        ('demanda', 'demand_df', 'pre_process_demand'),
+        ('camaras', 'camaras_df', 'pre_process_camaras'),
+    )
+
+    def __init__(self, demand_file_path, curriculum_file_path, camaras_file_path, use_file_cache=True, periodos=None, tracer=None, compact=True, concurrent=False):
+        """
+        Args:
+            concurrent (bool): Lê as três entradas em paralelo (threads), pré-processando
+                cada uma assim que fica pronta.
+        """
+        self.__init_state(demand_file_path, curriculum_file_path, camaras_file_path, use_file_cache, periodos, tracer, compact)
+        self.concurrent = concurrent
+        self.load_data()
+
+    @classmethod
+    def from_frames(cls, demand_df, curriculum_df, camaras_df, periodos=None, tracer=None, compact=True):
+        """
+        Cria um Data a partir de DataFrames em memória (ex.: dados sintéticos ou
+        partições), sem arquivos de origem. Cópias dos DataFrames recebem o mesmo
+        pré-processamento de load_data.
+        """
+        data = cls.__new__(cls)
+        data.__init_state(None, None, None, False, periodos, tracer, compact)
+        if periodos is not None:
+            demand_df = demand_df[demand_df['periodo'].astype(str).isin([str(p) for p in periodos])].reset_index(drop=True)
+        data.set_frames(demand_df.copy(), curriculum_df.copy(), camaras_df.copy())
+        return data
+
+    def __init_state(self, demand_file_path, curriculum_file_path, camaras_file_path, use_file_cache, periodos, tracer, compact):
         self.demand_file_path = demand_file_path
+        self.periodos = periodos
         self.curriculum_file_path = curriculum_file_path
         self.camaras_file_path = camaras_file_path
-        self.load_data()
+        self.use_file_cache = use_file_cache
+        self._load_records = []
+        self._demand_cache = {}
+        self._cache_state = None
+        # Versão dos DataFrames de entrada: muda em set_frames/load_data e em invalidate
+        self._frames_version = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # Instrumentação por etapa (src.instrumentation.Tracer); desligada por padrão
+        self.tracer = tracer if tracer is not None else NULL_TRACER
+        self.prerequisites = None
+        self._prerequisites_signature = None
+        # Tipos compactos na carga (src.schema)
+        self.compact = compact
+        self._memory_report = None
+        self.concurrent = False
+        self._load_errors = {}
 
     def load_data(self):
-        self.demand_df = self.load_df_from_xlsx(self.demand_file_path)
-        self.curriculum_df = self.load_df_from_xlsx(self.curriculum_file_path)
-        self.camaras_df = self.load_df_from_xlsx(self.camaras_file_path)
-        assert self.curriculum_df is not None, "ERRO: Currículo não carregado"
-        assert self.demand_df is not None, "ERRO: Demanda não carregada"
-        assert self.camaras_df is not None, "ERRO: Câmaras não carregadas"
-        self.pre_process_curriculum()
-        self.pre_process_demand()
-        self.pre_process_camaras()
+        self._load_records = []
+        self._load_errors = {}
+        if self.concurrent:
+            self.__load_concurrent()
+            return
+        self.set_frames(
+            self.load_demand(),
+            self.load_df_from_xlsx(self.curriculum_file_path),
+            self.load_df_from_xlsx(self.camaras_file_path)
+        )
+
+    def __input_paths(self):
+        return {
+            'demanda': self.demand_file_path,
+            'curriculo': self.curriculum_file_path,
+            'camaras': self.camaras_file_path,
+        }
+
+    def __load_failure(self, entrada, erro=None):
+        arquivo = self.__input_paths()[entrada]
+        if erro is None:
+            erro = self._load_errors.get(str(arquivo), 'não carregado')
+        return {'entrada': entrada, 'arquivo': arquivo, 'erro': erro}
+
+    def __pre_process(self, entrada):
+        for nome, attr, pre_process in self.INPUTS:
+            if nome == entrada:
+                df = getattr(self, attr)
+                with self.tracer.stage(f"Data.{pre_process}", rows_in=len(df)) as stage:
+                    getattr(self, pre_process)()
+                    stage['rows_out'] = len(df)
+
+    def __load_concurrent(self):
+        loaders = {
+            'demanda': self.load_demand,
+            'curriculo': lambda: self.load_df_from_xlsx(self.curriculum_file_path),
+            'camaras': lambda: self.load_df_from_xlsx(self.camaras_file_path),
+        }
+        attrs = {nome: attr for nome, attr, _ in self.INPUTS}
+
+        def load_and_pre_process(entrada):
+            df = loaders[entrada]()
+            if df is None:
+                return self.__load_failure(entrada)
+            # Cada thread só escreve o atributo e o estado do pré-processamento da sua entrada
+            setattr(self, attrs[entrada], df)
+            self.__pre_process(entrada)
+            return None
+
+        failures = []
+        with self.tracer.stage('Data.load_data (concorrente)'):
+            with ThreadPoolExecutor(max_workers=len(loaders)) as executor:
+                futuros = {executor.submit(load_and_pre_process, entrada): entrada for entrada in loaders}
+                for futuro in as_completed(futuros):
+                    try:
+                        failure = futuro.result()
+                    except Exception as e:
+                        failure = self.__load_failure(futuros[futuro], f"{type(e).__name__}: {e}")
+                    if failure is not None:
+                        failures.append(failure)
+        if failures:
+            ordem = [nome for nome, _, _ in self.INPUTS]
+            raise DataLoadError(sorted(failures, key=lambda f: ordem.index(f['entrada'])))
+        self.__finish_frames()
+
+    def set_frames(self, demand_df, curriculum_df, camaras_df):
+        self.demand_df = demand_df
+        self.curriculum_df = curriculum_df
+        self.camaras_df = camaras_df
+        failures = [self.__load_failure(nome) for nome, attr, _ in self.INPUTS if getattr(self, attr) is None]
+        if failures:
+            raise DataLoadError(failures)
+        # Mesmo erro estruturado do modo concorrente, com todas as etapas que falharam
+        for nome, _, _ in self.INPUTS:
+            try:
+                self.__pre_process(nome)
+            except Exception as e:
+                failures.append(self.__load_failure(nome, f"{type(e).__name__}: {e}"))
+        if failures:
+            raise DataLoadError(failures)
+        self.__finish_frames()
+
+    def __finish_frames(self):
+        if self.compact:
+            self.__compact_frames()
+        self._sources_signature = self.__get_sources_signature()
+        self.invalidate()
+
+    def __compact_frames(self):
+        antes = {'demanda': self.demand_df, 'curriculo': self.curriculum_df, 'camaras': self.camaras_df}
+        with self.tracer.stage('Data.compact_frames', rows_in=len(self.demand_df)) as stage:
+            self.demand_df = apply_schema(self.demand_df, DEMAND_SCHEMA)
+            self.curriculum_df = apply_schema(self.curriculum_df, CURRICULUM_SCHEMA)
+            self.camaras_df = apply_schema(self.camaras_df, CAMARAS_SCHEMA)
+            # Categorias comuns: o join da demanda com o currículo compara inteiros
+            share_categories([self.demand_df, self.curriculum_df], 'codigo')
+            stage['rows_out'] = len(self.demand_df)
+        depois = {'demanda': self.demand_df, 'curriculo': self.curriculum_df, 'camaras': self.camaras_df}
+        self._memory_report = memory_report(antes, depois)
+
+    def memory_report(self):
+        """
+        Memória de cada DataFrame de entrada antes e depois dos tipos compactos, ou
+        None se Data foi criado com compact=False.
+        """
+        return self._memory_report
+
+    def clear_cache(self):
+        self._demand_cache = {}
+        self._cache_state = None
+
+    def invalidate(self):
+        """
+        Descarta as tabelas em cache depois de alterar demand_df, curriculum_df ou
+        camaras_df no lugar (ex.: data.demand_df.loc[...] = ...). Trocar um DataFrame
+        inteiro, ou incluir e remover colunas, é detectado sem esta chamada.
+        """
+        self._frames_version += 1
+        self.clear_cache()
+
+    def cache_info(self):
+        return {
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'entries': len(self._demand_cache)
+        }
+
+    def __get_sources_signature(self):
+        signature = []
+        for file_path in (self.demand_file_path, self.curriculum_file_path, self.camaras_file_path):
+            if file_path is None:
+                signature.append(None)
+                continue
+            if os.path.isdir(file_path):
+                from src.demand_store import DemandStore
+                file_path = os.path.join(file_path, DemandStore.MANIFEST)
+            try:
+                stat = os.stat(file_path)
+                signature.append((str(file_path), stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append((str(file_path), None, None))
+        return tuple(signature)
+
+    def frames_signature(self):
+        """Hash do conteúdo e dos tipos dos três DataFrames de entrada."""
+        return self.__get_frames_signature()
+
+    def __get_frames_signature(self):
+        digest = hashlib.sha1()
+        for df in (self.demand_df, self.curriculum_df, self.camaras_df):
+            digest.update(repr((tuple(df.columns), tuple(map(str, df.dtypes)))).encode())
+            digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+        return digest.hexdigest()
+
+    def __get_frames_state(self):
+        # Barato a cada consulta: versão, identidade, forma e colunas, sem ler os valores
+        return (self._frames_version,) + tuple(
+            (id(df), df.shape, tuple(df.columns), tuple(map(str, df.dtypes)))
+            for df in (self.demand_df, self.curriculum_df, self.camaras_df)
+        )
+
+    def __get_cached(self, key, build):
+        # Arquivos de origem alterados em disco: recarrega (e invalida o cache)
+        if self.__get_sources_signature() != self._sources_signature:
+            self.load_data()
+        # Dataframes trocados em memória ou invalidate(): descarta as tabelas calculadas
+        state = self.__get_frames_state()
+        if state != self._cache_state:
+            self.clear_cache()
+            self._cache_state = state
+        if key in self._demand_cache:
+            self.cache_hits += 1
+        else:
+            self.cache_misses += 1
+            with self.tracer.stage(f"Data.build_demand_by_{key[0]}", rows_in=len(self.demand_df)) as stage:
+                self._demand_cache[key] = build()
+                stage['rows_out'] = len(self._demand_cache[key])
+        # Cópia preguiçosa com copy-on-write; cópia profunda caso contrário,
+        # para que funções de índice que alteram o df não corrompam o cache
+        return self._demand_cache[key].copy(deep=not _copy_on_write_enabled())
 
     def pre_process_camaras(self):
         pass
@@ -29,33 +281,101 @@ class Data:
     def pre_process_curriculum(self):
         df = self.curriculum_df
         df[['ch_total', 'ch_pratica']] = df[['ch_total', 'ch_pratica']].fillna(0)
-        all_prereqs_list = df[~df['pre_requisitos'].isna()]['pre_requisitos'].str.cat(sep=';').split(';')
-        unique_prereqs = set(all_prereqs_list)
-        df['eh_pre_requisito'] = df['codigo'].isin(unique_prereqs)
+        graph = self.get_prerequisite_graph()
+        # Um aviso por currículo distinto, e não a cada carga, recarga ou from_frames
+        if self._prerequisites_signature not in _CYCLES_WARNED:
+            _CYCLES_WARNED.add(self._prerequisites_signature)
+            for codigos in graph.cycles():
+                print(f"AVISO: Ciclo de pré-requisitos entre {', '.join(codigos)}.")
+        df['eh_pre_requisito'] = self.prerequisites.lookup(df['codigo'], 'direct') > 0
+        if 'origem_pdf_grade' in df.columns:
+            # Máscara de 16 bits com as trilhas em que o componente é obrigatório (src.emphasis)
+            generalista = df['obrigatorio_generalista'] if 'obrigatorio_generalista' in df.columns else None
+            df['mascara_obrigatorio'] = parse_grade(df['origem_pdf_grade'], generalista)
+            df['obrigatorio_trilhas'] = popcount(df['mascara_obrigatorio'].to_numpy())
         df['pratica'] = df['ch_pratica'] > 0
         df['ch_teorica'] = df['ch_total']-df['ch_pratica']
         
 
+    def get_compulsory_matrix(self):
+        """
+        Matriz booleana componente x trilha (generalista e ênfases) de obrigatoriedade,
+        ou None se o currículo não tiver 'origem_pdf_grade'.
+        """
+        if 'mascara_obrigatorio' not in self.curriculum_df.columns:
+            return None
+        df = self.curriculum_df.drop_duplicates(subset=['codigo'])
+        return pd.DataFrame(unpack(df['mascara_obrigatorio'].to_numpy()), index=df['codigo'], columns=TRILHAS)
+
+    def get_prerequisite_graph(self):
+        """
+        Grafo de pré-requisitos do currículo, reconstruído apenas se 'codigo' ou
+        'pre_requisitos' mudarem.
+        """
+        columns = self.curriculum_df[['codigo', 'pre_requisitos']]
+        signature = hashlib.sha1(pd.util.hash_pandas_object(columns.astype(str), index=False).to_numpy().tobytes()).hexdigest()
+        if self.prerequisites is None or signature != self._prerequisites_signature:
+            self.prerequisites = PrerequisiteGraph(columns['codigo'], columns['pre_requisitos'])
+            self._prerequisites_signature = signature
+        return self.prerequisites
+
     def pre_process_demand(self):
         df = self.demand_df
 
+    def load_report(self):
+        return pd.DataFrame(self._load_records, columns=['arquivo', 'cache', 'segundos'])
+
+    def load_demand(self):
+        """
+        Carrega a demanda de uma planilha ou de um DemandStore (diretório), lendo
+        apenas as partições de `self.periodos` quando definidos.
+        """
+        if not os.path.isdir(self.demand_file_path):
+            df = self.load_df_from_xlsx(self.demand_file_path)
+            if df is not None and self.periodos is not None:
+                df = df[df['periodo'].astype(str).isin([str(p) for p in self.periodos])].reset_index(drop=True)
+            return df
+        from src.demand_store import DemandStore
+        try:
+            inicio = time.perf_counter()
+            with self.tracer.stage('Data.load_demand') as stage:
+                df = DemandStore(self.demand_file_path).load(self.periodos)
+                stage['rows_out'] = len(df)
+            self._load_records.append({'arquivo': str(self.demand_file_path), 'cache': 'parquet', 'segundos': time.perf_counter() - inicio})
+            return df
+        except Exception as e:
+            print(f"Ocorreu um erro inesperado ao carregar o armazém de demanda '{self.demand_file_path}': {e}")
+            self._load_errors[str(self.demand_file_path)] = f"{type(e).__name__}: {e}"
+        return None
+
     def load_df_from_xlsx(self, file_path):
         try:
-            df = pd.read_excel(file_path)
+            with self.tracer.stage(f"Data.load_df_from_xlsx:{os.path.basename(str(file_path))}") as stage:
+                df, record = read_excel_cached(file_path, use_cache=self.use_file_cache)
+                stage['rows_out'] = len(df)
+                stage['cache'] = record['cache']
+            self._load_records.append(record)
             return df
         except FileNotFoundError:
             print(f"ERRO: O arquivo '{file_path}' não foi encontrado.")
             print("Por favor, verifique se o nome e o caminho do arquivo estão corretos.")
+            self._load_errors[str(file_path)] = "arquivo não encontrado"
         except Exception as e:
             print(f"Ocorreu um erro inesperado durante o processamento: {e}")
+            self._load_errors[str(file_path)] = f"{type(e).__name__}: {e}"
         return None
 
-    def get_demand_by_area(self, use_elective=False):
-        df_per_component = self.get_demand_by_component(use_elective=use_elective)
+    def get_demand_by_area(self, use_elective=False, matriculados=None):
+        override = _matriculados_override(matriculados)
+        key = ('area', use_elective, _override_signature(override))
+        return self.__get_cached(key, lambda: self.__build_demand_by_area(use_elective, override))
+
+    def __build_demand_by_area(self, use_elective, override):
+        df_per_component = self.get_demand_by_component(use_elective=use_elective, matriculados=override)
         numeric_columns_to_sum = [
             'matriculados', 'n_turmas', 'n_subturmas',
             'ch_teorica', 'ch_pratica', 'ch_total', 'pre_requisito', "n_componentes",
-            'obrigatorio_generalista', 'obrigatorio_enfase'
+            'obrigatorio_generalista', 'obrigatorio_enfase', 'obrigatorio_trilhas'
         ]
         agg_dict = {col: 'sum' for col in numeric_columns_to_sum if col in df_per_component.columns}
         if 'n_professores' in df_per_component.columns:
@@ -80,19 +400,68 @@ class Data:
             df['prop_ch_total'] = 0
         df['prop_pre_requisito'] = df['pre_requisito']/self.curriculum_df['codigo'].count()
         df['prop_forca_trabalho'] = df['n_professores']/self.camaras_df['n_professores'].sum()
-        df['prop_obrigatorio'] = (df['obrigatorio_generalista']+df['obrigatorio_enfase'])/(df['obrigatorio_enfase'].max()+1)
-
-    def get_demand_by_component(self, use_elective=False):
+        if 'obrigatorio_trilhas' in df.columns:
+            # Cobertura média das 16 trilhas por componente (na câmara, média dos componentes)
+            df['prop_obrigatorio'] = df['obrigatorio_trilhas'] / (N_TRILHAS * df['n_componentes'])
+        else:
+            df['prop_obrigatorio'] = (df['obrigatorio_generalista']+df['obrigatorio_enfase'])/(df['obrigatorio_enfase'].max()+1)
+
+    def get_timetable_by_area(self, use_elective=False):
+        """
+        Horas de contato e pico de turmas simultâneas por câmara e período, a partir
+        da coluna 'horario' da demanda (ver src.timetable).
+
+        Returns:
+            pandas.DataFrame: periodo, camara, n_turmas, horas_semanais,
+            pico_turmas_simultaneas e horario_pico.
+        """
+        return self.__get_cached(('horario', use_elective), lambda: self.__build_timetable_by_area(use_elective))
+
+    def __build_timetable_by_area(self, use_elective):
+        camaras = self.curriculum_df.drop_duplicates(subset=['codigo']).set_index('codigo')['camara']
+        df = self.demand_df[['codigo', 'periodo', 'horario']].copy()
+        df['camara'] = df['codigo'].map(camaras)
+        if use_elective:
+            df['camara'] = fill_category(df['camara'], 'Não definida')
+        else:
+            df = df[df['codigo'].isin(camaras.index)].reset_index(drop=True)
+        masks = parse_horarios(df['horario'])
+        df['horas_semanais'] = weekly_hours(masks)
+        keys = df[['periodo', 'camara']]
+        summary_df = df.groupby(['periodo', 'camara'], sort=True, dropna=False, observed=True).agg(
+            n_turmas=('codigo', 'size'),
+            horas_semanais=('horas_semanais', 'sum'),
+        ).reset_index()
+        pico = peak_load(masks, keys)
+        return decode(summary_df.merge(pico, on=['periodo', 'camara'], how='left'))
+
+    def get_demand_by_component(self, use_elective=False, matriculados=None):
+        """
+        Demanda agregada por componente.
+
+        Args:
+            use_elective (bool): Inclui componentes fora da grade.
+            matriculados: Valores que substituem os matriculados observados (ex.: uma
+                previsão de src.forecast): Series ou dict {codigo: valor}, ou o DataFrame
+                de forecast (soma de 'previsao' por codigo). Componentes ausentes
+                mantêm o valor observado.
+        """
+        override = _matriculados_override(matriculados)
+        key = ('componente', use_elective, _override_signature(override))
+        return self.__get_cached(key, lambda: self.__build_demand_by_component(use_elective, override))
+
+    def __build_demand_by_component(self, use_elective, override=None):
         demand_df = self.demand_df.copy()
         demand_df['turma_principal'] = demand_df['turma'].astype(str).str.extract(r'(\d+)').fillna('0')
         target_demand_df = demand_df
         if not use_elective:
             curriculum_codes = self.curriculum_df['codigo'].unique()
             target_demand_df = demand_df[demand_df['codigo'].isin(curriculum_codes)].copy()
+        trilhas = ['obrigatorio_trilhas'] if 'obrigatorio_trilhas' in self.curriculum_df.columns else []
         curriculum_info = self.curriculum_df[[
             'codigo', 'nome', 'camara', 'ch_teorica', 'ch_pratica', 
             'obrigatorio_generalista', 'obrigatorio_enfase'
-        ]].drop_duplicates(subset=['codigo']).rename(columns={'ch_pratica': 'carga_horaria_pratica_base'}) 
+        ] + trilhas].drop_duplicates(subset=['codigo']).rename(columns={'ch_pratica': 'carga_horaria_pratica_base'}) 
         
         demand_with_info = pd.merge(
             target_demand_df,
@@ -108,63 +477,159 @@ class Data:
             demand_with_info['nome_x']
         )
         demand_with_info.drop(columns=['nome_x', 'nome_y'], inplace=True)
-        demand_with_info[['ch_teorica', 'carga_horaria_pratica_base', 'obrigatorio_generalista', 'obrigatorio_enfase']] = \
-            demand_with_info[['ch_teorica', 'carga_horaria_pratica_base', 'obrigatorio_generalista', 'obrigatorio_enfase']].fillna(0)
-        demand_with_info['camara'] = demand_with_info['camara'].fillna('Não definida')
-        def aggregate_component(group):
-            matriculados = group['matriculados'].sum()
-            n_turmas = group.drop_duplicates(subset=['periodo', 'turma_principal']).shape[0]
-            grupo_pratico = group[group['carga_horaria_pratica_base'] > 0]
-            n_subturmas = grupo_pratico.drop_duplicates(subset=['periodo', 'turma']).shape[0]
-            ch_teorica_base = group['ch_teorica'].iloc[0] if not group.empty else 0
-            carga_horaria_pratica_base = group['carga_horaria_pratica_base'].iloc[0] if not group.empty else 0
-            obrigatorio_generalista = group['obrigatorio_generalista'].iloc[0] if not group.empty else 0
-            obrigatorio_enfase = group['obrigatorio_enfase'].iloc[0] if not group.empty else 0
-
-            ch_teorica_total = n_turmas * ch_teorica_base
-            ch_pratica_total = n_subturmas * carga_horaria_pratica_base 
-            return pd.Series({
-                'matriculados': matriculados,
-                'n_turmas': n_turmas,
-                'n_subturmas': n_subturmas,
-                'ch_teorica': ch_teorica_total,
-                'ch_pratica': ch_pratica_total,
-                'obrigatorio_generalista': obrigatorio_generalista,
-                'obrigatorio_enfase': obrigatorio_enfase,
-                'ch_pratica_base': carga_horaria_pratica_base
-            })
-        summary_df = demand_with_info.groupby(
-            ['codigo', 'nome', 'camara'],
-        ).apply(aggregate_component,  include_groups=False).reset_index()
-        summary_df = summary_df.rename(columns={'nome': 'titulo'})
-        int_columns = ['matriculados', 'n_turmas', 'n_subturmas', 'ch_teorica', 'ch_pratica', 'ch_pratica_base','obrigatorio_generalista', 'obrigatorio_enfase']
+        colunas_numericas = ['ch_teorica', 'carga_horaria_pratica_base', 'obrigatorio_generalista', 'obrigatorio_enfase'] + trilhas
+        demand_with_info[colunas_numericas] = demand_with_info[colunas_numericas].fillna(0)
+        demand_with_info['camara'] = fill_category(demand_with_info['camara'], 'Não definida')
+        chaves = ['codigo', 'nome', 'camara']
+        with self.tracer.stage('Data.build_demand_by_componente.groupby', rows_in=len(demand_with_info)) as stage:
+            grupos = demand_with_info.groupby(chaves, observed=True)
+            summary_df = grupos.agg(
+                matriculados=('matriculados', 'sum'),
+                ch_teorica_base=('ch_teorica', 'first'),
+                ch_pratica_base=('carga_horaria_pratica_base', 'first'),
+                obrigatorio_generalista=('obrigatorio_generalista', 'first'),
+                obrigatorio_enfase=('obrigatorio_enfase', 'first'),
+                **{coluna: (coluna, 'first') for coluna in trilhas},
+            )
+            # Turmas distintas por (periodo, turma_principal) e subturmas práticas por (periodo, turma)
+            turmas = demand_with_info.drop_duplicates(subset=chaves + ['periodo', 'turma_principal'])
+            n_turmas = turmas.groupby(chaves, observed=True).size()
+            praticas = demand_with_info[demand_with_info['carga_horaria_pratica_base'] > 0]
+            subturmas = praticas.drop_duplicates(subset=chaves + ['periodo', 'turma'])
+            n_subturmas = subturmas.groupby(chaves, observed=True).size()
+            summary_df['n_turmas'] = n_turmas.reindex(summary_df.index, fill_value=0)
+            summary_df['n_subturmas'] = n_subturmas.reindex(summary_df.index, fill_value=0)
+            stage['rows_out'] = len(summary_df)
+        summary_df['ch_teorica'] = summary_df['n_turmas'] * summary_df['ch_teorica_base']
+        summary_df['ch_pratica'] = summary_df['n_subturmas'] * summary_df['ch_pratica_base']
+        summary_df = summary_df[[
+            'matriculados', 'n_turmas', 'n_subturmas', 'ch_teorica', 'ch_pratica',
+            'obrigatorio_generalista', 'obrigatorio_enfase', 'ch_pratica_base'
+        ] + trilhas].reset_index()
+        summary_df = decode(summary_df.rename(columns={'nome': 'titulo'}))
+        int_columns = ['matriculados', 'n_turmas', 'n_subturmas', 'ch_teorica', 'ch_pratica', 'ch_pratica_base','obrigatorio_generalista', 'obrigatorio_enfase'] + trilhas
         summary_df[int_columns] = summary_df[int_columns].astype(int)
+        if override is not None:
+            previsto = summary_df['codigo'].map(override)
+            summary_df['matriculados'] = previsto.fillna(summary_df['matriculados']).round().astype(int)
         summary_df.loc[summary_df['ch_teorica'] == 0, 'n_turmas'] = 0
         summary_df = summary_df.sort_values(by='matriculados', ascending=False)
         summary_df['ch_total'] = summary_df['ch_teorica'] + summary_df['ch_pratica']
         summary_df = summary_df.sort_values(by='matriculados', ascending=False)
-        all_prereqs = self.curriculum_df['pre_requisitos'].dropna().str.split(';').explode()
-        prereq_counts = all_prereqs.value_counts()
-        summary_df['pre_requisito'] = summary_df['codigo'].map(prereq_counts).fillna(0).astype(int)
-        summary_df = pd.merge(summary_df, self.camaras_df, on='camara', how='left')
+        prerequisites = self.get_prerequisite_graph()
+        for column, feature in PrerequisiteGraph.FEATURES.items():
+            summary_df[column] = prerequisites.lookup(summary_df['codigo'], feature)
+        summary_df = pd.merge(summary_df, decode(self.camaras_df.copy()), on='camara', how='left')
         summary_df['n_professores'] = summary_df['n_professores'].fillna(0).astype(int)
         summary_df['n_componentes'] = 1
         #print(summary_df.to_string())
         self.__add_proportions(summary_df)
         return summary_df
 
+def _matriculados_override(matriculados):
+    # Normaliza a substituição de matriculados para uma Series codigo -> valor
+    if matriculados is None:
+        return None
+    if isinstance(matriculados, pd.DataFrame):
+        # 'codigo' categórico (previsão sobre a demanda compacta): só os códigos presentes
+        matriculados = matriculados.groupby('codigo', observed=True)['previsao'].sum()
+    override = pd.Series(matriculados, dtype=float)
+    override.index = override.index.astype(str)
+    return override.sort_index()
+
+
+def _override_signature(override):
+    if override is None:
+        return None
+    return hashlib.sha1(pd.util.hash_pandas_object(override, index=True).to_numpy().tobytes()).hexdigest()
+
+
+def load_projects(file_path):
+    """
+    Lê a planilha de projetos de monitoria (ex.: data/cleaned/study1/projetos.xlsx).
+
+    Returns:
+        dict: {titulo: [codigos]}, a partir da coluna 'componentes' (códigos separados por ';').
+    """
+    df = pd.read_excel(file_path)
+    componentes = df['componentes'].fillna('').astype(str).str.split(';')
+    return {
+        titulo: [codigo.strip() for codigo in codigos if codigo.strip()]
+        for titulo, codigos in zip(df['titulo'], componentes)
+    }
+
+SIGAA_COLUMNS = {
+    'Cod. Comp.': 'codigo',
+    'Nome Componente': 'nome',
+    'Turma': 'turma',
+    'Horário': 'horario',
+    'Cap': 'capacidade',
+    'Mat': 'matriculados'
+}
+
+# Mesma normalização de espaços que pd.read_html aplica ao texto das células
+_RE_WHITESPACE = re.compile(r"[\r\n]+|\s{2,}")
+
+
+def _cell_text(cell):
+    return _RE_WHITESPACE.sub(" ", cell.xpath('string()').strip())
+
+
+def _iter_sigaa_rows(file, prefix='ECT'):
+    """
+    Percorre o HTML do SIGAA em streaming, emitindo apenas as linhas das tabelas de
+    turmas (cabeçalho com 'Cod. Comp.') cujo código começa com `prefix`.
+    """
+    from lxml import etree
+    tabelas = []
+    for event, elem in etree.iterparse(file, events=('start', 'end'), tag=('table', 'tr'), html=True, encoding='utf-8'):
+        if elem.tag == 'table':
+            if event == 'start':
+                tabelas.append(None)
+            else:
+                tabelas.pop()
+                elem.clear()
+            continue
+        if event != 'end' or not tabelas:
+            continue
+        cells = [cell for cell in elem if cell.tag in ('td', 'th')]
+        if tabelas[-1] is None:
+            headers = [_cell_text(cell) for cell in cells]
+            if all(cell.tag == 'th' for cell in cells) and all(col in headers for col in SIGAA_COLUMNS):
+                tabelas[-1] = [headers.index(col) for col in SIGAA_COLUMNS]
+        elif len(cells) > max(tabelas[-1]):
+            codigo = _cell_text(cells[tabelas[-1][0]])
+            if codigo.startswith(prefix):
+                yield tuple([codigo] + [_cell_text(cells[i]) for i in tabelas[-1][1:]])
+        # Libera as linhas já processadas
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+
+
+def extract_periodo(file):
+    """Período letivo ('AAAA-P') contido no nome do arquivo exportado do SIGAA."""
+    match = re.search(r'(\d{4}-\d)', str(file))
+    return match.group(1) if match else 'unknown'
+
+
 class Components:
 
-    def __init__(self, *files):
+    def __init__(self, *files, n_jobs=None):
         self.files = files
+        self.n_jobs = n_jobs
         self.df_list = []
         self.stacked_df = None
         self.load_data()
         self.stack_dataframes()
 
     def load_data(self):
-        for file in self.files:
-            self.read_file(file)
+        if len(self.files) > 1 and self.n_jobs != 1:
+            with ProcessPoolExecutor(max_workers=self.n_jobs) as executor:
+                dfs = list(executor.map(self.parse_file, self.files))
+        else:
+            dfs = [self.parse_file(file) for file in self.files]
+        self.df_list.extend(df for df in dfs if df is not None)
 
     def stack_dataframes(self):
         self.stacked_df = pd.concat(self.df_list, ignore_index=True)
@@ -190,40 +655,29 @@ class Components:
             print(f"Ocorreu um erro ao salvar o arquivo Excel: {e}")
 
     def read_file(self, file):
+        df = self.parse_file(file)
+        if df is not None:
+            self.df_list.append(df)
+
+    @staticmethod
+    def parse_file(file):
         try:
-            with open(file, 'r', encoding='utf-8') as f:
-                html_content = f.read()
-            lista_de_dataframes = pd.read_html(StringIO(html_content), header=0)
-            tabelas_de_disciplinas = []
-            for df_tabela in lista_de_dataframes:
-                if 'Cod. Comp.' in df_tabela.columns:
-                    tabelas_de_disciplinas.append(df_tabela)
-            df_completo = pd.concat(tabelas_de_disciplinas, ignore_index=True)
-            column_mapping = {
-                'Cod. Comp.': 'codigo',
-                'Nome Componente': 'nome',
-                'Turma': 'turma',
-                'Horário': 'horario',
-                'Cap': 'capacidade',
-                'Mat': 'matriculados'
-            }
-            df_selecionado = df_completo[list(column_mapping.keys())].copy()
-            df_selecionado['Cap'] = pd.to_numeric(df_selecionado['Cap'], errors='coerce').fillna(0).astype(int)
-            df_selecionado['Mat'] = pd.to_numeric(df_selecionado['Mat'], errors='coerce').fillna(0).astype(int)
-            df_selecionado['Horário'] = df_selecionado['Horário'].fillna('')
-            periodo = re.search(r'(\d{4}-\d)', file).group(1) if re.search(r'(\d{4}-\d)', file) else 'unknown'
-            df_selecionado['periodo'] = periodo
-            df_renomeado = df_selecionado.rename(columns=column_mapping)
-            df_final = df_renomeado[df_renomeado['codigo'].str.startswith('ECT')].copy()
-            self.df_list.append(df_final)
+            with open(file, 'rb') as f:
+                df_final = pd.DataFrame(list(_iter_sigaa_rows(f)), columns=list(SIGAA_COLUMNS.values()))
+            df_final['capacidade'] = pd.to_numeric(df_final['capacidade'], errors='coerce').fillna(0).astype(int)
+            df_final['matriculados'] = pd.to_numeric(df_final['matriculados'], errors='coerce').fillna(0).astype(int)
+            df_final['periodo'] = extract_periodo(file)
+            return df_final
         except FileNotFoundError:
             print(f"ERRO: O arquivo '{file}' não foi encontrado.")
             print("Por favor, verifique se o nome e o caminho do arquivo estão corretos.")
         except Exception as e:
             print(f"Ocorreu um erro inesperado durante o processamento: {e}")
+        return None
 
 class Curriculum(Components):
-    def read_file(self, file):
+    @staticmethod
+    def parse_file(file):
         try:
             with open(file, 'r', encoding='utf-8') as f:
                 text_content = f.read()
@@ -245,72 +699,130 @@ class Curriculum(Components):
                         'carga_horaria': int(carga_horaria)
                     })
             if not lista_de_disciplinas:
-                return
-            df_final = pd.DataFrame(lista_de_disciplinas)
-            self.df_list.append(df_final)
+                return None
+            return pd.DataFrame(lista_de_disciplinas)
         except FileNotFoundError:
             print(f"ERRO: O arquivo '{file}' não foi encontrado.")
         except Exception as e:
             print(f"Ocorreu um erro inesperado ao processar o currículo de texto: {e}")
+        return None
+
+
+# 1. Área da tabela na página, no formato [esquerda, cima, direita, baixo].
+# Isso ajuda a ignorar texto fora da área da tabela (cabeçalhos/rodapés).
+PDF_AREA_DA_TABELA = ['60,720,940,50']
+
+# 2. Coordenadas X para a divisão das colunas
+PDF_COORDENADAS_COLUNAS = [
+    '85,270,300,375,420,550,575,600,635,660,685,710,735,760,785,810,835,860,885,910,935'
+]
+
+PDF_NOMES_COLUNAS = [
+    'Código', 'Componente Curricular', 'CH (h)', 'Pré-requisito', 'Correquisito', 'Equivalência'
+] + TRILHAS
+
+
+def _pdf_page_cache_path(caminho_pdf, pdf_hash, pagina):
+    # A chave combina o conteúdo do PDF, a página e as guias de área/colunas
+    guias = repr((PDF_AREA_DA_TABELA, PDF_COORDENADAS_COLUNAS))
+    chave = hashlib.sha256(f"{pdf_hash}|{pagina}|{guias}".encode()).hexdigest()[:16]
+    directory, name = os.path.split(os.path.abspath(caminho_pdf))
+    stem = os.path.splitext(name)[0]
+    return os.path.join(directory, '.cache', f"{stem}.p{pagina}.{chave}.pkl")
+
+
+def _extrair_pagina_pdf(caminho_pdf, pagina, cache_path=None):
+    """
+    Extrai as tabelas (ainda sem limpeza) de uma página do PDF com o camelot.
+    O resultado bruto é salvo em `cache_path`, para que mudanças na limpeza ou
+    reexecuções após falhas não paguem de novo o custo do camelot.
+    """
+    import camelot
+    inicio = time.perf_counter()
+    tables = camelot.read_pdf(
+        caminho_pdf,
+        flavor='stream',
+        pages=str(pagina),
+        table_areas=PDF_AREA_DA_TABELA,
+        columns=PDF_COORDENADAS_COLUNAS,
+        split_text=True
+    )
+    frames = [table.df for table in tables]
+    if cache_path is not None:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        pd.to_pickle(frames, cache_path)
+    return frames, time.perf_counter() - inicio
 
 
-def extrair_tabela_pdf_robusto(caminho_pdf):
+def extrair_tabela_pdf_robusto(caminho_pdf, n_jobs=None, usar_cache=True):
     """
     Extrai tabelas de um PDF usando o modo 'stream' com guias manuais para
     colunas e área da tabela, garantindo alta precisão em layouts complexos.
 
+    Cada página é extraída em paralelo e o resultado bruto do camelot fica em cache
+    (chave: hash do PDF, página e guias), em '.cache/' ao lado do PDF.
+
     Args:
         caminho_pdf (str): O caminho para o arquivo PDF.
+        n_jobs (int): Número de processos para extrair as páginas (padrão: nº de CPUs).
+        usar_cache (bool): Se False, ignora e não grava o cache por página.
 
     Returns:
-        pandas.DataFrame: Um DataFrame limpo e corrigido.
+        pandas.DataFrame: Um DataFrame limpo e corrigido. O tempo de cada página
+        fica em df.attrs['tempos_por_pagina'].
     """
+    # camelot é importado só aqui, para não pesar na inicialização de quem usa apenas Data
+    from camelot.handlers import PDFHandler
     try:
-        # 1. Definir a área da tabela na página [x1, y1, x2, y2]
-        # (canto inferior esquerdo, canto superior direito)
-        # Isso ajuda a ignorar texto fora da área da tabela (cabeçalhos/rodapés).
-        # As coordenadas são: x1, y1 (canto superior esquerdo), x2, y2 (canto inferior direito)
-        # Formato: [esquerda, cima, direita, baixo]
-        area_da_tabela = ['60,720,940,50']
-
-        # 2. Definir as coordenadas X para a divisão das colunas
-        # (Mesma lógica da tentativa anterior)
-        coordenadas_colunas = [
-            '85,270,300,375,420,550,575,600,635,660,685,710,735,760,785,810,835,860,885,910,935'
-        ]
-
         print(f"Lendo o arquivo PDF: {caminho_pdf} com modo 'stream' e guias manuais.")
-        tables = camelot.read_pdf(
-            caminho_pdf,
-            flavor='stream',  # <--- MUDANÇA PRINCIPAL
-            pages='all',
-            table_areas=area_da_tabela,
-            columns=coordenadas_colunas,
-            split_text=True
-        )
-        print(f"Encontrado {tables.n} tabelas no documento.")
+        paginas = PDFHandler(caminho_pdf, pages='all').pages
+        with open(caminho_pdf, 'rb') as f:
+            pdf_hash = hashlib.sha256(f.read()).hexdigest()
+
+        frames_por_pagina = {}
+        tempos = {}
+        pendentes = []
+        for pagina in paginas:
+            cache_path = _pdf_page_cache_path(caminho_pdf, pdf_hash, pagina)
+            if usar_cache and os.path.exists(cache_path):
+                inicio = time.perf_counter()
+                frames_por_pagina[pagina] = pd.read_pickle(cache_path)
+                tempos[pagina] = ('cache', time.perf_counter() - inicio)
+            else:
+                pendentes.append((pagina, cache_path if usar_cache else None))
+
+        if len(pendentes) > 1 and n_jobs != 1:
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                futuros = {pagina: executor.submit(_extrair_pagina_pdf, caminho_pdf, pagina, cache_path)
+                           for pagina, cache_path in pendentes}
+                resultados = {pagina: futuro.result() for pagina, futuro in futuros.items()}
+        else:
+            resultados = {pagina: _extrair_pagina_pdf(caminho_pdf, pagina, cache_path)
+                          for pagina, cache_path in pendentes}
+        for pagina, (frames, segundos) in resultados.items():
+            frames_por_pagina[pagina] = frames
+            tempos[pagina] = ('camelot', segundos)
+
+        for pagina in paginas:
+            origem, segundos = tempos[pagina]
+            print(f"Página {pagina}: {segundos:.2f}s ({origem})")
 
-        if tables.n == 0:
+        tables = [table for pagina in paginas for table in frames_por_pagina[pagina]]
+        print(f"Encontrado {len(tables)} tabelas no documento.")
+
+        if len(tables) == 0:
             print("Nenhuma tabela foi encontrada no PDF com as configurações fornecidas.")
             return None
 
         # Combina os DataFrames de todas as páginas em um só
-        df_completo = pd.concat([table.df for table in tables], ignore_index=True)
+        df_completo = pd.concat(tables, ignore_index=True)
         
         print("Tabelas combinadas. Iniciando a limpeza dos dados...")
 
         # --- Limpeza do DataFrame ---
 
         # 1. Definir o cabeçalho manualmente, pois o 'stream' pode não pegá-lo
-        nomes_colunas = [
-            'Código', 'Componente Curricular', 'CH (h)', 'Pré-requisito', 'Correquisito', 'Equivalência',
-            'Generalista Diurno', 'Generalista Noturno', 'Aeroespacial e astronomia',
-            'Computação Aplicada', 'Negócios Tecnológicos', 'Neurociências',
-            'Soluções e tecnologias sustentáveis', 'Tecnologia Ambiental', 'Tecnologia Biomédica',
-            'Tecnologia de Computação', 'Tecnologia de Materiais Diurno',
-            'Tecnologia de Materiais Noturno', 'Tecnologia Mecânica', 'Tecnologia Mecatrônica',
-            'Tecnologia de Petróleo', 'Tecnologia de Telecomunicações'
-        ]
+        nomes_colunas = PDF_NOMES_COLUNAS
         
         # O número de colunas extraídas deve ser igual ao número de nomes definidos
         if len(df_completo.columns) != len(nomes_colunas):
@@ -320,10 +832,11 @@ def extrair_tabela_pdf_robusto(caminho_pdf):
         else:
             df_completo.columns = nomes_colunas
 
-        # 2. Limpar o conteúdo das células (remover quebras de linha)
-        for col in df_completo.columns:
-            # Garante que a coluna é do tipo string antes de usar .str
-            df_completo[col] = df_completo[col].astype(str).str.replace('\n', ' ', regex=False).str.strip()
+        # 2. Limpar o conteúdo das células (remover quebras de linha), de uma vez
+        # para todas as colunas
+        valores = df_completo.to_numpy().astype(str)
+        valores = np.char.strip(np.char.replace(valores, '\n', ' '))
+        df_completo = pd.DataFrame(valores, columns=df_completo.columns, index=df_completo.index)
 
         # 3. Remover linhas de cabeçalho repetidas e linhas vazias
         df_completo = df_completo[df_completo['Código'] != 'Código']
@@ -331,6 +844,10 @@ def extrair_tabela_pdf_robusto(caminho_pdf):
         df_completo.dropna(how='all', inplace=True) # Remove linhas onde TODAS as colunas são NaN
 
         df_completo.reset_index(drop=True, inplace=True)
+        # Obrigatoriedade por trilha em uma máscara de 16 bits (src.emphasis), lida das
+        # marcas de cada linha: as células de trilha chegam mescladas e deslocadas
+        df_completo['mascara_obrigatorio'] = masks_from_columns(df_completo)
+        df_completo.attrs['tempos_por_pagina'] = {pagina: segundos for pagina, (_, segundos) in tempos.items()}
         
         print("Limpeza concluída com sucesso!")
         return df_completo
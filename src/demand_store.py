@@ -0,0 +1,154 @@
+import pandas as pd
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from src.data_loaders import Components, extract_periodo
+
+try:
+    import pyarrow.dataset as ds
+except ImportError:
+    ds = None
+
+
+class DemandStore:
+    """
+    Armazém local e incremental da demanda, em Parquet particionado por período
+    (root/periodo=AAAA-P/<hash>.parquet).
+
+    O manifesto é indexado pelo hash do conteúdo de cada arquivo bruto já ingerido,
+    com os caminhos que tinham esse conteúdo, de modo que novas execuções só
+    processam semestres novos ou alterados e o mesmo conteúdo ingerido por dois
+    caminhos (cópia, arquivo movido ou renomeado) fica em uma única parte.
+    """
+
+    MANIFEST = '_manifest.json'
+
+    def __init__(self, root):
+        if ds is None:
+            raise ImportError("DemandStore requer o pacote 'pyarrow'.")
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self.manifest_path = os.path.join(root, self.MANIFEST)
+        self.manifest = {}
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                self.manifest = self.__upgrade_manifest(json.load(f))
+
+    @staticmethod
+    def __upgrade_manifest(manifest):
+        # Formato antigo: {caminho: {'hash', 'periodo', 'parte'}}
+        if not any('hash' in entrada for entrada in manifest.values()):
+            return manifest
+        novo = {}
+        for caminho, entrada in manifest.items():
+            atual = novo.setdefault(entrada['hash'], {'periodo': entrada['periodo'], 'parte': entrada['parte'], 'arquivos': []})
+            atual['arquivos'].append(caminho)
+        return novo
+
+    @staticmethod
+    def file_hash(file):
+        digest = hashlib.sha256()
+        with open(file, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def ingest(self, *files, n_jobs=None):
+        """
+        Ingere arquivos HTML do SIGAA. Conteúdos já armazenados não são processados de
+        novo (só ganham o novo caminho). Os arquivos já registrados no manifesto que
+        ainda existem também são conferidos: se o conteúdo mudou, a parte antiga deixa
+        de ser usada por eles e é removida quando nenhum outro caminho a referencia.
+
+        Returns:
+            list: Arquivos efetivamente processados.
+        """
+        caminhos = list(dict.fromkeys(
+            [os.path.abspath(file) for file in files] +
+            [caminho for caminho in self.__known_files() if os.path.exists(caminho)]
+        ))
+        pendentes = {}
+        alterado = False
+        for caminho in caminhos:
+            file_hash = self.file_hash(caminho)
+            if file_hash in self.manifest:
+                alterado |= self.__link(caminho, file_hash)
+            else:
+                pendentes.setdefault(file_hash, []).append(caminho)
+        if not pendentes:
+            if alterado:
+                self.__save_manifest()
+            return []
+
+        arquivos = [grupo[0] for grupo in pendentes.values()]
+        if len(arquivos) > 1 and n_jobs != 1:
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                dfs = list(executor.map(Components.parse_file, arquivos))
+        else:
+            dfs = [Components.parse_file(file) for file in arquivos]
+
+        processados = []
+        for (file_hash, grupo), df in zip(pendentes.items(), dfs):
+            if df is None:
+                continue
+            periodo = extract_periodo(grupo[0])
+            parte = os.path.join(f"periodo={periodo}", f"{file_hash[:16]}.parquet")
+            os.makedirs(os.path.join(self.root, f"periodo={periodo}"), exist_ok=True)
+            # A coluna de período fica só no caminho da partição
+            df.drop(columns=['periodo']).to_parquet(os.path.join(self.root, parte), index=False)
+            self.manifest[file_hash] = {'periodo': periodo, 'parte': parte, 'arquivos': []}
+            for caminho in grupo:
+                self.__link(caminho, file_hash)
+            processados.extend(grupo)
+        self.__save_manifest()
+        return processados
+
+    def __known_files(self):
+        return [caminho for entrada in self.manifest.values() for caminho in entrada['arquivos']]
+
+    def __link(self, caminho, file_hash):
+        """Associa `caminho` ao conteúdo `file_hash`, desfazendo a associação anterior."""
+        if caminho in self.manifest[file_hash]['arquivos']:
+            return False
+        for chave, entrada in list(self.manifest.items()):
+            if chave != file_hash and caminho in entrada['arquivos']:
+                entrada['arquivos'].remove(caminho)
+                if not entrada['arquivos']:
+                    self.__remove_entry(chave)
+        self.manifest[file_hash]['arquivos'].append(caminho)
+        return True
+
+    def __remove_entry(self, file_hash):
+        parte = self.manifest.pop(file_hash)['parte']
+        # Contagem de referências: a parte só sai do disco se nenhuma entrada a usa
+        if any(entrada['parte'] == parte for entrada in self.manifest.values()):
+            return
+        caminho = os.path.join(self.root, parte)
+        if os.path.exists(caminho):
+            os.remove(caminho)
+
+    def __save_manifest(self):
+        temporario = self.manifest_path + '.tmp'
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2, ensure_ascii=False)
+        os.replace(temporario, self.manifest_path)
+
+    def periods(self):
+        return sorted({entrada['periodo'] for entrada in self.manifest.values()})
+
+    def load(self, periodos=None):
+        """
+        Carrega a demanda armazenada. Com `periodos`, apenas as partições desses
+        períodos são lidas.
+        """
+        colunas = ['codigo', 'nome', 'turma', 'horario', 'capacidade', 'matriculados', 'periodo']
+        if not self.manifest:
+            return pd.DataFrame(columns=colunas)
+        dataset = ds.dataset(self.root, format='parquet', partitioning='hive')
+        filtro = None
+        if periodos is not None:
+            filtro = ds.field('periodo').isin([str(periodo) for periodo in periodos])
+        df = dataset.to_table(filter=filtro).to_pandas()
+        df['periodo'] = df['periodo'].astype(str)
+        return df[colunas]
@@ -0,0 +1,129 @@
+"""
+Obrigatoriedade por trilha (generalista diurno/noturno e as 14 ênfases) como uma
+máscara de 16 bits por componente, na ordem das colunas de obrigatorias.pdf:
+
+    bit 0-1:  Generalista Diurno, Generalista Noturno;
+    bit 2-15: ênfases, na ordem das marcas de 'origem_pdf_grade' ('@' = obrigatória).
+
+Contagens, proporções e sobreposições saem de popcounts sobre os uint16, sem laço
+por componente.
+"""
+import pandas as pd
+import numpy as np
+
+GENERALISTAS = ['Generalista Diurno', 'Generalista Noturno']
+ENFASES = [
+    'Aeroespacial e astronomia', 'Computação Aplicada', 'Negócios Tecnológicos', 'Neurociências',
+    'Soluções e tecnologias sustentáveis', 'Tecnologia Ambiental', 'Tecnologia Biomédica',
+    'Tecnologia de Computação', 'Tecnologia de Materiais Diurno',
+    'Tecnologia de Materiais Noturno', 'Tecnologia Mecânica', 'Tecnologia Mecatrônica',
+    'Tecnologia de Petróleo', 'Tecnologia de Telecomunicações'
+]
+TRILHAS = GENERALISTAS + ENFASES
+N_TRILHAS = len(TRILHAS)
+MARCA_OBRIGATORIO = '@'
+# Marcas das células de trilha em obrigatorias.pdf ('@' obrigatória, '*' não obrigatória)
+MARCAS = (MARCA_OBRIGATORIO, '*')
+
+_BITS = np.left_shift(np.uint16(1), np.arange(N_TRILHAS, dtype=np.uint16))
+
+
+def parse_grade(origem_pdf_grade, obrigatorio_generalista=None):
+    """
+    Máscaras a partir de 'origem_pdf_grade' (uma marca por ênfase, separadas por
+    espaço) e de 'obrigatorio_generalista' (liga os dois bits do generalista).
+    Valores ausentes ou com outro número de marcas não ligam bits de ênfase.
+
+    Returns:
+        numpy.ndarray: Vetor (n,) uint16.
+    """
+    marcas = pd.Series(origem_pdf_grade, dtype=object).fillna('').astype(str).str.split()
+    completas = marcas.str.len().to_numpy() == len(ENFASES)
+    masks = np.zeros(len(marcas), dtype=np.uint16)
+    if completas.any():
+        matriz = np.array(marcas[completas].tolist(), dtype=object) == MARCA_OBRIGATORIO
+        masks[completas] = pack(np.pad(matriz, ((0, 0), (len(GENERALISTAS), 0))))
+    if obrigatorio_generalista is not None:
+        generalista = np.asarray(pd.Series(obrigatorio_generalista).fillna(0), dtype=float) == 1
+        masks[generalista] |= _BITS[0] | _BITS[1]
+    return masks
+
+
+def masks_from_columns(df, columns=None):
+    """
+    Máscaras a partir das linhas extraídas do PDF. O camelot junta as células de
+    várias trilhas em uma só ('@  @  @') e desloca as marcas para colunas vizinhas,
+    então as marcas ('@' ou '*') de cada linha são lidas em ordem em todas as
+    `columns` (padrão: todas), uma por trilha.
+
+    Linhas sem marca (continuações de nome ou de pré-requisito) ficam com máscara 0.
+
+    Raises:
+        ValueError: Se alguma linha tiver marcas (ou '@' grudado em outro texto),
+            mas não exatamente uma por trilha.
+    """
+    columns = list(df.columns) if columns is None else list(columns)
+    texto = df[columns].astype(object).where(df[columns].notna(), '').astype(str).agg(' '.join, axis=1)
+    tokens = texto.str.split()
+    marcas = tokens.apply(lambda linha: [token for token in linha if token in MARCAS])
+    n_marcas = marcas.str.len().to_numpy()
+    marcada = (n_marcas > 0) | texto.str.contains(MARCA_OBRIGATORIO, regex=False).to_numpy()
+    incompletas = marcada & (n_marcas != N_TRILHAS)
+    if incompletas.any():
+        linhas = np.flatnonzero(incompletas)
+        raise ValueError(
+            f"Linhas do PDF com {sorted(set(n_marcas[incompletas]))} marcas de trilha em vez de {N_TRILHAS} "
+            f"(índices {df.index[linhas[:10]].tolist()})."
+        )
+    masks = np.zeros(len(df), dtype=np.uint16)
+    completas = n_marcas == N_TRILHAS
+    if completas.any():
+        masks[completas] = pack(np.array(marcas[completas].tolist(), dtype=object) == MARCA_OBRIGATORIO)
+    return masks
+
+
+def pack(matriz):
+    """Matriz booleana (n, 16) para máscaras uint16."""
+    return np.bitwise_or.reduce(np.where(np.asarray(matriz, dtype=bool), _BITS, np.uint16(0)), axis=1).astype(np.uint16)
+
+
+def unpack(masks):
+    """Máscaras uint16 para matriz booleana (n, 16)."""
+    return (np.asarray(masks, dtype=np.uint16)[:, None] & _BITS) != 0
+
+
+def popcount(masks):
+    """Número de trilhas em que cada componente é obrigatório (0 a 16)."""
+    masks = np.asarray(masks, dtype=np.uint16)
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(masks).astype(np.int64)
+    return np.unpackbits(masks.view(np.uint8).reshape(len(masks), 2), axis=1).sum(axis=1, dtype=np.int64)
+
+
+def proportion_by_trilha(masks, weights=None):
+    """
+    Parcela (ponderada, ex.: por ch_total ou matriculados) dos componentes que é
+    obrigatória em cada trilha.
+
+    Returns:
+        pandas.Series: Indexada por TRILHAS.
+    """
+    matriz = unpack(masks)
+    weights = np.ones(len(matriz)) if weights is None else np.asarray(weights, dtype=float)
+    total = weights.sum()
+    valores = weights @ matriz / total if total > 0 else np.zeros(N_TRILHAS)
+    return pd.Series(valores, index=TRILHAS, name='prop_obrigatorio')
+
+
+def trilha_overlap(masks):
+    """Matriz (16, 16) com o número de componentes obrigatórios nas duas trilhas."""
+    matriz = unpack(masks).astype(np.int64)
+    return pd.DataFrame(matriz.T @ matriz, index=TRILHAS, columns=TRILHAS)
+
+
+def component_overlap(masks_a, masks_b=None):
+    """Número de trilhas em que cada par de componentes é obrigatório ao mesmo tempo."""
+    masks_a = np.asarray(masks_a, dtype=np.uint16)
+    masks_b = masks_a if masks_b is None else np.asarray(masks_b, dtype=np.uint16)
+    comum = masks_a[:, None] & masks_b[None, :]
+    return popcount(comum.ravel()).reshape(comum.shape)
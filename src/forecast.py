@@ -0,0 +1,193 @@
+"""
+Previsão de matriculados por componente para os próximos semestres.
+
+Os modelos são ajustados para todos os componentes de uma vez sobre a matriz
+componente x período (linhas = componentes, colunas = semestres em ordem):
+
+    'sazonal_ingenuo': repete o mesmo semestre do ano anterior (sazonalidade 2);
+    'ses': suavização exponencial simples, com alfa escolhido por componente numa grade;
+    'tendencia_linear': reta de mínimos quadrados no tempo.
+
+Os intervalos supõem erros normais; ficam NaN quando o histórico não permite
+estimar a variância (ex.: apenas dois semestres). Cada modelo devolve, além da
+previsão e do desvio dos resíduos, o fator de covariância entre os erros dos
+passos, de onde saem o desvio de cada passo (diagonal) e o do total acumulado
+(soma de todos os termos, com as covariâncias).
+
+Exemplo:
+    previsao = forecast(demand_matrix(data.demand_df), 'ses', horizon=2, acumulado=True)
+    data.get_demand_by_component(matriculados=previsao.set_index('codigo')['previsao'])
+"""
+import pandas as pd
+import numpy as np
+from statistics import NormalDist
+
+MODELS = ('sazonal_ingenuo', 'ses', 'tendencia_linear')
+SEASON = 2
+SES_ALPHAS = np.linspace(0.05, 1.0, 20)
+
+
+def demand_matrix(demand_df, fill_value=0):
+    """
+    Matriculados somados por componente (linhas) e período (colunas ordenadas).
+    Semestres sem turma do componente recebem `fill_value`.
+    """
+    matrix = demand_df.pivot_table(index='codigo', columns='periodo', values='matriculados', aggfunc='sum', fill_value=fill_value, observed=True)
+    return matrix.reindex(columns=sorted(matrix.columns, key=str))
+
+
+def _seasonal_naive(y, horizon):
+    n, t = y.shape
+    steps = np.arange(1, horizon + 1)
+    fase = (steps - 1) % SEASON
+    k = (steps - 1) // SEASON + 1
+    # Passeio aleatório sazonal: passos da mesma fase partilham min(k, k') choques
+    fator = np.where(fase[:, None] == fase[None, :], np.minimum(k[:, None], k[None, :]), 0)
+    if t < SEASON:
+        return np.full((n, horizon), np.nan), np.full(n, np.nan), fator
+    previsao = y[:, t - SEASON + fase]
+    residuos = y[:, SEASON:] - y[:, :-SEASON]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sigma = np.sqrt(np.mean(residuos ** 2, axis=1)) if residuos.shape[1] else np.full(n, np.nan)
+    return previsao, sigma, fator
+
+
+def _ses(y, horizon):
+    n, t = y.shape
+    # Nível de cada componente para cada alfa da grade: (n, A), recursão só no tempo
+    alphas = SES_ALPHAS[None, :]
+    nivel = np.repeat(y[:, :1], len(SES_ALPHAS), axis=1).astype(float)
+    sse = np.zeros((n, len(SES_ALPHAS)))
+    for j in range(1, t):
+        erro = y[:, j:j + 1] - nivel
+        sse += erro ** 2
+        nivel = nivel + alphas * erro
+    melhor = np.argmin(sse, axis=1)
+    linhas = np.arange(n)
+    alpha = SES_ALPHAS[melhor]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sigma = np.sqrt(sse[linhas, melhor] / (t - 1)) if t > 1 else np.full(n, np.nan)
+    previsao = np.repeat(nivel[linhas, melhor][:, None], horizon, axis=1)
+    # Erro do passo h: e_h + alfa * (e_1 + ... + e_{h-1}); para h < h' a covariância
+    # é alfa + (h - 1) * alfa², e a variância 1 + (h - 1) * alfa²
+    menor = np.minimum.outer(np.arange(horizon), np.arange(horizon))
+    a = alpha[:, None, None]
+    fator = a + menor[None] * a ** 2 + np.eye(horizon)[None] * (1 - a)
+    return previsao, sigma, fator
+
+
+def _linear_trend(y, horizon):
+    n, t = y.shape
+    x = np.arange(t, dtype=float)
+    x_medio = x.mean()
+    sxx = ((x - x_medio) ** 2).sum()
+    y_medio = y.mean(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        b = ((y - y_medio[:, None]) * (x - x_medio)[None, :]).sum(axis=1) / sxx
+        a = y_medio - b * x_medio
+        futuro = np.arange(t, t + horizon, dtype=float)
+        previsao = a[:, None] + b[:, None] * futuro[None, :]
+        residuos = y - (a[:, None] + b[:, None] * x[None, :])
+        sigma = np.sqrt((residuos ** 2).sum(axis=1) / (t - 2)) if t > 2 else np.full(n, np.nan)
+        # Erro novo de cada passo mais o erro da reta estimada, comum a todos
+        desvio = futuro - x_medio
+        fator = np.eye(horizon) + 1 / t + np.outer(desvio, desvio) / sxx
+    return previsao, sigma, fator
+
+
+_MODEL_FUNCTIONS = {
+    'sazonal_ingenuo': _seasonal_naive,
+    'ses': _ses,
+    'tendencia_linear': _linear_trend,
+}
+
+
+def _predict(y, model, horizon):
+    """Previsão (n, horizon), desvio de cada passo (n, horizon) e do acumulado (n,)."""
+    if model not in _MODEL_FUNCTIONS:
+        raise ValueError(f"Modelo desconhecido: {model}")
+    previsao, sigma, fator = _MODEL_FUNCTIONS[model](np.asarray(y, dtype=float), horizon)
+    fator = np.broadcast_to(fator, (len(previsao), horizon, horizon))
+    sigma_passo = sigma[:, None] * np.sqrt(np.diagonal(fator, axis1=1, axis2=2))
+    sigma_acumulado = sigma * np.sqrt(fator.sum(axis=(1, 2)))
+    return previsao, sigma_passo, sigma_acumulado
+
+
+def forecast(matrix, model='ses', horizon=1, level=0.95, acumulado=False):
+    """
+    Previsão de todos os componentes de uma vez.
+
+    Args:
+        matrix (pandas.DataFrame): Saída de demand_matrix.
+        model (str): Um de MODELS.
+        horizon (int): Número de semestres à frente.
+        level (float): Nível do intervalo de previsão.
+        acumulado (bool): Se True, soma os `horizon` semestres (ex.: 2 para o ano, na
+            mesma base anual de get_demand_by_component); o intervalo usa a variância
+            do total, com as covariâncias entre os erros dos passos.
+
+    Returns:
+        pandas.DataFrame: codigo, modelo, passo, previsao, li e ls (não negativos).
+    """
+    previsao, sigma, sigma_acumulado = _predict(matrix.to_numpy(), model, horizon)
+    z = NormalDist().inv_cdf(0.5 + level / 2)
+    if acumulado:
+        total = previsao.sum(axis=1)
+        return pd.DataFrame({
+            'codigo': matrix.index,
+            'modelo': model,
+            'passo': horizon,
+            'previsao': np.maximum(total, 0),
+            'li': np.maximum(total - z * sigma_acumulado, 0),
+            'ls': np.maximum(total + z * sigma_acumulado, 0),
+        })
+    li = np.maximum(previsao - z * sigma, 0)
+    ls = np.maximum(previsao + z * sigma, 0)
+    previsao = np.maximum(previsao, 0)
+    n = len(matrix)
+    return pd.DataFrame({
+        'codigo': np.repeat(matrix.index.to_numpy(), horizon),
+        'modelo': model,
+        'passo': np.tile(np.arange(1, horizon + 1), n),
+        'previsao': previsao.ravel(),
+        'li': li.ravel(),
+        'ls': ls.ravel(),
+    })
+
+
+def backtest(matrix, models=MODELS, horizon=1, min_train=2):
+    """
+    Avaliação com origem móvel: para cada semestre t a partir de `min_train`, ajusta
+    com os semestres anteriores e compara a previsão `horizon` passos à frente com o
+    observado.
+
+    Returns:
+        pandas.DataFrame: Uma linha por modelo com n (previsões), mae, rmse e mape
+        (este só sobre observações positivas), ordenada por mae.
+    """
+    y = matrix.to_numpy(dtype=float)
+    origens = range(min_train, y.shape[1] - horizon + 1)
+    linhas = []
+    for model in models:
+        erros, observados = [], []
+        for origem in origens:
+            previsao, _, _ = _predict(y[:, :origem], model, horizon)
+            erros.append(previsao[:, -1] - y[:, origem + horizon - 1])
+            observados.append(y[:, origem + horizon - 1])
+        if not erros:
+            linhas.append({'modelo': model, 'n': 0, 'mae': np.nan, 'rmse': np.nan, 'mape': np.nan})
+            continue
+        erros = np.concatenate(erros)
+        observados = np.concatenate(observados)
+        validos = ~np.isnan(erros)
+        positivos = validos & (observados > 0)
+        linhas.append({
+            'modelo': model,
+            'n': int(validos.sum()),
+            'mae': np.abs(erros[validos]).mean() if validos.any() else np.nan,
+            'rmse': np.sqrt((erros[validos] ** 2).mean()) if validos.any() else np.nan,
+            'mape': np.abs(erros[positivos] / observados[positivos]).mean() if positivos.any() else np.nan,
+        })
+    if not origens:
+        print(f"AVISO: Histórico de {y.shape[1]} semestres insuficiente para o backtest (min_train={min_train}, horizon={horizon}).")
+    return pd.DataFrame(linhas).sort_values(by='mae', na_position='last').reset_index(drop=True)
@@ -0,0 +1,145 @@
+import pandas as pd
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+class Tracer:
+    """
+    Registra as etapas de Data e Simulator: tempo de parede, linhas de entrada e
+    saída e memória alocada (tracemalloc) por etapa.
+
+    Exemplo:
+        tracer = Tracer()
+        data = Data(..., tracer=tracer)
+        Simulator(data).simulate_by_component_and_practice(...)
+        tracer.export_chrome_trace('trace.json')  # abrir em ui.perfetto.dev
+        tracer.print_summary()
+    """
+
+    enabled = True
+
+    def __init__(self, trace_memory=True):
+        self.trace_memory = trace_memory
+        self.events = []
+        # Pilha de etapas abertas por thread (ex.: Data com carga concorrente)
+        self._local = threading.local()
+        self._origin = time.perf_counter()
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @property
+    def _stack(self):
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextmanager
+    def stage(self, name, rows_in=None):
+        """
+        Mede uma etapa. O dicionário retornado aceita 'rows_out' (e outros campos
+        extras, que vão para os args do trace).
+        """
+        record = {'rows_in': rows_in, 'rows_out': None}
+        frame = {'peak': 0}
+        if self.trace_memory:
+            mem_inicio, pico_anterior = tracemalloc.get_traced_memory()
+            frame['saved_peak'] = pico_anterior
+            tracemalloc.reset_peak()
+        self._stack.append(frame)
+        inicio = time.perf_counter()
+        try:
+            yield record
+        finally:
+            fim = time.perf_counter()
+            self._stack.pop()
+            if self.trace_memory:
+                mem_fim, pico = tracemalloc.get_traced_memory()
+                pico = max(pico, frame['peak'])
+                record['mem_peak_bytes'] = pico - mem_inicio
+                record['mem_delta_bytes'] = mem_fim - mem_inicio
+                # reset_peak apagou o pico da etapa externa: guarda no frame dela
+                if self._stack:
+                    self._stack[-1]['peak'] = max(self._stack[-1]['peak'], frame['saved_peak'], pico)
+            self.events.append({
+                'name': name,
+                'start': inicio - self._origin,
+                'seconds': fim - inicio,
+                'depth': len(self._stack),
+                'thread': threading.get_ident(),
+                **record,
+            })
+
+    def chrome_trace(self):
+        pid = os.getpid()
+        trace_events = []
+        for event in self.events:
+            args = {k: v for k, v in event.items() if k not in ('name', 'start', 'seconds', 'depth', 'thread') and v is not None}
+            trace_events.append({
+                'name': event['name'],
+                'cat': 'stage',
+                'ph': 'X',
+                'ts': event['start'] * 1e6,
+                'dur': event['seconds'] * 1e6,
+                'pid': pid,
+                'tid': event['thread'],
+                'args': args,
+            })
+        return {'traceEvents': trace_events, 'displayTimeUnit': 'ms'}
+
+    def export_chrome_trace(self, path):
+        """Salva o trace no formato Chrome Trace Event (chrome://tracing, Perfetto)."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.chrome_trace(), f)
+
+    def summary(self):
+        """Resumo por etapa, na ordem da primeira ocorrência."""
+        if not self.events:
+            return pd.DataFrame(columns=['etapa', 'chamadas', 'segundos', 'rows_in', 'rows_out', 'mem_pico_mib'])
+        df = pd.DataFrame(self.events)
+        if 'mem_peak_bytes' not in df.columns:
+            df['mem_peak_bytes'] = float('nan')
+        resumo = df.groupby('name', sort=False).agg(
+            chamadas=('seconds', 'size'),
+            segundos=('seconds', 'sum'),
+            rows_in=('rows_in', 'max'),
+            rows_out=('rows_out', 'max'),
+            mem_pico_mib=('mem_peak_bytes', 'max'),
+        ).reset_index().rename(columns={'name': 'etapa'})
+        resumo['mem_pico_mib'] = resumo['mem_pico_mib'] / 2 ** 20
+        return resumo
+
+    def print_summary(self):
+        print(self.summary().to_string(index=False, float_format=lambda x: f"{x:.4f}"))
+
+
+class _NullRecord(dict):
+    def __setitem__(self, key, value):
+        pass
+
+
+class _NullStage:
+    __slots__ = ()
+    _record = _NullRecord()
+
+    def __enter__(self):
+        return self._record
+
+    def __exit__(self, *exc):
+        return False
+
+
+class NullTracer:
+    """Tracer desligado (padrão): stage() não mede nada e quase não custa."""
+
+    enabled = False
+    _stage = _NullStage()
+
+    def stage(self, name, rows_in=None):
+        return self._stage
+
+
+NULL_TRACER = NullTracer()
@@ -0,0 +1,143 @@
+"""
+Simulação de várias partições (cursos, campi, turnos, ...) em uma só chamada.
+
+Cada partição tem sua própria demanda, currículo e câmaras e é simulada de forma
+independente em um worker; os resultados são reunidos em uma tabela longa com a
+coluna 'particao' e um resumo por partição. Um orçamento global pode ser dividido
+entre as partições por maiores restos.
+
+Exemplo:
+    data = Data(...)
+    partitions = partition_frames(data.demand_df, data.curriculum_df, data.camaras_df, turno_key(data.demand_df))
+    componentes, resumo = simulate_partitions(partitions, total=80, min_by_compulsory=1)
+"""
+import pandas as pd
+import numpy as np
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from src.apportionment import largest_remainder
+from src.data_loaders import Data
+from src.sim import Indexes, Simulator
+from src.timetable import parse_horarios, slot_labels, slot_matrix
+
+
+def partition_frames(demand_df, curriculum_df, camaras_df, key):
+    """
+    Divide a demanda em partições que compartilham currículo e câmaras.
+
+    Args:
+        key (str | array): Coluna de demand_df ou rótulo (n,) da partição de cada turma.
+
+    Returns:
+        dict: {particao: (demand_df, curriculum_df, camaras_df)}.
+    """
+    rotulos = demand_df[key] if isinstance(key, str) else pd.Series(np.asarray(key), index=demand_df.index)
+    return {
+        particao: (demand_df[rotulos == particao].reset_index(drop=True), curriculum_df, camaras_df)
+        for particao in pd.unique(rotulos.dropna())
+    }
+
+
+def turno_key(demand_df):
+    """'Noturno' para turmas com algum horário N, 'Diurno' para as demais."""
+    noturno = np.array(['N' in label for label in slot_labels()])
+    ocupados = slot_matrix(parse_horarios(demand_df['horario']))
+    return np.where(ocupados[:, noturno].any(axis=1), 'Noturno', 'Diurno')
+
+
+def split_budget(total, weights):
+    """
+    Divide `total` bolsas entre as partições proporcionalmente a `weights`
+    ({particao: peso}), por maiores restos. A soma das partes é sempre `total`.
+    """
+    nomes = list(weights)
+    pesos = np.array([weights[nome] for nome in nomes], dtype=float)
+    if total > 0 and (not np.isfinite(pesos).all() or (pesos < 0).any() or pesos.sum() <= 0):
+        raise ValueError(f"Pesos das partições devem ser finitos, não negativos e com soma positiva: {weights}")
+    bolsas = largest_remainder(pesos, total)[:, 0] if total > 0 else np.zeros(len(nomes), dtype=np.int64)
+    return dict(zip(nomes, bolsas.tolist()))
+
+
+def _frames(partition):
+    if isinstance(partition, Data):
+        return partition.demand_df, partition.curriculum_df, partition.camaras_df
+    return partition
+
+
+def _demand_weight(frames):
+    demand_df, curriculum_df, _ = frames
+    no_curriculo = demand_df['codigo'].isin(curriculum_df['codigo'].unique())
+    return float(demand_df.loc[no_curriculo, 'matriculados'].sum())
+
+
+def _run_partition(task):
+    particao, frames, total, index_function, params = task
+    data = Data.from_frames(*frames)
+    simulator = Simulator(data, MAX_ANUAL_MONITOR=params['MAX_ANUAL_MONITOR'])
+    df = simulator.simulate_by_component_and_practice(
+        index_function,
+        total,
+        min_by_compulsory=params['min_by_compulsory'],
+        min_by_project=params['min_by_project'],
+        strategy=params['strategy'],
+        constraints=params['constraints']
+    )
+    df.attrs = {}
+    df.insert(0, 'particao', particao)
+    return df
+
+
+def simulate_partitions(partitions, total=None, budgets=None, index_function=Indexes.IP_TEORICA, min_by_compulsory=0,
+                        min_by_project=0, MAX_ANUAL_MONITOR=600, strategy='hamilton', constraints=None, weights=None,
+                        backend='process', max_workers=None):
+    """
+    Simula cada partição de forma independente e reúne os resultados.
+
+    Args:
+        partitions (dict): {particao: Data} ou {particao: (demand_df, curriculum_df, camaras_df)}.
+        total (int): Orçamento global, dividido entre as partições por `weights`.
+        budgets (dict): Orçamento de cada partição (alternativa a `total`).
+        weights (dict): Peso de cada partição na divisão de `total` (padrão: matriculados
+            nos componentes do currículo).
+        backend (str): 'process', 'thread' ou 'serial'. No backend 'process',
+            `index_function` precisa ser uma função nomeada de módulo.
+
+    Returns:
+        tuple: (pandas.DataFrame, pandas.DataFrame) com a simulação por componente de
+        todas as partições (coluna 'particao' à esquerda) e o resumo por partição
+        (orcamento, matriculados, n_componentes e bolsas).
+    """
+    if (total is None) == (budgets is None):
+        raise ValueError("Informe apenas um entre 'total' e 'budgets'.")
+    if backend not in ('process', 'thread', 'serial'):
+        raise ValueError(f"Backend desconhecido: {backend}")
+    frames = {particao: _frames(partition) for particao, partition in partitions.items()}
+    if budgets is None:
+        if weights is None:
+            weights = {particao: _demand_weight(f) for particao, f in frames.items()}
+        budgets = split_budget(total, weights)
+    unknown = set(budgets) - set(frames)
+    if unknown:
+        raise ValueError(f"Partições desconhecidas em budgets: {sorted(unknown, key=str)}")
+
+    params = {'min_by_compulsory': min_by_compulsory, 'min_by_project': min_by_project,
+              'MAX_ANUAL_MONITOR': MAX_ANUAL_MONITOR, 'strategy': strategy, 'constraints': constraints}
+    tasks = [(particao, f, int(budgets.get(particao, 0)), index_function, params) for particao, f in frames.items()]
+    if backend == 'serial' or len(tasks) <= 1:
+        results = list(map(_run_partition, tasks))
+    else:
+        n_workers = min(len(tasks), max_workers or os.cpu_count() or 1)
+        executor_class = ProcessPoolExecutor if backend == 'process' else ThreadPoolExecutor
+        with executor_class(max_workers=n_workers) as executor:
+            results = list(executor.map(_run_partition, tasks))
+
+    df = pd.concat(results, ignore_index=True)
+    resumo = df.groupby('particao', sort=False).agg(
+        matriculados=('matriculados', 'sum'),
+        n_componentes=('codigo', 'count'),
+        bolsas_pratica=('bolsas_pratica', 'sum'),
+        bolsas_teorica=('bolsas_teorica', 'sum'),
+        bolsas_total=('bolsas_total', 'sum'),
+    ).reindex(list(frames)).fillna(0).astype(int).reset_index()
+    resumo.insert(1, 'orcamento', [int(budgets.get(particao, 0)) for particao in resumo['particao']])
+    return df, resumo
@@ -1,18 +1,27 @@
 import pandas as pd
 import numpy as np
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import seaborn as sns
 
-def generate_all_simulation_visualizations(df_component, df_area):
-    """
-    Gera um conjunto completo de gráficos com estilo profissional e unificado para
-    analisar a demanda e os resultados da simulação.
+try:
+    from pypdf import PdfWriter
+except ImportError:
+    PdfWriter = None
 
-    Args:
-        df_component (pd.DataFrame): DataFrame da simulação por componente.
-        df_area (pd.DataFrame): DataFrame da simulação por área.
-    """
-    # --- 1. CONFIGURAÇÃO GERAL DE ESTILO ---
+# --- PALETA DE CORES E PARÂMETROS DE TAMANHO ---
+THEORY_COLOR = '#0077b6'
+PRACTICE_COLOR = '#f77f00'
+SINGLE_VALUE_PALETTE = 'crest'
+# Parâmetros de tamanho reduzidos para gráficos mais compactos
+INCH_PER_BAR = 0.5
+MIN_CHART_HEIGHT = 6
+
+
+def _set_theme():
     sns.set_theme(
         style="whitegrid",
         rc={
@@ -25,81 +34,119 @@ def generate_all_simulation_visualizations(df_component, df_area):
         }
     )
 
-    # --- 2. PALETA DE CORES E PARÂMETROS DE TAMANHO ---
-    THEORY_COLOR = '#0077b6'
-    PRACTICE_COLOR = '#f77f00'
-    SINGLE_VALUE_PALETTE = 'crest'
-    # Parâmetros de tamanho reduzidos para gráficos mais compactos
-    INCH_PER_BAR = 0.5
-    MIN_CHART_HEIGHT = 6
-    
+
+# --- FUNÇÕES AUXILIARES DE PLOTAGEM ---
+
+def _apply_common_style(ax, title, is_vertical=False):
+    ax.set_title(title, fontsize=18, weight='bold', pad=15)
+    ax.spines[['top', 'right']].set_visible(False)
+    ax.tick_params(length=0)
+    ax.grid(axis='y' if not is_vertical else 'x', visible=False)
+    ax.grid(axis='x' if not is_vertical else 'y', color='#e0e0e0', linestyle='--', linewidth=0.7)
+
+
+def _add_smart_labels_single_bar(ax):
+    threshold_ratio = 0.08
+    for bar in ax.patches:
+        width = bar.get_width()
+        if width == 0: continue
+        threshold = ax.get_xlim()[1] * threshold_ratio
+        if width < threshold:
+            ax.text(width + ax.get_xlim()[1] * 0.01, bar.get_y() + bar.get_height() / 2,
+                    f'{int(width)}', ha='left', va='center', color='black', fontsize=9)
+        else:
+            ax.text(width / 2, bar.get_y() + bar.get_height() / 2, f'{int(width)}',
+                    ha='center', va='center', color='white', weight='bold', fontsize=10)
+
+
+def _add_labels_to_stacked_bar(ax, bars):
+    for bar in bars:
+        width = bar.get_width()
+        if width > ax.get_xlim()[1] * 0.04:
+            ax.text(bar.get_x() + width / 2, bar.get_y() + bar.get_height() / 2,
+                    f'{int(width)}', ha='center', va='center',
+                    color='white', fontsize=10, weight='bold')
+
+
+def _pyplot_subplots(figsize):
+    return plt.subplots(figsize=figsize)
+
+
+def _headless_subplots(figsize):
+    # Figura fora do pyplot: não depende do backend interativo nem fica registrada
+    fig = Figure(figsize=figsize)
+    return fig, fig.subplots()
+
+
+def prepare_plot_frames(df_component, df_area):
+    """
+    Ordenações, filtros e normalizações compartilhados pelos gráficos, feitos uma vez.
+    """
     area_names = sorted(df_area['titulo'].unique())
     area_colors = sns.color_palette('viridis_r', n_colors=len(area_names))
-    AREA_COLOR_MAP = dict(zip(area_names, area_colors))
-
-    # --- 3. FUNÇÕES AUXILIARES DE PLOTAGEM ---
-
-    def _apply_common_style(ax, title, is_vertical=False):
-        ax.set_title(title, fontsize=18, weight='bold', pad=15)
-        ax.spines[['top', 'right']].set_visible(False)
-        ax.tick_params(length=0)
-        ax.grid(axis='y' if not is_vertical else 'x', visible=False)
-        ax.grid(axis='x' if not is_vertical else 'y', color='#e0e0e0', linestyle='--', linewidth=0.7)
-
-    def _add_smart_labels_single_bar(ax):
-        threshold_ratio = 0.08
-        for bar in ax.patches:
-            width = bar.get_width()
-            if width == 0: continue
-            threshold = ax.get_xlim()[1] * threshold_ratio
-            if width < threshold:
-                ax.text(width + ax.get_xlim()[1] * 0.01, bar.get_y() + bar.get_height() / 2,
-                        f'{int(width)}', ha='left', va='center', color='black', fontsize=9)
-            else:
-                ax.text(width / 2, bar.get_y() + bar.get_height() / 2, f'{int(width)}',
-                        ha='center', va='center', color='white', weight='bold', fontsize=10)
-
-    def _add_labels_to_stacked_bar(ax, bars):
-        for bar in bars:
-            width = bar.get_width()
-            if width > ax.get_xlim()[1] * 0.04:
-                ax.text(bar.get_x() + width / 2, bar.get_y() + bar.get_height() / 2,
-                        f'{int(width)}', ha='center', va='center',
-                        color='white', fontsize=10, weight='bold')
-
-    # --- 4. GERAÇÃO DOS GRÁFICOS ---
 
+    indicators = {
+        'ch_total': 'Carga Horária', 'matriculados': 'Matrículas',
+        'prop_forca_trabalho': 'Força de Trabalho', 'pre_requisito': 'Pré-Requisitos',
+        'obrigatorio_generalista': 'Obrigatórias'
+    }
+    df_norm = df_area[['titulo'] + list(indicators.keys())].copy()
+    for col, new_name in indicators.items():
+        total = df_norm[col].sum()
+        df_norm[new_name] = (df_norm[col] / total) * 100 if total > 0 else 0
+    df_melted = df_norm.drop(columns=list(indicators.keys())).melt(id_vars='titulo', var_name='Indicador', value_name='Proporção (%)')
+
+    area_by_matriculados = df_area.sort_values('matriculados', ascending=False)
+    area_by_bolsas = df_area.sort_values('bolsas_total', ascending=False)
+    return {
+        'area_color_map': dict(zip(area_names, area_colors)),
+        'area_by_matriculados': area_by_matriculados,
+        'component_by_matriculados': df_component[df_component['matriculados'] > 0].sort_values('matriculados', ascending=False),
+        'area_by_ch_total': df_area.sort_values('ch_total', ascending=False),
+        'component_by_ch_total': df_component[df_component['ch_total'] > 0].sort_values('ch_total', ascending=False),
+        'indicators_melted': df_melted,
+        'area_order': area_by_matriculados['titulo'],
+        'area_by_bolsas': area_by_bolsas,
+        'component_by_bolsas': df_component[df_component['bolsas_total'] > 0].sort_values('bolsas_total', ascending=False),
+    }
+
+
+# --- GRÁFICOS ---
+
+def _chart_alunos_por_area(frames, subplots):
     # Gráfico 1: Alunos por Área
-    df_plot = df_area.sort_values('matriculados', ascending=False)
+    df_plot = frames['area_by_matriculados']
     chart_height = max(MIN_CHART_HEIGHT, len(df_plot) * INCH_PER_BAR)
-    fig, ax = plt.subplots(figsize=(12, chart_height))
-    sns.barplot(data=df_plot, x='matriculados', y='titulo', palette=AREA_COLOR_MAP, 
+    fig, ax = subplots((12, chart_height))
+    sns.barplot(data=df_plot, x='matriculados', y='titulo', palette=frames['area_color_map'],
                 hue='titulo', legend=False, ax=ax)
     _apply_common_style(ax, 'Demanda: Total de Alunos por Área (Câmara)')
     ax.set_xlabel('Número Total de Matrículas', fontsize=12)
     ax.set_ylabel('Área (Câmara)', fontsize=12)
     _add_smart_labels_single_bar(ax)
-    plt.tight_layout(pad=1.0)
-    plt.show()
+    return fig
 
+
+def _chart_alunos_por_componente(frames, subplots):
     # Gráfico 2: Alunos por Componente
-    df_plot = df_component[df_component['matriculados'] > 0].sort_values('matriculados', ascending=False)
+    df_plot = frames['component_by_matriculados']
     chart_height = max(MIN_CHART_HEIGHT, len(df_plot) * INCH_PER_BAR * 0.6)
-    fig, ax = plt.subplots(figsize=(12, chart_height))
-    sns.barplot(data=df_plot, x='matriculados', y='titulo', palette=SINGLE_VALUE_PALETTE, 
+    fig, ax = subplots((12, chart_height))
+    sns.barplot(data=df_plot, x='matriculados', y='titulo', palette=SINGLE_VALUE_PALETTE,
                 hue='titulo', legend=False, ax=ax)
     _apply_common_style(ax, 'Demanda: Total de Alunos por Componente')
     ax.set_xlabel('Número de Matrículas', fontsize=12)
     ax.set_ylabel('Componente Curricular', fontsize=12)
     ax.tick_params(axis='y', labelsize=10)
     _add_smart_labels_single_bar(ax)
-    plt.tight_layout(pad=1.0)
-    plt.show()
+    return fig
+
 
-    # Gráfico 3 & 4: Carga Horária
-    df_plot = df_area.sort_values('ch_total', ascending=False)
+def _chart_carga_horaria_por_area(frames, subplots):
+    # Gráfico 3: Carga Horária por Área
+    df_plot = frames['area_by_ch_total']
     chart_height = max(MIN_CHART_HEIGHT, len(df_plot) * INCH_PER_BAR)
-    fig, ax = plt.subplots(figsize=(14, chart_height))
+    fig, ax = subplots((14, chart_height))
     b1 = ax.barh(df_plot['titulo'], df_plot['ch_teorica'], label='Carga Horária Teórica', color=THEORY_COLOR, height=0.8)
     b2 = ax.barh(df_plot['titulo'], df_plot['ch_pratica'], left=df_plot['ch_teorica'], label='Carga Horária Prática', color=PRACTICE_COLOR, height=0.8)
     _apply_common_style(ax, 'Demanda: Carga Horária Total por Área (Câmara)')
@@ -107,12 +154,14 @@ def generate_all_simulation_visualizations(df_component, df_area):
     ax.legend()
     _add_labels_to_stacked_bar(ax, b1)
     _add_labels_to_stacked_bar(ax, b2)
-    plt.tight_layout(pad=1.0)
-    plt.show()
+    return fig
+
 
-    df_plot = df_component[df_component['ch_total'] > 0].sort_values('ch_total', ascending=False)
+def _chart_carga_horaria_por_componente(frames, subplots):
+    # Gráfico 4: Carga Horária por Componente
+    df_plot = frames['component_by_ch_total']
     chart_height = max(MIN_CHART_HEIGHT, len(df_plot) * INCH_PER_BAR * 0.6)
-    fig, ax = plt.subplots(figsize=(14, chart_height))
+    fig, ax = subplots((14, chart_height))
     b1c = ax.barh(df_plot['titulo'], df_plot['ch_teorica'], label='Carga Horária Teórica', color=THEORY_COLOR, height=0.8)
     b2c = ax.barh(df_plot['titulo'], df_plot['ch_pratica'], left=df_plot['ch_teorica'], label='Carga Horária Prática', color=PRACTICE_COLOR, height=0.8)
     _apply_common_style(ax, 'Demanda: Carga Horária Total por Componente')
@@ -121,37 +170,27 @@ def generate_all_simulation_visualizations(df_component, df_area):
     ax.legend()
     _add_labels_to_stacked_bar(ax, b1c)
     _add_labels_to_stacked_bar(ax, b2c)
-    plt.tight_layout(pad=1.0)
-    plt.show()
+    return fig
 
+
+def _chart_fatores_por_area(frames, subplots):
     # Gráfico 5: Fatores de Proporção
-    indicators = {
-        'ch_total': 'Carga Horária', 'matriculados': 'Matrículas',
-        'prop_forca_trabalho': 'Força de Trabalho', 'pre_requisito': 'Pré-Requisitos',
-        'obrigatorio_generalista': 'Obrigatórias'
-    }
-    df_norm = df_area[['titulo'] + list(indicators.keys())].copy()
-    for col, new_name in indicators.items():
-        total = df_norm[col].sum()
-        df_norm[new_name] = (df_norm[col] / total) * 100 if total > 0 else 0
-    df_melted = df_norm.drop(columns=list(indicators.keys())).melt(id_vars='titulo', var_name='Indicador', value_name='Proporção (%)')
-    
-    order = df_area.sort_values('matriculados', ascending=False)['titulo']
-    fig, ax = plt.subplots(figsize=(16, 9)) # Tamanho reduzido
-    sns.barplot(data=df_melted, x='titulo', y='Proporção (%)', hue='Indicador', 
-                order=order, palette='Set2', ax=ax)
+    fig, ax = subplots((16, 9)) # Tamanho reduzido
+    sns.barplot(data=frames['indicators_melted'], x='titulo', y='Proporção (%)', hue='Indicador',
+                order=frames['area_order'], palette='Set2', ax=ax)
     _apply_common_style(ax, 'Demanda: Análise Comparativa dos Fatores por Área', is_vertical=True)
     ax.set_ylabel('Proporção Percentual (%)', fontsize=12)
     ax.set_xlabel('Área (Câmara)', fontsize=12)
     plt.setp(ax.get_xticklabels(), rotation=30, ha="right", fontsize=11)
     ax.legend(title='Indicador', fontsize=11, title_fontsize=13)
-    plt.tight_layout(pad=1.0)
-    plt.show()
+    return fig
 
-    # Gráfico 6 & 7: Bolsas
-    df_plot = df_area.sort_values('bolsas_total', ascending=False)
+
+def _chart_bolsas_por_area(frames, subplots):
+    # Gráfico 6: Composição das Bolsas por Área
+    df_plot = frames['area_by_bolsas']
     chart_height = max(MIN_CHART_HEIGHT, len(df_plot) * INCH_PER_BAR)
-    fig, ax = plt.subplots(figsize=(14, chart_height))
+    fig, ax = subplots((14, chart_height))
     b1b = ax.barh(df_plot['titulo'], df_plot['bolsas_teorica'], label='Bolsas Teóricas', color=THEORY_COLOR, height=0.8)
     b2b = ax.barh(df_plot['titulo'], df_plot['bolsas_pratica'], left=df_plot['bolsas_teorica'], label='Bolsas Práticas', color=PRACTICE_COLOR, height=0.8)
     _apply_common_style(ax, 'Resultado: Composição das Bolsas por Área')
@@ -159,12 +198,14 @@ def generate_all_simulation_visualizations(df_component, df_area):
     ax.legend()
     _add_labels_to_stacked_bar(ax, b1b)
     _add_labels_to_stacked_bar(ax, b2b)
-    plt.tight_layout(pad=1.0)
-    plt.show()
+    return fig
+
 
-    df_plot = df_component[df_component['bolsas_total'] > 0].sort_values('bolsas_total', ascending=False)
+def _chart_bolsas_por_componente(frames, subplots):
+    # Gráfico 7: Composição das Bolsas por Componente
+    df_plot = frames['component_by_bolsas']
     chart_height = max(MIN_CHART_HEIGHT, len(df_plot) * INCH_PER_BAR * 0.6)
-    fig, ax = plt.subplots(figsize=(14, chart_height))
+    fig, ax = subplots((14, chart_height))
     b1cb = ax.barh(df_plot['titulo'], df_plot['bolsas_teorica'], label='Bolsas Teóricas', color=THEORY_COLOR, height=0.8)
     b2cb = ax.barh(df_plot['titulo'], df_plot['bolsas_pratica'], left=df_plot['bolsas_teorica'], label='Bolsas Práticas', color=PRACTICE_COLOR, height=0.8)
     _apply_common_style(ax, 'Resultado: Composição das Bolsas por Componente')
@@ -173,18 +214,134 @@ def generate_all_simulation_visualizations(df_component, df_area):
     ax.legend()
     _add_labels_to_stacked_bar(ax, b1cb)
     _add_labels_to_stacked_bar(ax, b2cb)
-    plt.tight_layout(pad=1.0)
-    plt.show()
+    return fig
 
+
+def _chart_resumo_final(frames, subplots):
     # Gráfico 8: Resumo Final
-    df_plot = df_area.sort_values('bolsas_total', ascending=False)
+    df_plot = frames['area_by_bolsas']
     chart_height = max(MIN_CHART_HEIGHT, len(df_plot) * INCH_PER_BAR)
-    fig, ax = plt.subplots(figsize=(12, chart_height))
-    sns.barplot(data=df_plot, x='bolsas_total', y='titulo', palette=AREA_COLOR_MAP,
+    fig, ax = subplots((12, chart_height))
+    sns.barplot(data=df_plot, x='bolsas_total', y='titulo', palette=frames['area_color_map'],
                 hue='titulo', legend=False, ax=ax)
     _apply_common_style(ax, 'Resultado Final: Total de Bolsas por Área')
     ax.set_xlabel('Número Total de Bolsas', fontsize=12)
     ax.set_ylabel('Área (Câmara)', fontsize=12)
     _add_smart_labels_single_bar(ax)
-    plt.tight_layout(pad=1.0)
-    plt.show()
\ No newline at end of file
+    return fig
+
+
+CHARTS = {
+    '01_alunos_por_area': _chart_alunos_por_area,
+    '02_alunos_por_componente': _chart_alunos_por_componente,
+    '03_carga_horaria_por_area': _chart_carga_horaria_por_area,
+    '04_carga_horaria_por_componente': _chart_carga_horaria_por_componente,
+    '05_fatores_por_area': _chart_fatores_por_area,
+    '06_bolsas_por_area': _chart_bolsas_por_area,
+    '07_bolsas_por_componente': _chart_bolsas_por_componente,
+    '08_resumo_final': _chart_resumo_final,
+}
+
+
+def generate_all_simulation_visualizations(df_component, df_area):
+    """
+    Gera um conjunto completo de gráficos com estilo profissional e unificado para
+    analisar a demanda e os resultados da simulação.
+
+    Args:
+        df_component (pd.DataFrame): DataFrame da simulação por componente.
+        df_area (pd.DataFrame): DataFrame da simulação por área.
+    """
+    _set_theme()
+    frames = prepare_plot_frames(df_component, df_area)
+    for chart in CHARTS.values():
+        chart(frames, _pyplot_subplots)
+        plt.tight_layout(pad=1.0)
+        plt.show()
+
+
+_render_frames = None
+
+
+def _render_init(frames):
+    global _render_frames
+    _render_frames = frames
+    _set_theme()
+
+
+def _render_chart(name, output_dir, formats, prefix, report=None):
+    """
+    Monta o gráfico uma única vez e o salva em cada formato. Com `report`, devolve
+    também a página do relatório em PDF: o caminho de um PDF de uma página (o próprio
+    arquivo .pdf, se 'pdf' estiver em `formats`, ou um em `report`, a pasta temporária)
+    ou, sem pypdf para unir os arquivos, a própria figura.
+    """
+    fig = CHARTS[name](_render_frames, _headless_subplots)
+    fig.tight_layout(pad=1.0)
+    paths = []
+    for fmt in formats:
+        path = os.path.join(output_dir, f"{prefix}{name}.{fmt}")
+        fig.savefig(path, format=fmt)
+        paths.append(path)
+    if report is None:
+        return paths, None
+    if PdfWriter is None:
+        return paths, fig
+    if 'pdf' in formats:
+        return paths, paths[formats.index('pdf')]
+    page = os.path.join(report, f"{name}.pdf")
+    fig.savefig(page, format='pdf')
+    return paths, page
+
+
+def render_all_simulation_visualizations(df_component, df_area, output_dir, formats=('png',), n_jobs=None, pdf_report=None, prefix=''):
+    """
+    Renderiza os mesmos gráficos de generate_all_simulation_visualizations sem
+    exibi-los (figuras fora do pyplot, canvas Agg), salvando-os em arquivos.
+    Gráficos independentes são renderizados em paralelo, cada um uma única vez
+    (inclusive para o relatório em PDF).
+
+    Args:
+        df_component (pd.DataFrame): DataFrame da simulação por componente.
+        df_area (pd.DataFrame): DataFrame da simulação por área.
+        output_dir (str): Pasta de saída.
+        formats (tuple): Formatos dos arquivos ('png', 'svg', 'pdf').
+        n_jobs (int): Processos de renderização (1 renderiza no processo atual).
+        pdf_report (str): Caminho opcional de um PDF com todos os gráficos, um por página.
+        prefix (str): Prefixo dos nomes dos arquivos (ex.: o nome do cenário).
+
+    Returns:
+        list: Caminhos dos arquivos gerados.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    frames = prepare_plot_frames(df_component, df_area)
+    formats = tuple(formats)
+    with tempfile.TemporaryDirectory() as temporario:
+        report = temporario if pdf_report is not None else None
+        tarefas = [(name, output_dir, formats, prefix, report) for name in CHARTS]
+        if n_jobs == 1:
+            _render_init(frames)
+            resultados = [_render_chart(*tarefa) for tarefa in tarefas]
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs, initializer=_render_init, initargs=(frames,)) as executor:
+                resultados = list(executor.map(_render_chart, *zip(*tarefas)))
+        paths = [path for arquivos, _ in resultados for path in arquivos]
+        if pdf_report is not None:
+            _write_pdf_report([page for _, page in resultados], pdf_report)
+            paths.append(pdf_report)
+    return paths
+
+
+def _write_pdf_report(pages, output_path):
+    # Páginas já renderizadas: PDFs de uma página (unidos com pypdf) ou figuras
+    if PdfWriter is not None:
+        writer = PdfWriter()
+        for page in pages:
+            writer.append(page)
+        with open(output_path, 'wb') as f:
+            writer.write(f)
+        return
+    from matplotlib.backends.backend_pdf import PdfPages
+    with PdfPages(output_path) as pdf:
+        for fig in pages:
+            pdf.savefig(fig)
@@ -0,0 +1,205 @@
+import pandas as pd
+import numpy as np
+
+# Memória máxima do bloco de bitsets usado na contagem transitiva
+_BITSET_BLOCK_BYTES = 32 * 2 ** 20
+
+
+def _popcount(words):
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int64)
+    return np.unpackbits(words.view(np.uint8), axis=-1).sum(axis=-1, dtype=np.int64)
+
+
+def _strongly_connected_components(indptr, indices, n):
+    """
+    Tarjan iterativo. Os rótulos saem em ordem topológica reversa: toda aresta entre
+    componentes distintos vai de um rótulo maior para um menor.
+    """
+    index = np.full(n, -1, dtype=np.int64)
+    lowlink = np.zeros(n, dtype=np.int64)
+    on_stack = np.zeros(n, dtype=bool)
+    labels = np.full(n, -1, dtype=np.int64)
+    stack = []
+    counter = 0
+    n_labels = 0
+    for root in range(n):
+        if index[root] >= 0:
+            continue
+        work = [(root, indptr[root])]
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        while work:
+            node, edge = work[-1]
+            if edge < indptr[node + 1]:
+                work[-1] = (node, edge + 1)
+                child = indices[edge]
+                if index[child] < 0:
+                    index[child] = lowlink[child] = counter
+                    counter += 1
+                    stack.append(child)
+                    on_stack[child] = True
+                    work.append((child, indptr[child]))
+                elif on_stack[child]:
+                    lowlink[node] = min(lowlink[node], index[child])
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+            if lowlink[node] == index[node]:
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = False
+                    labels[member] = n_labels
+                    if member == node:
+                        break
+                n_labels += 1
+    return labels, n_labels
+
+
+class PrerequisiteGraph:
+    """
+    Grafo de pré-requisitos do currículo em arrays CSR, com arestas do pré-requisito
+    para o componente que o exige. É construído uma vez por carga do currículo, e as
+    métricas por componente ficam em arrays indexados pela posição em `codes`.
+
+    Atributos:
+        codes (pandas.Index): Códigos do currículo seguidos dos códigos citados apenas
+            como pré-requisito.
+        indptr, indices (numpy.ndarray): Adjacência CSR dos dependentes diretos.
+        direct (numpy.ndarray): Ocorrências como pré-requisito no currículo (a antiga
+            coluna 'pre_requisito').
+        transitive (numpy.ndarray): Componentes distintos que dependem do nó, direta ou
+            indiretamente.
+        depth (numpy.ndarray): Tamanho da maior cadeia de pré-requisitos acima do nó
+            (0 quando não tem pré-requisitos).
+        in_cycle (numpy.ndarray): Nó em um ciclo de pré-requisitos (inclui o componente
+            que exige a si mesmo).
+    """
+
+    FEATURES = {
+        'pre_requisito': 'direct',
+        'pre_requisito_transitivo': 'transitive',
+        'profundidade_pre_requisito': 'depth',
+    }
+
+    def __init__(self, codigos, pre_requisitos):
+        """
+        Args:
+            codigos: Códigos dos componentes do currículo.
+            pre_requisitos: Pré-requisitos de cada componente, separados por ';'
+                (NaN quando não há).
+        """
+        codigos = pd.Series(codigos, dtype=object).astype(str).reset_index(drop=True)
+        tokens = pd.Series(pre_requisitos, dtype=object).reset_index(drop=True).dropna().astype(str).str.split(';').explode()
+        tokens = tokens[tokens != '']
+        self.codes = pd.Index(pd.unique(np.concatenate([codigos.to_numpy(), tokens.to_numpy(dtype=object)])))
+        n = len(self.codes)
+        source = self.codes.get_indexer(tokens.to_numpy(dtype=object)).astype(np.int64)
+        target = self.codes.get_indexer(codigos.to_numpy()[tokens.index.to_numpy()]).astype(np.int64)
+        self.direct = np.bincount(source, minlength=n).astype(np.int64)
+
+        edges = np.unique(source * n + target)
+        source, target = edges // n, edges % n
+        self.indptr = np.concatenate([[0], np.cumsum(np.bincount(source, minlength=n))]).astype(np.int64)
+        self.indices = target
+        order = np.argsort(target, kind='stable')
+        self.prereq_indptr = np.concatenate([[0], np.cumsum(np.bincount(target, minlength=n))]).astype(np.int64)
+        self.prereq_indices = source[order]
+
+        labels, n_labels = _strongly_connected_components(self.indptr, self.indices, n)
+        sizes = np.bincount(labels, minlength=n_labels)
+        self.scc = labels
+        self.in_cycle = (sizes[labels] > 1)
+        self.in_cycle[source[source == target]] = True
+
+        # Grafo condensado: arestas entre componentes fortemente conexos distintos
+        cs, ct = labels[source], labels[target]
+        keep = cs != ct
+        condensed = np.unique(cs[keep] * n_labels + ct[keep])
+        cs, ct = condensed // n_labels, condensed % n_labels
+        depth = np.zeros(n_labels, dtype=np.int64)
+        height = np.zeros(n_labels, dtype=np.int64)
+        # Rótulos decrescentes = ordem topológica (pré-requisitos primeiro)
+        for c, t in zip(cs[::-1].tolist(), ct[::-1].tolist()):
+            if depth[c] + 1 > depth[t]:
+                depth[t] = depth[c] + 1
+        for c, t in zip(cs.tolist(), ct.tolist()):
+            if height[t] + 1 > height[c]:
+                height[c] = height[t] + 1
+        self.depth = depth[labels]
+        self.transitive = self.__transitive_counts(labels, n_labels, sizes, cs, ct, height)
+
+    def __transitive_counts(self, labels, n_labels, sizes, cs, ct, height):
+        # Alcance de cada componente forte como bitset dos nós dependentes, calculado
+        # por nível de altura (dependentes antes) e em blocos de colunas para limitar a memória
+        n = len(labels)
+        counts = np.zeros(n_labels, dtype=np.int64)
+        if len(cs):
+            order = np.lexsort((cs, height[cs]))
+            cs, ct = cs[order], ct[order]
+            level_bounds = np.searchsorted(height[cs], np.arange(1, height.max() + 2))
+            words = -(-n // 64)
+            block_words = int(max(1, min(words, _BITSET_BLOCK_BYTES // (8 * n_labels))))
+            nodes = np.arange(n)
+            for first_word in range(0, words, block_words):
+                width = min(block_words, words - first_word)
+                in_block = (nodes >= first_word * 64) & (nodes < (first_word + width) * 64)
+                bit = nodes[in_block] - first_word * 64
+                own = np.zeros((n_labels, width), dtype=np.uint64)
+                np.bitwise_or.at(own, (labels[in_block], bit // 64), np.left_shift(np.uint64(1), (bit % 64).astype(np.uint64)))
+                reach = np.zeros((n_labels, width), dtype=np.uint64)
+                for start, stop in zip(level_bounds[:-1], level_bounds[1:]):
+                    if start == stop:
+                        continue
+                    level_cs, level_ct = cs[start:stop], ct[start:stop]
+                    starts = np.flatnonzero(np.r_[True, level_cs[1:] != level_cs[:-1]])
+                    reach[level_cs[starts]] = np.bitwise_or.reduceat(reach[level_ct] | own[level_ct], starts, axis=0)
+                counts += _popcount(reach)
+        # Num ciclo, os demais membros também dependem do nó
+        return counts[labels] + sizes[labels] - 1
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __contains__(self, code):
+        return code in self.codes
+
+    def position(self, code):
+        """Posição do código nos arrays do grafo (KeyError se não existir)."""
+        return self.codes.get_loc(code)
+
+    def dependents(self, code):
+        """Componentes que exigem `code` diretamente."""
+        i = self.position(code)
+        return self.codes[self.indices[self.indptr[i]:self.indptr[i + 1]]].tolist()
+
+    def prerequisites(self, code):
+        """Pré-requisitos diretos de `code`."""
+        i = self.position(code)
+        return self.codes[self.prereq_indices[self.prereq_indptr[i]:self.prereq_indptr[i + 1]]].tolist()
+
+    def cycles(self):
+        """Listas de códigos de cada ciclo de pré-requisitos."""
+        members = np.flatnonzero(self.in_cycle)
+        groups = pd.Series(members).groupby(self.scc[members], sort=False).agg(list)
+        return [self.codes[group].tolist() for group in groups]
+
+    def lookup(self, codes, feature):
+        """
+        Métrica `feature` ('direct', 'transitive', 'depth' ou 'in_cycle') para uma
+        sequência de códigos; códigos fora do grafo recebem 0.
+        """
+        positions = self.codes.get_indexer(pd.Index(codes, dtype=object).astype(str))
+        values = getattr(self, feature)
+        return np.where(positions >= 0, values[positions], 0).astype(values.dtype)
+
+    def to_frame(self):
+        df = pd.DataFrame({'codigo': self.codes})
+        for column, feature in self.FEATURES.items():
+            df[column] = getattr(self, feature)
+        df['ciclo_pre_requisito'] = self.in_cycle
+        return df
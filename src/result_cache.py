@@ -0,0 +1,205 @@
+import pandas as pd
+import ast
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import time
+from functools import lru_cache
+
+DEFAULT_ROOT = os.path.join('.cache', 'resultados')
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Módulos de onde parte a simulação: o hash do código cobre estes e todos os módulos
+# de src que eles importam, direta ou indiretamente (inclusive imports dentro de funções)
+_ROOT_MODULES = ('sim', 'data_loaders')
+# Uma entrada corrompida ou gravada por outra versão do código vira uma falha no cache
+_READ_ERRORS = (EOFError, pickle.UnpicklingError, AttributeError, ImportError, ValueError, TypeError)
+
+
+def _src_imports(path):
+    # Módulos de src importados em `path` ('from src.x import ...', 'from src import x', 'import src.x')
+    with open(path, 'rb') as f:
+        tree = ast.parse(f.read(), filename=path)
+    nomes = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom) and node.module == 'src':
+            nomes.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and node.module.startswith('src.'):
+            nomes.add(node.module.split('.')[1])
+        elif isinstance(node, ast.Import):
+            nomes.update(alias.name.split('.')[1] for alias in node.names if alias.name.startswith('src.'))
+    return nomes
+
+
+def code_modules(roots=_ROOT_MODULES):
+    """Arquivos de src que definem o resultado de uma simulação, em ordem alfabética."""
+    directory = os.path.dirname(os.path.abspath(__file__))
+    pendentes, vistos = list(roots), set()
+    while pendentes:
+        nome = pendentes.pop()
+        path = os.path.join(directory, f"{nome}.py")
+        if nome in vistos or not os.path.exists(path):
+            continue
+        vistos.add(nome)
+        pendentes.extend(_src_imports(path) - vistos)
+    return sorted(f"{nome}.py" for nome in vistos)
+
+
+@lru_cache(maxsize=None)
+def _code_signature():
+    digest = hashlib.sha256()
+    directory = os.path.dirname(os.path.abspath(__file__))
+    for name in code_modules():
+        digest.update(name.encode())
+        with open(os.path.join(directory, name), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def function_signature(function):
+    """
+    Identidade de uma função de índice: módulo, nome qualificado e código-fonte
+    (ou o bytecode, quando o fonte não está disponível, ex.: funções criadas com exec).
+    """
+    nome = f"{getattr(function, '__module__', '')}.{getattr(function, '__qualname__', repr(function))}"
+    try:
+        codigo = inspect.getsource(function)
+    except (OSError, TypeError):
+        code = getattr(function, '__code__', None)
+        codigo = repr((code.co_code, code.co_consts)) if code is not None else repr(function)
+    return nome, hashlib.sha256(codigo.encode()).hexdigest()
+
+
+class ResultCache:
+    """
+    Armazém local de resultados de simulação endereçado pelo conteúdo: a chave é o
+    hash dos DataFrames de entrada, da função de índice (nome e fonte), dos
+    parâmetros e do código de todos os módulos de src usados pela simulação (ver
+    code_modules). Cada entrada é um pickle (preserva dtypes e
+    df.attrs) com um .json de metadados ao lado, em `root`.
+
+    O tamanho em disco é limitado a `max_bytes`, removendo primeiro as entradas
+    usadas há mais tempo (LRU pelo mtime, atualizado a cada acerto).
+
+    Exemplo:
+        simulator = Simulator(data, cache=ResultCache())
+        simulator.simulate_by_component_and_practice(Indexes.IP_TEORICA, 80)  # calcula
+        simulator.simulate_by_component_and_practice(Indexes.IP_TEORICA, 80)  # lê do cache
+    """
+
+    def __init__(self, root=DEFAULT_ROOT, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(root, exist_ok=True)
+
+    @staticmethod
+    def key(frames_signature, index_function, **params):
+        """
+        Args:
+            frames_signature (str): Data.frames_signature().
+            index_function (callable): Função de índice.
+            **params: Parâmetros da simulação (total, min_by_compulsory, ...).
+
+        Returns:
+            tuple: (chave hexadecimal, metadados legíveis da entrada).
+        """
+        nome, fonte = function_signature(index_function)
+        meta = {
+            'entradas': frames_signature,
+            'indice': nome,
+            'indice_fonte': fonte,
+            'codigo': _code_signature(),
+            **{k: params[k] for k in sorted(params)},
+        }
+        chave = hashlib.sha256(json.dumps(meta, sort_keys=True, default=repr).encode()).hexdigest()[:32]
+        return chave, meta
+
+    def __path(self, chave):
+        return os.path.join(self.root, f"{chave}.pkl")
+
+    def get(self, chave):
+        path = self.__path(chave)
+        try:
+            df = pd.read_pickle(path)
+        except OSError:
+            self.misses += 1
+            return None
+        except _READ_ERRORS as e:
+            print(f"AVISO: Entrada '{chave}' do cache de resultados ilegível ({type(e).__name__}); recalculando.")
+            self.__remove(chave)
+            self.misses += 1
+            return None
+        os.utime(path)
+        self.hits += 1
+        return df
+
+    def put(self, chave, df, meta=None):
+        path = self.__path(chave)
+        # Grava em arquivo temporário e renomeia: leitores nunca veem um pickle parcial
+        tmp = f"{path}.{os.getpid()}.tmp"
+        pd.to_pickle(df, tmp)
+        os.replace(tmp, path)
+        meta = dict(meta or {}, criado=time.time(), linhas=len(df))
+        with open(os.path.join(self.root, f"{chave}.json"), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, default=repr)
+        self.prune(self.max_bytes)
+
+    def entries(self):
+        """
+        Returns:
+            pandas.DataFrame: chave, bytes, ultimo_uso e os metadados de cada entrada,
+            da usada mais recentemente para a mais antiga.
+        """
+        linhas = []
+        for name in os.listdir(self.root):
+            if not name.endswith('.pkl'):
+                continue
+            chave = name[:-len('.pkl')]
+            stat = os.stat(os.path.join(self.root, name))
+            meta = {}
+            try:
+                with open(os.path.join(self.root, f"{chave}.json"), 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                pass
+            linhas.append({'chave': chave, 'bytes': stat.st_size, 'ultimo_uso': pd.Timestamp(stat.st_mtime, unit='s'), **meta})
+        df = pd.DataFrame(linhas, columns=None if linhas else ['chave', 'bytes', 'ultimo_uso'])
+        return df.sort_values(by='ultimo_uso', ascending=False).reset_index(drop=True)
+
+    def prune(self, max_bytes=0):
+        """
+        Remove as entradas usadas há mais tempo até o total caber em `max_bytes`
+        (0 remove todas).
+
+        Returns:
+            list: Chaves removidas.
+        """
+        entries = self.entries()
+        total = int(entries['bytes'].sum())
+        removidas = []
+        for chave, tamanho in zip(entries['chave'][::-1], entries['bytes'][::-1]):
+            if total <= max_bytes:
+                break
+            self.__remove(chave)
+            total -= tamanho
+            removidas.append(chave)
+        return removidas
+
+    def __remove(self, chave):
+        for ext in ('.pkl', '.json'):
+            try:
+                os.remove(os.path.join(self.root, f"{chave}{ext}"))
+            except FileNotFoundError:
+                pass
+
+    def stats(self):
+        entries = self.entries()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(entries),
+            'bytes': int(entries['bytes'].sum()),
+        }
@@ -0,0 +1,162 @@
+import pandas as pd
+import os
+
+# Linhas convertidas por vez ao escrever no xlsx: limita a cópia em objetos Python
+_XLSX_CHUNK_ROWS = 10000
+
+
+class ResultWriter:
+    """
+    Escreve resultados de simulação em formato longo, uma "aba" por granularidade
+    ('componente', 'camara', ...), acrescentando as linhas de cada cenário sem
+    manter as abas anteriores em memória nem reabrir o arquivo.
+
+    Formatos:
+        'xlsx': uma única pasta de trabalho, gravada em streaming (xlsxwriter em
+            modo constant_memory; openpyxl write-only se o xlsxwriter não existir).
+        'parquet': um diretório com <aba>.parquet (pyarrow.parquet.ParquetWriter).
+        'csv': um diretório com <aba>.csv.
+
+    Exemplo:
+        with ResultWriter('results/study2/bolsas.xlsx') as writer:
+            simulator.simulate_by_area_and_practice(Indexes.IP_TEORICA, 80, writer=writer)
+    """
+
+    FORMATS = ('xlsx', 'parquet', 'csv')
+
+    def __init__(self, path, format=None):
+        """
+        Args:
+            path (str): Arquivo .xlsx, ou diretório para 'parquet'/'csv'.
+            format (str): 'xlsx', 'parquet' ou 'csv'. Inferido pela extensão se None
+                (sem extensão conhecida, usa 'xlsx').
+        """
+        if format is None:
+            extension = os.path.splitext(str(path))[1].lower().lstrip('.')
+            format = extension if extension in self.FORMATS else 'xlsx'
+        if format not in self.FORMATS:
+            raise ValueError(f"Formato desconhecido: {format}")
+        self.path = path
+        self.format = format
+        self.rows = {}
+        self._columns = {}
+        self._sheets = {}
+        self._workbook = None
+        self._engine = None
+        self._closed = False
+        if format == 'xlsx':
+            directory = os.path.dirname(str(path))
+        else:
+            directory = str(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def write(self, sheet, df, cenario=None):
+        """
+        Acrescenta as linhas de `df` à aba `sheet`. A primeira escrita de cada aba
+        define as colunas; as seguintes precisam ter as mesmas.
+
+        Args:
+            sheet (str): Nome da aba (ex.: 'componente', 'camara').
+            df (pandas.DataFrame): Linhas a acrescentar (o índice é descartado).
+            cenario: Se informado, é inserido como primeira coluna 'cenario'.
+        """
+        if self._closed:
+            raise ValueError("ResultWriter já foi fechado.")
+        if cenario is not None:
+            df = df.copy(deep=False)
+            df.insert(0, 'cenario', cenario)
+        columns = [str(column) for column in df.columns]
+        if sheet not in self._columns:
+            self._columns[sheet] = columns
+            self.rows[sheet] = 0
+            self._open_sheet(sheet, df)
+        elif columns != self._columns[sheet]:
+            raise ValueError(f"Colunas diferentes das já escritas na aba '{sheet}'.")
+        if len(df):
+            getattr(self, f'_write_{self.format}')(sheet, df)
+        self.rows[sheet] += len(df)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        if self.format == 'xlsx':
+            if self._workbook is not None:
+                if self._engine == 'xlsxwriter':
+                    self._workbook.close()
+                else:
+                    self._workbook.save(self.path)
+        else:
+            for handle in self._sheets.values():
+                handle.close()
+
+    # xlsx
+
+    def _open_workbook(self):
+        try:
+            import xlsxwriter
+            self._workbook = xlsxwriter.Workbook(self.path, {'constant_memory': True})
+            self._engine = 'xlsxwriter'
+        except ImportError:
+            from openpyxl import Workbook
+            self._workbook = Workbook(write_only=True)
+            self._engine = 'openpyxl'
+
+    def _open_xlsx(self, sheet, df):
+        if self._workbook is None:
+            self._open_workbook()
+        worksheet = self._workbook.add_worksheet(sheet) if self._engine == 'xlsxwriter' else self._workbook.create_sheet(sheet)
+        self._sheets[sheet] = worksheet
+        if self._engine == 'xlsxwriter':
+            worksheet.write_row(0, 0, self._columns[sheet])
+        else:
+            worksheet.append(self._columns[sheet])
+
+    def _write_xlsx(self, sheet, df):
+        worksheet = self._sheets[sheet]
+        row = self.rows[sheet] + 1
+        for start in range(0, len(df), _XLSX_CHUNK_ROWS):
+            chunk = df.iloc[start:start + _XLSX_CHUNK_ROWS]
+            values = chunk.to_numpy(dtype=object)
+            values[pd.isna(chunk).to_numpy()] = None
+            for record in values.tolist():
+                # Em constant_memory cada linha é gravada ao passar para a seguinte
+                if self._engine == 'xlsxwriter':
+                    worksheet.write_row(row, 0, record)
+                else:
+                    worksheet.append(record)
+                row += 1
+
+    # parquet
+
+    def _open_parquet(self, sheet, df):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        schema = pa.Schema.from_pandas(df, preserve_index=False)
+        self._sheets[sheet] = pq.ParquetWriter(os.path.join(self.path, f'{sheet}.parquet'), schema)
+
+    def _write_parquet(self, sheet, df):
+        import pyarrow as pa
+        writer = self._sheets[sheet]
+        writer.write_table(pa.Table.from_pandas(df, schema=writer.schema, preserve_index=False))
+
+    # csv
+
+    def _open_csv(self, sheet, df):
+        handle = open(os.path.join(self.path, f'{sheet}.csv'), 'w', encoding='utf-8', newline='')
+        self._sheets[sheet] = handle
+        df.iloc[:0].to_csv(handle, index=False)
+
+    def _write_csv(self, sheet, df):
+        df.to_csv(self._sheets[sheet], header=False, index=False)
+
+    def _open_sheet(self, sheet, df):
+        getattr(self, f'_open_{self.format}')(sheet, df)
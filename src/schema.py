@@ -0,0 +1,136 @@
+"""
+Tipos compactos para os DataFrames de entrada, aplicados na carga.
+
+Textos repetidos (código, nome, turma, horário, período, câmara) viram categóricos,
+e contagens e cargas horárias viram inteiros estreitos. O 'codigo' da demanda e do
+currículo compartilha as mesmas categorias (ver share_categories), de modo que
+merges e groupbys por código comparam os códigos inteiros das categorias, e não
+strings.
+
+Os tipos compactos ficam só em Data.demand_df, Data.curriculum_df e Data.camaras_df
+(compact=True). As tabelas calculadas por Data voltam aos tipos originais (ver
+decode), e Components.stacked_df e o DemandStore mantêm texto e int64, para que quem
+os consome não dependa deste módulo. Groupbys sobre as colunas categóricas desses
+DataFrames devem passar observed=True, senão as categorias sem linhas também
+aparecem no resultado.
+"""
+import pandas as pd
+import numpy as np
+
+DEMAND_SCHEMA = {
+    'codigo': 'category',
+    'nome': 'category',
+    'turma': 'category',
+    'horario': 'category',
+    'periodo': 'category',
+    'capacidade': 'int16',
+    'matriculados': 'int16',
+}
+
+CURRICULUM_SCHEMA = {
+    'periodo': 'int8',
+    'codigo': 'category',
+    'camara': 'category',
+    'ch_total': 'int16',
+    'ch_pratica': 'int16',
+    'ch_teorica': 'int16',
+    'obrigatorio_generalista': 'int8',
+    'obrigatorio_enfase': 'int8',
+    'obrigatorio_trilhas': 'int8',
+    'origem_pdf_grade': 'category',
+}
+
+CAMARAS_SCHEMA = {
+    'n_professores': 'int16',
+}
+
+
+def _fits(series, dtype):
+    if series.isna().any():
+        return False
+    if not pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+        return False
+    valores = series.to_numpy()
+    if len(valores) and not np.array_equal(valores, np.round(valores)):
+        return False
+    info = np.iinfo(dtype)
+    return len(valores) == 0 or (valores.min() >= info.min and valores.max() <= info.max)
+
+
+def apply_schema(df, schema):
+    """
+    Converte as colunas presentes em `df` para os tipos de `schema`. Colunas inteiras
+    com valores ausentes ou fora da faixa do tipo são mantidas como estão.
+
+    Returns:
+        pandas.DataFrame: Novo DataFrame com os tipos compactos.
+    """
+    df = df.copy()
+    for column, dtype in schema.items():
+        if column not in df.columns:
+            continue
+        if dtype == 'category':
+            if not isinstance(df[column].dtype, pd.CategoricalDtype):
+                df[column] = df[column].astype('category')
+        elif _fits(df[column], dtype):
+            df[column] = df[column].astype(dtype)
+    return df
+
+
+def share_categories(frames, column):
+    """
+    Dá às colunas categóricas `column` de todos os `frames` as mesmas categorias
+    (união ordenada), para que joins entre eles usem os códigos inteiros.
+    """
+    categorias = set()
+    for df in frames:
+        if column in df.columns:
+            categorias.update(df[column].dropna().unique().tolist())
+    dtype = pd.CategoricalDtype(pd.Index(sorted(categorias, key=str)))
+    for df in frames:
+        if column in df.columns:
+            df[column] = df[column].astype(object).astype(dtype)
+    return dtype
+
+
+def decode(df):
+    """Volta as colunas categóricas para texto (tabelas de saída)."""
+    for column in df.columns:
+        if isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype(df[column].cat.categories.dtype)
+    return df
+
+
+def fill_category(series, value):
+    """fillna que aceita um valor fora das categorias de uma coluna categórica."""
+    if isinstance(series.dtype, pd.CategoricalDtype) and value not in series.cat.categories:
+        series = series.cat.add_categories([value])
+    return series.fillna(value)
+
+
+def memory_usage(df):
+    """Bytes ocupados pelo DataFrame, incluindo o conteúdo das strings."""
+    return int(df.memory_usage(deep=True).sum())
+
+
+def memory_report(before, after):
+    """
+    Args:
+        before (dict): {nome: DataFrame} antes da conversão.
+        after (dict): {nome: DataFrame} depois da conversão.
+
+    Returns:
+        pandas.DataFrame: frame, linhas, bytes_antes, bytes_depois e reducao (fração).
+    """
+    linhas = []
+    for nome, df in before.items():
+        antes = memory_usage(df)
+        depois = memory_usage(after[nome])
+        linhas.append({
+            'frame': nome,
+            'linhas': len(after[nome]),
+            'bytes_antes': antes,
+            'bytes_depois': depois,
+            'reducao': 1 - depois / antes if antes else 0.0,
+        })
+    return pd.DataFrame(linhas)
@@ -0,0 +1,119 @@
+import pandas as pd
+import numpy as np
+from src.sim import Indexes
+from src.apportionment import descending_order, largest_remainder
+
+
+class SensitivityAnalysis:
+    """
+    Análise de sensibilidade Monte Carlo da distribuição por IP_TEORICA.
+
+    Perturba matriculados, n_professores por câmara e número de subturmas práticas,
+    e avalia índice e rateio (prática + teoria, como em
+    Simulator.simulate_by_component_and_practice) para todos os sorteios de uma vez,
+    com matrizes (sorteios x componentes).
+    """
+
+    def __init__(self, data, total, min_by_compulsory=0, MAX_ANUAL_MONITOR=600):
+        self.total = total
+        self.min_by_compulsory = min_by_compulsory
+        self.MAX_ANUAL_MONITOR = MAX_ANUAL_MONITOR
+        df = data.get_demand_by_component(use_elective=False)
+        self.componentes = df[['codigo', 'titulo', 'camara']].reset_index(drop=True)
+        self.matriculados = df['matriculados'].to_numpy(dtype=float)
+        self.n_subturmas = df['n_subturmas'].to_numpy(dtype=float)
+        self.ch_teorica = df['ch_teorica'].to_numpy(dtype=float)
+        self.ch_pratica_base = df['ch_pratica_base'].to_numpy(dtype=float)
+        self.prop_obrigatorio = df['prop_obrigatorio'].to_numpy(dtype=float)
+        self.prop_pre_requisito = df['prop_pre_requisito'].to_numpy(dtype=float)
+        self.obrigatorio_generalista = df['obrigatorio_generalista'].to_numpy() == 1
+        camaras = data.camaras_df.drop_duplicates(subset=['camara'])
+        self.n_professores = camaras['n_professores'].fillna(0).to_numpy(dtype=float)
+        # Índice da câmara de cada componente (-1 se a câmara não está na tabela)
+        posicao = pd.Series(np.arange(len(camaras)), index=camaras['camara'])
+        self.camara_idx = df['camara'].map(posicao).fillna(-1).astype(int).to_numpy()
+        # Professores de câmaras duplicadas também entram no total, como em __add_proportions
+        self.professores_extra = data.camaras_df['n_professores'].sum() - self.n_professores.sum()
+
+    def evaluate(self, matriculados, n_professores, n_subturmas):
+        """
+        Avalia índice e rateio para entradas empilhadas.
+
+        Args:
+            matriculados (array): (N, n) matriculados por componente.
+            n_professores (array): (N, k) professores por câmara.
+            n_subturmas (array): (N, n) subturmas por componente.
+
+        Returns:
+            tuple: (bolsas_pratica, bolsas_teorica), matrizes inteiras (N, n).
+        """
+        prop_matriculados = matriculados / matriculados.sum(axis=1, keepdims=True)
+        total_professores = n_professores.sum(axis=1, keepdims=True) + self.professores_extra
+        professores = np.where(self.camara_idx >= 0, n_professores[:, self.camara_idx], 0)
+        ip = Indexes.IP_TEORICA_ARRAY(
+            prop_matriculados,
+            self.ch_teorica,
+            self.prop_obrigatorio,
+            self.prop_pre_requisito,
+            professores / total_professores
+        )
+
+        # O rateio acontece com os componentes ordenados por IP, o que define os desempates
+        ordem = descending_order(ip)
+        inversa = np.argsort(ordem, axis=1)
+        ip = np.take_along_axis(ip, ordem, axis=1)
+        ch_pratica_base = self.ch_pratica_base[ordem]
+        ch_pratica = np.take_along_axis(n_subturmas, ordem, axis=1) * ch_pratica_base
+        pratica = np.where(ch_pratica_base > 0, np.ceil(ch_pratica / self.MAX_ANUAL_MONITOR), 0).astype(np.int64)
+        necessidade = pratica.sum(axis=1)
+        excede = necessidade > self.total
+        if excede.any():
+            pratica[excede] = largest_remainder(pratica[excede].T, np.full(excede.sum(), self.total)).T
+        restantes = np.maximum(0, self.total - pratica.sum(axis=1))
+
+        ativo = (restantes > self.obrigatorio_generalista.sum()) & (self.min_by_compulsory > 0)
+        elegivel = self.obrigatorio_generalista[ordem] & (np.take_along_axis(matriculados, ordem, axis=1) != 0)
+        pisos = elegivel & ativo[:, None]
+        teorica = largest_remainder(ip.T, restantes, pisos.T).T
+        # Sem índice positivo, distribute não aloca nada (nem a pré-alocação)
+        teorica[~(np.nansum(ip, axis=1) > 0)] = 0
+        return np.take_along_axis(pratica, inversa, axis=1), np.take_along_axis(teorica, inversa, axis=1)
+
+    def sample(self, n_draws, cv_matriculados=0.1, sd_professores=1.0, sd_subturmas=0.5, seed=None):
+        """
+        Sorteia entradas perturbadas: ruído log-normal multiplicativo em matriculados,
+        ruído normal aditivo em professores por câmara (mínimo 1 onde havia professores)
+        e em subturmas dos componentes práticos. Todos os valores são arredondados.
+        """
+        rng = np.random.default_rng(seed)
+        n = len(self.matriculados)
+        ruido = rng.normal(-cv_matriculados ** 2 / 2, cv_matriculados, size=(n_draws, n))
+        matriculados = np.rint(self.matriculados * np.exp(ruido))
+        professores = np.rint(self.n_professores + rng.normal(0, sd_professores, size=(n_draws, len(self.n_professores))))
+        professores = np.maximum(professores, np.where(self.n_professores > 0, 1, 0))
+        subturmas = np.rint(self.n_subturmas + rng.normal(0, sd_subturmas, size=(n_draws, n)))
+        subturmas = np.where(self.ch_pratica_base > 0, np.maximum(subturmas, 0), self.n_subturmas)
+        return matriculados, professores, subturmas
+
+    def run(self, n_draws=10000, quantiles=(0.05, 0.25, 0.5, 0.75, 0.95), seed=None, **perturbacao):
+        """
+        Executa a análise e resume a distribuição de bolsas_total por componente.
+
+        Returns:
+            pandas.DataFrame: bolsas_base, média, quantis e a frequência com que a
+            alocação do componente difere da alocação base.
+        """
+        base_pratica, base_teorica = self.evaluate(
+            self.matriculados[None, :], self.n_professores[None, :], self.n_subturmas[None, :]
+        )
+        base = (base_pratica + base_teorica)[0]
+        pratica, teorica = self.evaluate(*self.sample(n_draws, seed=seed, **perturbacao))
+        bolsas = pratica + teorica
+
+        df = self.componentes.copy()
+        df['bolsas_base'] = base
+        df['bolsas_media'] = bolsas.mean(axis=0)
+        for q, valores in zip(quantiles, np.quantile(bolsas, quantiles, axis=0)):
+            df[f'bolsas_q{int(round(q * 100)):02d}'] = valores
+        df['freq_alteracao'] = (bolsas != base).mean(axis=0)
+        return df.sort_values(by='bolsas_base', ascending=False)
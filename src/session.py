@@ -0,0 +1,281 @@
+import pandas as pd
+import numpy as np
+from src.apportionment import compulsory_floors, descending_order, largest_remainder
+from src.sim import IP_TEORICA_PESOS, Indexes
+
+# Colunas de Simulator.allocate, na mesma ordem
+COLUMNS = [
+    'codigo', 'titulo', 'camara', 'matriculados', 'n_turmas', 'n_subturmas', 'ch_teorica', 'ch_pratica',
+    'ch_pratica_base', 'ch_total', 'obrigatorio_generalista', 'obrigatorio_enfase', 'pre_requisito',
+    'n_professores', 'n_componentes', 'prop_matriculados', 'prop_ch_total', 'prop_pre_requisito',
+    'prop_forca_trabalho', 'prop_obrigatorio', 'IP', 'bolsas_pratica', 'bolsas_teorica', 'bolsas_total'
+]
+
+
+class SimulationSession:
+    """
+    Sessão de simulação incremental por componente com Indexes.IP_TEORICA, para
+    editar poucas linhas por vez (ex.: em reunião do conselho) e ver o efeito na hora.
+
+    A tabela agregada fica em arrays NumPy, com as somas usadas em __add_proportions
+    e IP_TEORICA (matriculados, carga horária e professores) mantidas por deltas.
+    Cada edição recalcula só o que depende dela: a etapa prática apenas quando
+    subturmas mudam (ou quando a prática excede o total), e o rateio teórico com o
+    índice renormalizado. O resultado é idêntico ao de
+    Simulator.simulate_by_component_and_practice com os mesmos dados.
+
+    Os parâmetros globais (total, MAX_ANUAL_MONITOR e os pesos de IP_TEORICA, ver
+    Indexes.IP_TEORICA_ARRAY) também podem ser alterados com set_params, para
+    sliders em notebooks (ver interactive).
+
+    Exemplo:
+        session = SimulationSession(Simulator(data), total=80, min_by_compulsory=1)
+        session.set_component('ECT3101', matriculados=900)
+        session.set_camara('Matemática', n_professores=20)
+        session.set_params(total=100, pesos={'obrigatorio': 2.0})
+    """
+
+    def __init__(self, simulator, total, min_by_compulsory=0, pesos=None):
+        self.simulator = simulator
+        self.total = total
+        self.min_by_compulsory = min_by_compulsory
+        self.MAX_ANUAL_MONITOR = simulator.MAX_ANUAL_MONITOR
+        self.pesos = dict(IP_TEORICA_PESOS, **(pesos or {}))
+        data = simulator.data
+        df = data.get_demand_by_component(use_elective=False).reset_index(drop=True)
+        self._base = df
+        self._position = {codigo: i for i, codigo in enumerate(df['codigo'])}
+
+        curriculum = data.curriculum_df.drop_duplicates(subset=['codigo']).set_index('codigo')
+        self.ch_teorica_base = df['codigo'].map(curriculum['ch_teorica']).fillna(0).to_numpy(dtype=float)
+        self.ch_pratica_base = df['ch_pratica_base'].to_numpy(dtype=np.int64)
+        self.matriculados = df['matriculados'].to_numpy(dtype=np.int64).copy()
+        self.n_turmas = df['n_turmas'].to_numpy(dtype=np.int64).copy()
+        self.n_subturmas = df['n_subturmas'].to_numpy(dtype=np.int64).copy()
+        self.ch_teorica = df['ch_teorica'].to_numpy(dtype=np.int64).copy()
+        self.ch_pratica = df['ch_pratica'].to_numpy(dtype=np.int64).copy()
+        self.obrigatorio_generalista = df['obrigatorio_generalista'].to_numpy()
+        self.prop_obrigatorio = df['prop_obrigatorio'].to_numpy(dtype=float)
+        self.prop_pre_requisito = df['prop_pre_requisito'].to_numpy(dtype=float)
+        self.camara = df['camara'].to_numpy()
+        self.n_professores = df['n_professores'].to_numpy(dtype=np.int64).copy()
+        self.camaras = data.camaras_df.drop_duplicates(subset=['camara']).set_index('camara')['n_professores'].fillna(0).astype(int).to_dict()
+
+        # Somas mantidas por deltas (inteiras, portanto exatas)
+        self._sum_matriculados = int(self.matriculados.sum())
+        self._sum_ch_teorica = int(self.ch_teorica.sum())
+        self._sum_ch_total = int((self.ch_teorica + self.ch_pratica).sum())
+        self._total_professores = int(data.camaras_df['n_professores'].sum())
+        self.bolsas_pratica_necessaria = self.__practice_need(np.arange(len(df)))
+        self._sum_pratica_necessaria = int(self.bolsas_pratica_necessaria.sum())
+
+        self.__update_index()
+        self.__update_practice()
+        self.__update_theory()
+
+    def __practice_need(self, rows):
+        base = self.ch_pratica_base[rows]
+        return np.where(base > 0, np.ceil(self.ch_pratica[rows] / self.MAX_ANUAL_MONITOR), 0).astype(np.int64)
+
+    def __update_index(self):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.prop_matriculados = self.matriculados / self._sum_matriculados
+            self.prop_forca_trabalho = self.n_professores / self._total_professores
+            self.IP = Indexes.IP_TEORICA_ARRAY(self.prop_matriculados, self.ch_teorica, self.prop_obrigatorio,
+                                               self.prop_pre_requisito, self.prop_forca_trabalho, self.pesos)
+        # Ordem do DataFrame ordenado por IP, sobre o qual o Simulator rateia
+        self._order = descending_order(self.IP[None, :])[0]
+
+    def __update_practice(self):
+        self._practice_overflow = self._sum_pratica_necessaria > self.total
+        if self._practice_overflow and self._sum_pratica_necessaria > 0:
+            ordem = self._order
+            pratica = np.empty_like(self.bolsas_pratica_necessaria)
+            pratica[ordem] = largest_remainder(self.bolsas_pratica_necessaria[ordem], self.total)[:, 0]
+            self.bolsas_pratica = pratica
+        elif self._practice_overflow:
+            self.bolsas_pratica = np.zeros_like(self.bolsas_pratica_necessaria)
+        else:
+            self.bolsas_pratica = self.bolsas_pratica_necessaria.copy()
+
+    def __update_theory(self):
+        remaining = max(0, self.total - int(self.bolsas_pratica.sum()))
+        teorica = np.zeros(len(self.IP), dtype=np.int64)
+        if self.IP.sum() > 0:
+            ordem = self._order
+            floors = compulsory_floors(self.obrigatorio_generalista[ordem], self.matriculados[ordem], remaining, self.min_by_compulsory)
+            teorica[ordem] = largest_remainder(self.IP[ordem], remaining, floors)[:, 0]
+        self.bolsas_teorica = teorica
+        self.bolsas_total = self.bolsas_pratica + teorica
+
+    def update(self, componentes=None, camaras=None):
+        """
+        Aplica várias edições de uma vez e refaz o rateio uma única vez.
+
+        Args:
+            componentes (dict): {codigo: {'matriculados': ..., 'n_turmas': ..., 'n_subturmas': ...}}.
+            camaras (dict): {camara: n_professores}.
+
+        Returns:
+            pandas.DataFrame: Componentes cujo bolsas_total mudou, com os valores antes
+            e depois e a diferença.
+        """
+        antes = self.bolsas_total.copy()
+        practice_changed = False
+        for codigo, campos in (componentes or {}).items():
+            if codigo not in self._position:
+                raise KeyError(f"Componente desconhecido: {codigo}")
+            unknown = set(campos) - {'matriculados', 'n_turmas', 'n_subturmas'}
+            if unknown:
+                raise ValueError(f"Campos não editáveis: {sorted(unknown)}")
+            i = self._position[codigo]
+            if 'matriculados' in campos:
+                valor = int(campos['matriculados'])
+                self._sum_matriculados += valor - self.matriculados[i]
+                self.matriculados[i] = valor
+            if 'n_turmas' in campos:
+                self.n_turmas[i] = int(campos['n_turmas'])
+                ch_teorica = int(self.n_turmas[i] * self.ch_teorica_base[i])
+                self._sum_ch_teorica += ch_teorica - self.ch_teorica[i]
+                self._sum_ch_total += ch_teorica - self.ch_teorica[i]
+                self.ch_teorica[i] = ch_teorica
+            if 'n_subturmas' in campos:
+                self.n_subturmas[i] = int(campos['n_subturmas'])
+                ch_pratica = int(self.n_subturmas[i] * self.ch_pratica_base[i])
+                self._sum_ch_total += ch_pratica - self.ch_pratica[i]
+                self.ch_pratica[i] = ch_pratica
+                necessidade = self.__practice_need([i])[0]
+                self._sum_pratica_necessaria += necessidade - self.bolsas_pratica_necessaria[i]
+                self.bolsas_pratica_necessaria[i] = necessidade
+                practice_changed = True
+        for camara, n_professores in (camaras or {}).items():
+            if camara not in self.camaras:
+                raise KeyError(f"Câmara desconhecida: {camara}")
+            n_professores = int(n_professores)
+            self._total_professores += n_professores - self.camaras[camara]
+            self.camaras[camara] = n_professores
+            self.n_professores[self.camara == camara] = n_professores
+
+        self.__update_index()
+        # A prática só depende do índice (desempates) quando excede o total
+        if practice_changed or self._practice_overflow or self._sum_pratica_necessaria > self.total:
+            self.__update_practice()
+        self.__update_theory()
+        return self.diff(antes)
+
+    def set_params(self, total=None, MAX_ANUAL_MONITOR=None, pesos=None):
+        """
+        Altera o total de bolsas, a carga anual máxima por monitor e/ou os pesos do
+        índice (ver IP_TEORICA_PESOS) e refaz só as etapas afetadas.
+
+        Returns:
+            pandas.DataFrame: Componentes cujo bolsas_total mudou (ver update).
+        """
+        antes = self.bolsas_total.copy()
+        if pesos is not None:
+            unknown = set(pesos) - set(IP_TEORICA_PESOS)
+            if unknown:
+                raise ValueError(f"Pesos desconhecidos: {sorted(unknown)}")
+            self.pesos.update({k: float(v) for k, v in pesos.items()})
+            self.__update_index()
+        if MAX_ANUAL_MONITOR is not None:
+            self.MAX_ANUAL_MONITOR = MAX_ANUAL_MONITOR
+            self.bolsas_pratica_necessaria = self.__practice_need(np.arange(len(self.IP)))
+            self._sum_pratica_necessaria = int(self.bolsas_pratica_necessaria.sum())
+        if total is not None:
+            self.total = int(total)
+        if MAX_ANUAL_MONITOR is not None or total is not None or self._practice_overflow:
+            self.__update_practice()
+        self.__update_theory()
+        return self.diff(antes)
+
+    def set_component(self, codigo, **campos):
+        """Edita matriculados, n_turmas e/ou n_subturmas de um componente."""
+        return self.update(componentes={codigo: campos})
+
+    def set_camara(self, camara, n_professores):
+        """Edita o número de professores de uma câmara."""
+        return self.update(camaras={camara: n_professores})
+
+    def diff(self, antes):
+        mudou = np.flatnonzero(antes != self.bolsas_total)
+        df = self._base.loc[mudou, ['codigo', 'titulo', 'camara']].copy()
+        df['bolsas_antes'] = antes[mudou]
+        df['bolsas_depois'] = self.bolsas_total[mudou]
+        df['diferenca'] = df['bolsas_depois'] - df['bolsas_antes']
+        return df.sort_values(by='diferenca', ascending=False).reset_index(drop=True)
+
+    def to_frame(self):
+        """Estado atual no formato de Simulator.simulate_by_component_and_practice."""
+        df = self._base.copy()
+        df['matriculados'] = self.matriculados
+        df['n_turmas'] = np.where(self.ch_teorica == 0, 0, self.n_turmas)
+        df['n_subturmas'] = self.n_subturmas
+        df['ch_teorica'] = self.ch_teorica
+        df['ch_pratica'] = self.ch_pratica
+        df['ch_total'] = self.ch_teorica + self.ch_pratica
+        df['n_professores'] = self.n_professores
+        df['prop_matriculados'] = self.prop_matriculados
+        df['prop_ch_total'] = df['ch_total'] / self._sum_ch_total if self._sum_ch_total > 0 else 0
+        df['prop_forca_trabalho'] = self.prop_forca_trabalho
+        df['IP'] = self.IP
+        df['bolsas_pratica'] = self.bolsas_pratica
+        df['bolsas_teorica'] = self.bolsas_teorica
+        df['bolsas_total'] = self.bolsas_total
+        df = df.iloc[self._order]
+        return df.sort_values(by='bolsas_total', ascending=False)[COLUMNS]
+
+
+def interactive(session, top=20, plot=True):
+    """
+    Sliders (ipywidgets) para total, MAX_ANUAL_MONITOR e pesos de IP_TEORICA que
+    atualizam a tabela e o gráfico de bolsas por câmara a cada mudança. A sessão é
+    atualizada em arrays; o DataFrame só é montado para exibição.
+
+    Args:
+        session (SimulationSession): Sessão a controlar.
+        top (int): Número de componentes exibidos na tabela.
+        plot (bool): Exibe o gráfico de bolsas por câmara (matplotlib).
+
+    Returns:
+        ipywidgets.VBox: Os controles e a saída, para exibir no notebook.
+    """
+    # Dependências opcionais: importadas só quando o modo interativo é usado
+    try:
+        import ipywidgets as widgets
+        from IPython.display import display
+    except ImportError as e:
+        raise ImportError("O modo interativo requer os pacotes 'ipywidgets' e 'IPython'.") from e
+
+    sliders = {
+        'total': widgets.IntSlider(value=session.total, min=0, max=max(4 * session.total, 100), description='total'),
+        'MAX_ANUAL_MONITOR': widgets.IntSlider(value=session.MAX_ANUAL_MONITOR, min=60, max=1200, step=30, description='MAX anual'),
+    }
+    for nome, valor in session.pesos.items():
+        sliders[nome] = widgets.FloatSlider(value=valor, min=0.0, max=3.0, step=0.1, description=nome)
+    saida = widgets.Output()
+
+    def render(_=None):
+        session.set_params(
+            total=sliders['total'].value,
+            MAX_ANUAL_MONITOR=sliders['MAX_ANUAL_MONITOR'].value,
+            pesos={nome: sliders[nome].value for nome in session.pesos}
+        )
+        df = session.to_frame()
+        with saida:
+            saida.clear_output(wait=True)
+            display(df[['codigo', 'titulo', 'camara', 'IP', 'bolsas_pratica', 'bolsas_teorica', 'bolsas_total']].head(top))
+            if plot:
+                import matplotlib.pyplot as plt
+                por_camara = df.groupby('camara')['bolsas_total'].sum().sort_values()
+                fig, ax = plt.subplots(figsize=(8, 4))
+                por_camara.plot.barh(ax=ax, color='#4C72B0')
+                ax.set_xlabel('Bolsas')
+                ax.set_ylabel('')
+                ax.set_title(f"Bolsas por câmara (total = {session.total})")
+                plt.show()
+
+    for slider in sliders.values():
+        slider.observe(render, names='value')
+    render()
+    return widgets.VBox([widgets.VBox(list(sliders.values())), saida])
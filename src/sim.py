@@ -1,5 +1,28 @@
 import pandas as pd
 import numpy as np
+import functools
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from src.apportionment import compulsory_floors, largest_remainder, alabama_paradox
+from src.allocation import DivisorAllocator, DIVISOR_METHODS
+from src.instrumentation import NULL_TRACER
+
+# Pesos de IP_TEORICA_ARRAY: expoentes dos fatores multiplicativos e coeficientes dos
+# bônus (1 + peso * proporção). Os valores padrão reproduzem IP_TEORICA.
+IP_TEORICA_PESOS = {
+    'matriculados': 1.0,
+    'ch_teorica': 1.0,
+    'obrigatorio': 1.0,
+    'pre_requisito': 1.0,
+    'forca_trabalho': 1.0,
+}
+
+
+def _power(x, peso):
+    # Fator nulo continua nulo com qualquer expoente (0 ** 0 daria 1)
+    return x if peso == 1 else np.where(np.asarray(x) == 0, 0.0, np.power(x, peso))
+
 
 class Indexes:
  
@@ -10,22 +33,74 @@ class Indexes:
         df['IP'] = df['IP']/df['IP'].sum()
         df = df.sort_values(by='IP', ascending=False)
         return df
+
+    @staticmethod
+    def IP_TEORICA_ARRAY(prop_matriculados, ch_teorica, prop_obrigatorio, prop_pre_requisito, prop_forca_trabalho, pesos=None):
+        """
+        Versão NumPy de IP_TEORICA sobre o último eixo, para avaliar vários cenários
+        empilhados (uma linha por cenário) de uma vez.
+
+        Com `pesos` (ver IP_TEORICA_PESOS), o índice é a fórmula ponderada
+            matriculados^a * ch_teorica^b * (1 + c * obrigatorio) * (1 + d * pre_requisito) / forca_trabalho^e
+        sobre as proporções; os pesos padrão dão exatamente IP_TEORICA. Um fator
+        nulo continua nulo com expoente 0, como na fórmula padrão.
+        """
+        pesos = IP_TEORICA_PESOS if pesos is None else dict(IP_TEORICA_PESOS, **pesos)
+        ch_teorica = np.asarray(ch_teorica, dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ip = (_power(prop_matriculados, pesos['matriculados']) * _power(ch_teorica / ch_teorica.sum(axis=-1, keepdims=True), pesos['ch_teorica'])
+                  * (1 + pesos['obrigatorio'] * prop_obrigatorio) * (1 + pesos['pre_requisito'] * prop_pre_requisito)) / _power(prop_forca_trabalho, pesos['forca_trabalho'])
+            ip = np.where(np.isfinite(ip), ip, 0)
+            return ip / ip.sum(axis=-1, keepdims=True)
     
 class Simulator:
 
-    def __init__(self, data, MAX_ANUAL_MONITOR=600):
+    def __init__(self, data, MAX_ANUAL_MONITOR=600, tracer=None, cache=None):
+        """
+        Args:
+            cache (ResultCache): Se informado, simulate_by_component_and_practice (e,
+                por consequência, simulate_by_area_and_practice) reaproveita resultados
+                já calculados com as mesmas entradas e parâmetros (src.result_cache).
+        """
         self.data = data
         self.MAX_ANUAL_MONITOR = MAX_ANUAL_MONITOR
+        self.cache = cache
+        # Sem tracer explícito, usa o do Data (ou nenhum)
+        if tracer is None:
+            tracer = getattr(data, 'tracer', NULL_TRACER)
+        self.tracer = tracer
    
-    def simulate_by_area_and_practice(self, index_function, total, min_by_compulsory=0, min_by_project=0, xlsx_output_file=None):
+    def simulate_by_area_and_practice(self, index_function, total, min_by_compulsory=0, min_by_project=0, xlsx_output_file=None, writer=None, cenario=None, strategy='hamilton', constraints=None):
+        # A planilha por componente não vai para xlsx_output_file (seria sobrescrita);
+        # com um writer, as duas granularidades vão para o mesmo arquivo
         df = self.simulate_by_component_and_practice(
             index_function,
             total,
             min_by_compulsory=min_by_compulsory,
             min_by_project=min_by_project,
-            xlsx_output_file=xlsx_output_file
+            writer=writer,
+            cenario=cenario,
+            strategy=strategy,
+            constraints=constraints
         )
-        df = df.groupby('camara').agg(
+        df = self.aggregate_by_area(df)
+        self.__write_xlsx(df, xlsx_output_file)
+        if writer is not None:
+            writer.write('camara', df, cenario=cenario)
+        return df
+
+    @staticmethod
+    def aggregate_by_area(df, keys=()):
+        """
+        Agrega a simulação por componente por câmara (coluna 'titulo').
+
+        Args:
+            df (pandas.DataFrame): Resultado de allocate/simulate_by_component_and_practice.
+            keys (tuple): Colunas adicionais de agrupamento, mantidas à esquerda
+                (ex.: 'cenario' e os parâmetros de um sweep).
+        """
+        keys = list(keys)
+        df = df.groupby(keys + ['camara']).agg(
             matriculados      = ('matriculados', 'sum'),
             n_turmas          = ('n_turmas', 'sum'),
             n_subturmas       = ('n_subturmas', 'sum'),
@@ -48,24 +123,147 @@ class Simulator:
             bolsas_total      = ('bolsas_total', 'sum')
         ).reset_index()
         df = df.rename(columns={'camara': 'titulo'})
-        df = df.sort_values(by="bolsas_total", ascending=False)
-        self.__write_xlsx(df, xlsx_output_file)
+        if keys:
+            return df.sort_values(by=keys + ['bolsas_total'], ascending=[True] * len(keys) + [False], kind='stable')
+        return df.sort_values(by="bolsas_total", ascending=False)
+
+    def simulate_by_component_and_practice(self, index_function, total, min_by_compulsory=0, min_by_project=0, xlsx_output_file=None, writer=None, cenario=None, strategy='hamilton', constraints=None):
+        """
+        Args:
+            strategy (str): 'hamilton' (maiores restos, padrão) ou um método de divisores
+                com restrições: 'dhondt', 'sainte-lague' ou 'huntington-hill'.
+            constraints (dict): Restrições das estratégias de divisores (ver distribute_divisor).
+        """
+        with self.tracer.stage('Simulator.simulate_by_component_and_practice') as stage:
+            df = self.data.get_demand_by_component(use_elective=False)
+            stage['rows_in'] = len(df)
+            cached = None
+            if self.cache is not None:
+                chave, meta = self.cache.key(
+                    self.data.frames_signature(), index_function, total=total, min_by_compulsory=min_by_compulsory,
+                    min_by_project=min_by_project, MAX_ANUAL_MONITOR=self.MAX_ANUAL_MONITOR, strategy=strategy,
+                    constraints=constraints
+                )
+                cached = self.cache.get(chave)
+                stage['cache'] = 'miss' if cached is None else 'hit'
+            if cached is not None:
+                df = cached
+            else:
+                df = self.allocate(df, index_function, total, min_by_compulsory=min_by_compulsory, min_by_project=min_by_project,
+                                   strategy=strategy, constraints=constraints)
+                if self.cache is not None:
+                    self.cache.put(chave, df, meta)
+            self.__write_xlsx(df, xlsx_output_file)
+            if writer is not None:
+                writer.write('componente', df, cenario=cenario)
+            stage['rows_out'] = len(df)
         return df
 
-    def simulate_by_component_and_practice(self, index_function, total, min_by_compulsory=0, min_by_project=0, xlsx_output_file=None):
-        df = self.data.get_demand_by_component(use_elective=False)
-        df = index_function(df)
-        df, remaining = self.distribute_by_practice(df, total)
-        df = self.distribute(df, remaining, "IP", min_by_compulsory=min_by_compulsory, min_by_project=min_by_project)
+    def allocate(self, df, index_function, total, min_by_compulsory=0, min_by_project=0, strategy='hamilton', constraints=None):
+        with self.tracer.stage(f"Indexes.{getattr(index_function, '__name__', 'index_function')}", rows_in=len(df)) as stage:
+            df = index_function(df)
+            stage['rows_out'] = len(df)
+        with self.tracer.stage('Simulator.distribute_by_practice', rows_in=len(df)) as stage:
+            df, remaining = self.distribute_by_practice(df, total)
+            stage['rows_out'] = len(df)
+        with self.tracer.stage('Simulator.distribute', rows_in=len(df)) as stage:
+            if strategy == 'hamilton':
+                if min_by_project > 0:
+                    print("AVISO: min_by_project só é aplicado pelas estratégias de divisores.")
+                df = self.distribute(df, remaining, "IP", min_by_compulsory=min_by_compulsory, min_by_project=min_by_project)
+                report = None
+            else:
+                df, report = self.distribute_divisor(df, remaining, "IP", method=strategy, min_by_compulsory=min_by_compulsory,
+                                                     min_by_project=min_by_project, constraints=constraints)
+            stage['rows_out'] = len(df)
         df = df.sort_values(by="bolsas_total", ascending=False)
         df = df[['codigo', 'titulo', 'camara', 'matriculados', 'n_turmas', 'n_subturmas', 'ch_teorica', 'ch_pratica', 'ch_pratica_base', 'ch_total', 'obrigatorio_generalista', 'obrigatorio_enfase', 'pre_requisito', 'n_professores', 'n_componentes', 'prop_matriculados', 'prop_ch_total', 'prop_pre_requisito', 'prop_forca_trabalho', 'prop_obrigatorio', 'IP', 'bolsas_pratica', 'bolsas_teorica', 'bolsas_total']]
         #print(df.columns.tolist())
-        self.__write_xlsx(df, xlsx_output_file)
+        if report is not None:
+            df.attrs['restricoes'] = report
         return df
 
+    def sweep(self, grid, index_functions=None, backend='process', max_workers=None, writer=None):
+        """
+        Simula todas as combinações de parâmetros de uma grade, calculando a tabela
+        de demanda uma única vez e distribuindo os cenários entre workers.
+
+        Args:
+            grid (dict): Listas de valores por parâmetro. Aceita 'total' (obrigatório),
+                'min_by_compulsory', 'min_by_project' e 'MAX_ANUAL_MONITOR'.
+            index_functions (callable | list | dict): Funções de índice a combinar com a
+                grade (padrão: Indexes.IP_TEORICA). No backend 'process' precisam ser
+                funções nomeadas de módulo (não lambdas).
+            backend (str): 'process', 'thread' ou 'serial'.
+            max_workers (int): Número de workers (padrão do executor se None).
+            writer (ResultWriter): Se informado, os resultados de cada lote de cenários
+                são gravados nas abas 'componente' e 'camara' assim que ficam prontos,
+                em vez de concatenados em memória.
+
+        Returns:
+            pandas.DataFrame: Resultado em formato longo, com uma coluna 'cenario' e os
+            parâmetros de cada cenário antes das colunas da simulação por componente.
+            Com `writer`, apenas a tabela de cenários (cenario e parâmetros).
+        """
+        unknown = set(grid) - set(SWEEP_PARAMETERS)
+        if unknown:
+            raise ValueError(f"Parâmetros desconhecidos na grade: {sorted(unknown)}")
+        if 'total' not in grid:
+            raise ValueError("A grade precisa conter o parâmetro 'total'.")
+        if backend not in ('process', 'thread', 'serial'):
+            raise ValueError(f"Backend desconhecido: {backend}")
+        if index_functions is None:
+            index_functions = [Indexes.IP_TEORICA]
+        elif callable(index_functions):
+            index_functions = [index_functions]
+        if not isinstance(index_functions, dict):
+            index_functions = {function.__name__: function for function in index_functions}
+
+        defaults = {'min_by_compulsory': 0, 'min_by_project': 0, 'MAX_ANUAL_MONITOR': self.MAX_ANUAL_MONITOR}
+        keys = list(grid)
+        scenarios = []
+        for index_name in index_functions:
+            for values in itertools.product(*(grid[key] for key in keys)):
+                params = dict(defaults, **dict(zip(keys, values)))
+                params['indice'] = index_name
+                scenarios.append((len(scenarios), params))
+
+        demand_df = self.data.get_demand_by_component(use_elective=False)
+        n_workers = 1 if backend == 'serial' else max_workers or os.cpu_count() or 1
+        # Em série só há um lote, exceto quando o writer grava lote a lote
+        if backend == 'serial' and writer is None:
+            chunk_size = max(1, len(scenarios))
+        else:
+            chunk_size = max(1, len(scenarios) // (4 * n_workers))
+        chunks = [scenarios[i:i + chunk_size] for i in range(0, len(scenarios), chunk_size)]
+        # No mesmo processo o estado vai junto com cada lote; processos o recebem uma
+        # vez no initializer (o pool é exclusivo deste sweep). Nada é global no chamador,
+        # então sweeps simultâneos não se misturam.
+        run = functools.partial(_sweep_run, demand_df=demand_df, index_functions=index_functions)
+        if backend == 'serial':
+            return self.__collect_sweep(map(run, chunks), scenarios, writer)
+        if backend == 'process':
+            run = _sweep_run
+            executor = ProcessPoolExecutor(max_workers=n_workers, initializer=_sweep_init,
+                                           initargs=(demand_df, index_functions))
+        else:
+            executor = ThreadPoolExecutor(max_workers=n_workers)
+        with executor:
+            return self.__collect_sweep(executor.map(run, chunks), scenarios, writer)
+
+    def __collect_sweep(self, results, scenarios, writer):
+        if writer is None:
+            return pd.concat(results, ignore_index=True)
+        keys = ['cenario', 'indice'] + list(SWEEP_PARAMETERS)
+        for df in results:
+            writer.write('componente', df)
+            writer.write('camara', self.aggregate_by_area(df, keys=keys))
+        return pd.DataFrame([dict(cenario=cenario, **params) for cenario, params in scenarios])[keys]
+
     def __write_xlsx(self, df, xlsx_output_file=None):
         if xlsx_output_file is not None:
-            df.to_excel(xlsx_output_file)
+            with self.tracer.stage('Simulator.write_xlsx', rows_in=len(df)):
+                df.to_excel(xlsx_output_file)
 
     def distribute_by_practice(self, df, total):
         df['bolsas_pratica'] = np.where(df['ch_pratica_base'] > 0, df['ch_pratica'] / self.MAX_ANUAL_MONITOR, 0)
@@ -75,13 +273,7 @@ class Simulator:
             print(f"AVISO: Necessidade de bolsas de prática ({necessidade_pratica}) excede o total ({total}).")
             print("Distribuindo todas as bolsas disponíveis para a prática.")
             if necessidade_pratica > 0:
-                proporcao_necessidade = df['bolsas_pratica'] / necessidade_pratica
-                df['bolsas_pratica'] = (proporcao_necessidade * total).apply(np.floor).astype(int)
-                restantes = total - df['bolsas_pratica'].sum()
-                if restantes > 0:
-                    residuos = (proporcao_necessidade * total) - df['bolsas_pratica']
-                    indices_maiores = residuos.nlargest(restantes).index
-                    df.loc[indices_maiores, 'bolsas_pratica'] += 1
+                df['bolsas_pratica'] = largest_remainder(df['bolsas_pratica'].to_numpy(), total)[:, 0]
             else:
                 df['bolsas_pratica'] = 0
         bolsas_alocadas = int(df['bolsas_pratica'].sum())
@@ -90,29 +282,125 @@ class Simulator:
 
     def distribute(self, df, total_bolsas, coluna_indice, min_by_compulsory=0, min_by_project=0):
         df_result = df
-        soma_total_indice = df_result[coluna_indice].sum()
         df_result['bolsas_total'] = 0
-        if total_bolsas > np.sum(df_result['obrigatorio_generalista']==1) and min_by_compulsory > 0:
-            df_result['bolsas_total'] = np.where((df['obrigatorio_generalista'] ==1) & (df['matriculados'] != 0)  , 1, 0)
-        total_bolsas -= df_result['bolsas_total'].sum()
-        if soma_total_indice == 0:
-            df_result['bolsas_total'] = 0
+        if df_result[coluna_indice].sum() == 0:
             return df_result
-        df_result['proporcao'] = df_result[coluna_indice] / soma_total_indice
-        df_result['alocacao_ideal'] = df_result['proporcao'] * total_bolsas
-        df_result['alocacao_base'] = df_result['alocacao_ideal'].apply(np.floor).astype(int)
-        df_result['residuo'] = df_result['alocacao_ideal'] - df_result['alocacao_base']
-        bolsas_alocadas_base = df_result['alocacao_base'].sum()
-        bolsas_restantes = total_bolsas - bolsas_alocadas_base
-        df_result['bolsas_total'] = df_result['bolsas_total']+ df_result['alocacao_base']
-        if bolsas_restantes > 0:
-            indices_maiores_residuos = df_result['residuo'].nlargest(bolsas_restantes).index
-            df_result.loc[indices_maiores_residuos, 'bolsas_total'] += 1
-        df_result.drop(columns=['proporcao', 'alocacao_ideal', 'alocacao_base', 'residuo'], inplace=True)
+        floors = compulsory_floors(df['obrigatorio_generalista'], df['matriculados'], total_bolsas, min_by_compulsory)
+        df_result['bolsas_total'] = largest_remainder(df_result[coluna_indice].to_numpy(), total_bolsas, floors)[:, 0]
         if 'bolsas_pratica' in df_result.columns:
             df_result['bolsas_teorica'] = df['bolsas_total']
             df_result['bolsas_total'] = df_result['bolsas_total'] + df_result['bolsas_pratica']
             colunas = list(df.columns)
             colunas[colunas.index("bolsas_total")], colunas[colunas.index("bolsas_teorica")] = "bolsas_teorica", "bolsas_total"
             df_result = df_result[colunas]
-        return df_result
\ No newline at end of file
+        return df_result
+
+    def distribute_divisor(self, df, total_bolsas, coluna_indice, method='dhondt', min_by_compulsory=0, min_by_project=0, constraints=None):
+        """
+        Alternativa a distribute por método de divisores (src.allocation.DivisorAllocator),
+        com restrições. Todas valem para bolsas_total; a prática já alocada é descontada.
+
+        Args:
+            method (str): 'dhondt', 'sainte-lague' ou 'huntington-hill'.
+            min_by_compulsory (int): Piso de cada obrigatória do generalista com
+                matriculados (mesma condição de ativação de distribute).
+            min_by_project (int): Piso de cada projeto em constraints['projects'].
+            constraints (dict): Opcional, com as chaves
+                'component_max' (bool, padrão True): teto de ceil(ch_total / MAX_ANUAL_MONITOR);
+                'camara_floors' / 'camara_caps' ({camara: bolsas});
+                'projects' ({projeto: [codigos]}, ver data_loaders.load_projects).
+
+        Returns:
+            tuple: (pandas.DataFrame, pandas.DataFrame) com a distribuição e as restrições
+            ativas (tipo, alvo, limite, alocado), em bolsas teóricas.
+        """
+        if method not in DIVISOR_METHODS:
+            raise ValueError(f"Estratégia desconhecida: {method}")
+        constraints = constraints or {}
+        df_result = df
+        pratica = df['bolsas_pratica'].to_numpy() if 'bolsas_pratica' in df.columns else np.zeros(len(df), dtype=np.int64)
+        camaras = df['camara'].to_numpy()
+
+        floors = compulsory_floors(df['obrigatorio_generalista'], df['matriculados'], total_bolsas, min_by_compulsory)[:, 0] * min_by_compulsory
+        caps = None
+        if constraints.get('component_max', True):
+            caps = np.maximum(np.ceil(df['ch_total'].to_numpy() / self.MAX_ANUAL_MONITOR).astype(np.int64) - pratica, 0)
+        pratica_camara = pd.Series(pratica).groupby(camaras).sum()
+        camara_floors = {c: max(0, v - int(pratica_camara.get(c, 0))) for c, v in (constraints.get('camara_floors') or {}).items()}
+        camara_caps = {c: max(0, v - int(pratica_camara.get(c, 0))) for c, v in (constraints.get('camara_caps') or {}).items()}
+
+        position = {codigo: i for i, codigo in enumerate(df['codigo'])}
+        projects, project_floors = {}, {}
+        for project, codigos in (constraints.get('projects') or {}).items():
+            members = [position[codigo] for codigo in codigos if codigo in position]
+            if not members:
+                continue
+            projects[project] = members
+            project_floors[project] = max(0, min_by_project - int(pratica[members].sum()))
+        if min_by_project > 0 and not projects:
+            print("AVISO: min_by_project informado sem projetos em constraints['projects'].")
+
+        allocation, report = DivisorAllocator(method).allocate(
+            df[coluna_indice].to_numpy(), total_bolsas, floors=floors, caps=caps, camaras=camaras,
+            camara_floors=camara_floors, camara_caps=camara_caps, projects=projects, project_floors=project_floors
+        )
+        codigos = df['codigo'].to_numpy()
+        componente = report['tipo'].isin(['piso_componente', 'teto_componente'])
+        report['alvo'] = report['alvo'].astype(object)
+        report.loc[componente, 'alvo'] = codigos[report.loc[componente, 'alvo'].astype(int)]
+
+        df_result['bolsas_teorica'] = allocation
+        df_result['bolsas_total'] = allocation + pratica
+        return df_result, report
+
+    def distribute_curve(self, df, totals, coluna_indice, min_by_compulsory=0):
+        """
+        Distribui `coluna_indice` para vários orçamentos de uma só vez (curva de bolsas
+        em função do total), sem a etapa prática.
+
+        Returns:
+            tuple: (pandas.DataFrame, pandas.DataFrame) com as bolsas por componente
+            (uma coluna por orçamento) e os casos de paradoxo do Alabama, em que o
+            componente perde bolsa quando o orçamento aumenta.
+        """
+        totals = np.atleast_1d(np.asarray(totals))
+        floors = compulsory_floors(df['obrigatorio_generalista'], df['matriculados'], totals, min_by_compulsory)
+        if df[coluna_indice].sum() == 0:
+            allocation = np.zeros((len(df), len(totals)), dtype=np.int64)
+        else:
+            allocation = largest_remainder(df[coluna_indice].to_numpy(), totals, floors)
+        curve = pd.DataFrame(allocation, index=df['codigo'], columns=totals)
+        paradox = pd.DataFrame(alabama_paradox(allocation, totals), index=df['codigo'], columns=totals)
+        return curve, paradox
+
+SWEEP_PARAMETERS = ('total', 'min_by_compulsory', 'min_by_project', 'MAX_ANUAL_MONITOR')
+
+# Estado de um worker de processo do sweep, preenchido pelo initializer do pool
+_sweep_worker_state = {}
+
+
+def _sweep_init(demand_df, index_functions):
+    # A demanda é enviada uma vez por worker, não por cenário
+    _sweep_worker_state['demand_df'] = demand_df
+    _sweep_worker_state['index_functions'] = index_functions
+
+
+def _sweep_run(scenarios, demand_df=None, index_functions=None):
+    if demand_df is None:
+        demand_df = _sweep_worker_state['demand_df']
+        index_functions = _sweep_worker_state['index_functions']
+    frames = []
+    for cenario, params in scenarios:
+        simulator = Simulator(None, MAX_ANUAL_MONITOR=params['MAX_ANUAL_MONITOR'])
+        df = simulator.allocate(
+            demand_df.copy(),
+            index_functions[params['indice']],
+            params['total'],
+            min_by_compulsory=params['min_by_compulsory'],
+            min_by_project=params['min_by_project']
+        )
+        df.insert(0, 'cenario', cenario)
+        for position, key in enumerate(('indice',) + SWEEP_PARAMETERS, start=1):
+            df.insert(position, key, params[key])
+        frames.append(df)
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,146 @@
+"""
+Horários do SIGAA (ex.: '24M12 35T34 (17/03/2025 - 26/07/2025)') como máscaras de
+bits: 7 dias x 16 horários (M1-M6, T1-T6, N1-N4) = 112 bits em dois uint64 por turma.
+
+O bit do horário é 16 * (dia - 1) + deslocamento do turno (M: 0, T: 6, N: 12) +
+(horário - 1), com dia 1 = domingo, ..., 7 = sábado. Os dias 1 a 4 ficam na primeira
+palavra e os dias 5 a 7 na segunda. Quando o horário tem vários intervalos de datas,
+a máscara é a união de todos. O turno da noite só tem N1 a N4: N5 e N6 cairiam nos
+bits do dia seguinte e são rejeitados com ValueError.
+"""
+import pandas as pd
+import numpy as np
+
+TURNOS = {'M': 0, 'T': 6, 'N': 12}
+HORARIOS_POR_TURNO = {'M': 6, 'T': 6, 'N': 4}
+SLOTS_POR_DIA = 16
+DIAS = 7
+N_SLOTS = SLOTS_POR_DIA * DIAS
+# Duração de cada horário na UFRN, em minutos
+MINUTOS_POR_SLOT = 50
+
+_RE_HORARIO = r'(?P<dias>[1-7]+)(?P<turno>[MTN])(?P<horarios>[1-6]+)'
+
+
+def _digit_bits(strings, width):
+    # Máscara com o bit (d - 1) ligado para cada dígito d, via códigos Unicode (n, width)
+    arr = np.asarray(strings, dtype=f'U{width}')
+    codes = arr.view(np.uint32).reshape(len(arr), width).astype(np.int64) - ord('0')
+    valid = (codes >= 1) & (codes <= 9)
+    bits = np.where(valid, np.left_shift(1, np.clip(codes - 1, 0, 15)), 0)
+    return np.bitwise_or.reduce(bits, axis=1).astype(np.uint64)
+
+
+def _parse_unique(horarios):
+    masks = np.zeros((len(horarios), 2), dtype=np.uint64)
+    matches = horarios.str.extractall(_RE_HORARIO)
+    if matches.empty:
+        return masks
+    row = matches.index.get_level_values(0).to_numpy()
+    dias = _digit_bits(matches['dias'].to_numpy(dtype=str), DIAS)
+    turno = matches['turno'].map(TURNOS).to_numpy(dtype=np.uint64)
+    slots = _digit_bits(matches['horarios'].to_numpy(dtype=str), 6)
+    limite = matches['turno'].map(HORARIOS_POR_TURNO).to_numpy(dtype=np.uint64)
+    invalidos = (slots >> limite) != 0
+    if invalidos.any():
+        codigos = sorted(set(horarios.iloc[row[invalidos]]))
+        raise ValueError(f"Horários fora do turno (N vai de N1 a N4): {codigos}")
+    slots = slots << turno
+    # Máscara de 16 bits de cada dia (k, 7), deslocada para a posição na palavra
+    tem_dia = ((dias[:, None] >> np.arange(DIAS, dtype=np.uint64)) & np.uint64(1)).astype(bool)
+    por_dia = np.where(tem_dia, slots[:, None], np.uint64(0))
+    por_dia = por_dia << (np.uint64(SLOTS_POR_DIA) * (np.arange(DIAS, dtype=np.uint64) % np.uint64(4)))
+    np.bitwise_or.at(masks[:, 0], row, np.bitwise_or.reduce(por_dia[:, :4], axis=1))
+    np.bitwise_or.at(masks[:, 1], row, np.bitwise_or.reduce(por_dia[:, 4:], axis=1))
+    return masks
+
+
+def parse_horarios(horarios):
+    """
+    Converte códigos de horário do SIGAA em máscaras de bits.
+
+    Args:
+        horarios: Sequência de códigos (NaN ou texto sem horário viram máscara vazia).
+
+    Returns:
+        numpy.ndarray: Matriz (n, 2) uint64.
+    """
+    codes, uniques = pd.factorize(pd.Series(horarios, dtype=object).fillna('').astype(str))
+    # Os horários se repetem muito entre turmas: só os distintos passam pelo regex
+    return _parse_unique(pd.Series(uniques, dtype=object))[codes]
+
+
+def slot_labels():
+    """Rótulos dos 112 horários na ordem dos bits (ex.: '2M1' = segunda, manhã, 1º horário)."""
+    turnos = [f'M{h}' for h in range(1, 7)] + [f'T{h}' for h in range(1, 7)] + [f'N{h}' for h in range(1, 5)]
+    return [f'{dia}{turno}' for dia in range(1, DIAS + 1) for turno in turnos]
+
+
+def slot_matrix(masks):
+    """Matriz booleana (n, 112) com os horários ocupados."""
+    masks = np.ascontiguousarray(masks, dtype='<u8')
+    bits = np.unpackbits(masks.view(np.uint8).reshape(len(masks), 16), axis=1, bitorder='little')
+    # Cada palavra guarda 4 dias (64 bits); a segunda só usa os 48 primeiros
+    return np.concatenate([bits[:, :64], bits[:, 64:64 + 48]], axis=1).astype(bool)
+
+
+def popcount(masks):
+    """Número de horários ocupados por turma."""
+    masks = np.asarray(masks, dtype=np.uint64)
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(masks).sum(axis=1, dtype=np.int64)
+    return np.unpackbits(np.ascontiguousarray(masks).view(np.uint8), axis=1).sum(axis=1, dtype=np.int64)
+
+
+def weekly_hours(masks, minutos_por_slot=MINUTOS_POR_SLOT):
+    """Carga horária semanal (horas de contato) por turma."""
+    return popcount(masks) * minutos_por_slot / 60
+
+
+def overlaps(masks_a, masks_b=None, chunk_size=2048):
+    """
+    Choques de horário entre todas as turmas de `masks_a` e de `masks_b` (ou de
+    `masks_a` entre si), com AND bit a bit em blocos de linhas.
+
+    Returns:
+        numpy.ndarray: Matriz booleana (len(masks_a), len(masks_b)).
+    """
+    masks_a = np.asarray(masks_a, dtype=np.uint64)
+    masks_b = masks_a if masks_b is None else np.asarray(masks_b, dtype=np.uint64)
+    result = np.empty((len(masks_a), len(masks_b)), dtype=bool)
+    for start in range(0, len(masks_a), chunk_size):
+        bloco = masks_a[start:start + chunk_size, None, :] & masks_b[None, :, :]
+        result[start:start + chunk_size] = bloco.any(axis=2)
+    return result
+
+
+def conflict_pairs(masks):
+    """Pares (i, j), i < j, de turmas com choque de horário."""
+    choques = overlaps(masks)
+    return np.argwhere(np.triu(choques, k=1))
+
+
+def peak_load(masks, keys):
+    """
+    Pico de turmas simultâneas por grupo (ex.: câmara e período).
+
+    Args:
+        masks (numpy.ndarray): Máscaras (n, 2) das turmas.
+        keys (pandas.DataFrame): Colunas de agrupamento, uma linha por turma.
+
+    Returns:
+        pandas.DataFrame: Colunas de `keys`, 'pico_turmas_simultaneas' e 'horario_pico'
+        (primeiro horário em que o pico ocorre).
+    """
+    keys = keys.reset_index(drop=True)
+    if keys.empty:
+        return keys.assign(pico_turmas_simultaneas=pd.Series(dtype=np.int64), horario_pico=pd.Series(dtype=object))
+    codigo = keys.groupby(list(keys.columns), sort=True, dropna=False, observed=True).ngroup().to_numpy()
+    ordem = np.argsort(codigo, kind='stable')
+    inicios = np.flatnonzero(np.r_[True, codigo[ordem][1:] != codigo[ordem][:-1]])
+    # Turmas simultâneas por horário: soma das linhas da matriz de horários de cada grupo
+    carga = np.add.reduceat(slot_matrix(masks[ordem]).astype(np.int32), inicios, axis=0)
+    df = keys.iloc[ordem[inicios]].reset_index(drop=True)
+    df['pico_turmas_simultaneas'] = carga.max(axis=1)
+    df['horario_pico'] = np.array(slot_labels())[carga.argmax(axis=1)]
+    return df
@@ -0,0 +1,81 @@
+import pandas as pd
+import hashlib
+import os
+import re
+import time
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:
+    pa = None
+    feather = None
+
+CACHE_DIR_NAME = '.cache'
+
+
+def _file_key(file_path):
+    """
+    Chave do cache: caminho absoluto, tamanho, mtime e hash do conteúdo do arquivo.
+    """
+    stat = os.stat(file_path)
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    key = f"{os.path.abspath(file_path)}|{stat.st_size}|{stat.st_mtime_ns}|{digest.hexdigest()}"
+    return hashlib.sha256(key.encode()).hexdigest()[:16]
+
+
+def _cache_path(file_path, key):
+    directory, name = os.path.split(os.path.abspath(file_path))
+    stem = os.path.splitext(name)[0]
+    return os.path.join(directory, CACHE_DIR_NAME, f"{stem}.{key}.feather")
+
+
+def _remove_stale(file_path, current):
+    directory = os.path.dirname(current)
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    # Só '<stem>.<chave>.feather': 'demanda.2024.xlsx' não é uma versão de 'demanda.xlsx'
+    padrao = re.compile(re.escape(stem) + r'\.[0-9a-f]{16}\.feather')
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        if padrao.fullmatch(name) and path != current:
+            os.remove(path)
+
+
+def read_excel_cached(file_path, use_cache=True):
+    """
+    Lê uma planilha com pd.read_excel mantendo uma cópia colunar (Feather) ao lado
+    do arquivo de origem, em '.cache/'. Leituras seguintes são feitas via memory-map
+    enquanto caminho, tamanho, mtime e conteúdo do arquivo não mudarem.
+
+    Args:
+        file_path (str): Caminho do arquivo .xlsx.
+        use_cache (bool): Se False (ou sem pyarrow instalado), lê direto do Excel.
+
+    Returns:
+        tuple: (pandas.DataFrame, dict) com o DataFrame e o registro da leitura
+        ({'arquivo', 'cache', 'segundos'}, onde 'cache' é 'hit', 'miss' ou 'desativado').
+    """
+    inicio = time.perf_counter()
+    if not use_cache or feather is None:
+        df = pd.read_excel(file_path)
+        return df, {'arquivo': str(file_path), 'cache': 'desativado', 'segundos': time.perf_counter() - inicio}
+
+    path = _cache_path(file_path, _file_key(file_path))
+    if os.path.exists(path):
+        table = feather.read_table(path, memory_map=True)
+        df = table.to_pandas()
+        status = 'hit'
+    else:
+        df = pd.read_excel(file_path)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            _remove_stale(file_path, path)
+            # Sem compressão para que a leitura possa ser feita via memory-map
+            feather.write_feather(df, path, compression='uncompressed')
+        except (OSError, pa.ArrowException) as e:
+            print(f"AVISO: Não foi possível gravar o cache de '{file_path}': {e}")
+        status = 'miss'
+    return df, {'arquivo': str(file_path), 'cache': status, 'segundos': time.perf_counter() - inicio}
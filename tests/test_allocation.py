@@ -0,0 +1,126 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from src.allocation import DIVISOR_METHODS, DivisorAllocator
+from src.data_loaders import Data
+from src.sim import Indexes, Simulator
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+METHODS = list(DIVISOR_METHODS)
+
+
+def naive_divisor(weights, total, method, caps=None, camaras=None, camara_caps=None):
+    """Uma bolsa por vez ao maior peso / d(k); empate fica com o primeiro item."""
+    weights = np.asarray(weights, dtype=float)
+    caps = np.full(len(weights), np.iinfo(np.int64).max) if caps is None else np.asarray(caps)
+    camara_caps = camara_caps or {}
+    allocation = np.zeros(len(weights), dtype=np.int64)
+    for _ in range(total):
+        melhor, prioridade_melhor = None, -1.0
+        for i, peso in enumerate(weights):
+            if peso <= 0 or allocation[i] >= caps[i]:
+                continue
+            if camaras is not None and camaras[i] in camara_caps and \
+                    allocation[camaras == camaras[i]].sum() >= camara_caps[camaras[i]]:
+                continue
+            d = DIVISOR_METHODS[method](allocation[i])
+            prioridade = np.inf if d == 0 else peso / d
+            if prioridade > prioridade_melhor:
+                melhor, prioridade_melhor = i, prioridade
+        if melhor is None:
+            break
+        allocation[melhor] += 1
+    return allocation
+
+
+@pytest.mark.parametrize('method', METHODS)
+@pytest.mark.parametrize('seed', range(5))
+def test_matches_one_seat_at_a_time(method, seed):
+    rng = np.random.default_rng(seed)
+    weights = rng.random(25) * (rng.random(25) > 0.2)
+    for total in (0, 1, 7, 40, 113):
+        allocation, _ = DivisorAllocator(method).allocate(weights, total)
+        np.testing.assert_array_equal(allocation, naive_divisor(weights, total, method))
+
+
+@pytest.mark.parametrize('method', METHODS)
+def test_matches_reference_with_caps(method):
+    rng = np.random.default_rng(42)
+    weights = rng.random(20)
+    caps = rng.integers(0, 5, size=20)
+    camaras = np.array(list('abcd') * 5, dtype=object)
+    for total in (10, 30, 60):
+        allocation, _ = DivisorAllocator(method).allocate(weights, total, caps=caps)
+        np.testing.assert_array_equal(allocation, naive_divisor(weights, total, method, caps=caps))
+        camara_caps = {'a': 3, 'c': 5}
+        allocation, _ = DivisorAllocator(method).allocate(weights, total, caps=caps, camaras=camaras, camara_caps=camara_caps)
+        np.testing.assert_array_equal(allocation, naive_divisor(weights, total, method, caps, camaras, camara_caps))
+
+
+def test_ties_go_to_the_first_item():
+    allocation, _ = DivisorAllocator('dhondt').allocate([1.0, 1.0, 1.0], 2)
+    assert allocation.tolist() == [1, 1, 0]
+
+
+def test_dhondt_hand_computed():
+    # Quocientes 100, 50, 33.3 | 80, 40 | 30: as 5 bolsas vão para 100, 80, 50, 40, 33.3
+    allocation, _ = DivisorAllocator('dhondt').allocate([100, 80, 30], 5)
+    assert allocation.tolist() == [3, 2, 0]
+
+
+def test_binding_constraints_report():
+    weights = np.array([10.0, 8.0, 1.0, 0.5, 0.0])
+    camaras = np.array(['x', 'x', 'y', 'y', 'y'], dtype=object)
+    allocation, report = DivisorAllocator('dhondt').allocate(
+        weights, 14,
+        floors=np.array([0, 0, 0, 0, 2]),
+        caps=np.array([3, 10, 10, 10, 10]),
+        camaras=camaras,
+        camara_caps={'x': 6},
+        projects={'p': [3]},
+        project_floors={'p': 2},
+    )
+    # Piso do item sem peso e do projeto primeiro; câmara x para em 6 e o item 0 em 3
+    assert allocation.tolist() == [3, 3, 4, 2, 2]
+    assert report.values.tolist() == [
+        ['piso_componente', 4, 2, 2],
+        ['piso_projeto', 'p', 2, 2],
+        ['teto_componente', 0, 3, 3],
+        ['teto_camara', 'x', 6, 6],
+    ]
+
+
+def test_leftover_seats_are_reported():
+    allocation, report = DivisorAllocator('sainte-lague').allocate([1.0, 2.0], 10, caps=[2, 3])
+    assert allocation.tolist() == [2, 3]
+    assert report['tipo'].tolist()[-1] == 'sobra'
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        DivisorAllocator('jefferson')
+
+
+@pytest.fixture(scope='module')
+def data():
+    directory = os.path.join(ROOT, 'data', 'cleaned', 'study2')
+    return Data(
+        os.path.join(directory, 'demanda.xlsx'),
+        os.path.join(directory, 'curriculo.xlsx'),
+        os.path.join(directory, 'camaras.xlsx'),
+        use_file_cache=False
+    )
+
+
+@pytest.mark.parametrize('method', METHODS)
+def test_distribute_divisor_with_component_constraints_only(data, method):
+    # Só pisos/tetos de componente: o caso em que 'alvo' era int64 e quebrava
+    df = Simulator(data).simulate_by_component_and_practice(Indexes.IP_TEORICA, 80, min_by_compulsory=1, strategy=method)
+    report = df.attrs['restricoes']
+    componente = report['tipo'].isin(['piso_componente', 'teto_componente'])
+    assert componente.any()
+    assert report.loc[~componente, 'tipo'].eq('sobra').all()
+    assert report.loc[componente, 'alvo'].isin(df['codigo']).all()
+    # Tetos de ch_total / MAX_ANUAL_MONITOR: o que não cabe sobra, e nada passa de 80
+    assert df['bolsas_total'].sum() <= 80
@@ -0,0 +1,130 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.apportionment import alabama_paradox, compulsory_floors, descending_order, largest_remainder
+
+
+def distribute_reference(df, total_bolsas, coluna_indice, min_by_compulsory=0):
+    """Cópia do Simulator.distribute original, em pandas (sem a etapa prática)."""
+    df_result = df.copy()
+    soma_total_indice = df_result[coluna_indice].sum()
+    df_result['bolsas_total'] = 0
+    if total_bolsas > np.sum(df_result['obrigatorio_generalista'] == 1) and min_by_compulsory > 0:
+        df_result['bolsas_total'] = np.where((df['obrigatorio_generalista'] == 1) & (df['matriculados'] != 0), 1, 0)
+    total_bolsas -= df_result['bolsas_total'].sum()
+    if soma_total_indice == 0:
+        df_result['bolsas_total'] = 0
+        return df_result['bolsas_total'].to_numpy()
+    df_result['proporcao'] = df_result[coluna_indice] / soma_total_indice
+    df_result['alocacao_ideal'] = df_result['proporcao'] * total_bolsas
+    df_result['alocacao_base'] = df_result['alocacao_ideal'].apply(np.floor).astype(int)
+    df_result['residuo'] = df_result['alocacao_ideal'] - df_result['alocacao_base']
+    bolsas_restantes = total_bolsas - df_result['alocacao_base'].sum()
+    df_result['bolsas_total'] = df_result['bolsas_total'] + df_result['alocacao_base']
+    if bolsas_restantes > 0:
+        indices_maiores_residuos = df_result['residuo'].nlargest(bolsas_restantes).index
+        df_result.loc[indices_maiores_residuos, 'bolsas_total'] += 1
+    return df_result['bolsas_total'].to_numpy()
+
+
+def _random_frame(rng, n):
+    # Pesos de poucos valores distintos (restos empatados) e linhas com peso zero
+    ip = rng.choice([0.0, 1.0, 2.0, 3.0, 0.5], size=n) * rng.choice([1.0, 1.0, 7.0], size=n)
+    return pd.DataFrame({
+        'IP': ip,
+        'obrigatorio_generalista': rng.integers(0, 2, size=n),
+        'matriculados': rng.choice([0, 10, 45, 120], size=n),
+    }, index=rng.permutation(n) * 3)
+
+
+def _vectorized(df, totals, min_by_compulsory=0):
+    floors = compulsory_floors(df['obrigatorio_generalista'], df['matriculados'], totals, min_by_compulsory)
+    return largest_remainder(df['IP'].to_numpy(), totals, floors)
+
+
+def test_fixed_inputs():
+    df = pd.DataFrame({
+        'IP': [0.4, 0.3, 0.2, 0.1, 0.0],
+        'obrigatorio_generalista': [1, 0, 1, 0, 1],
+        'matriculados': [50, 40, 0, 10, 30],
+    })
+    for total in (0, 1, 3, 4, 7, 10, 23):
+        for minimo in (0, 1):
+            esperado = distribute_reference(df, total, 'IP', minimo)
+            np.testing.assert_array_equal(_vectorized(df, total, minimo)[:, 0], esperado)
+    # Com 10 bolsas e piso: 2 pré-alocadas (linhas 0 e 4); as 8 restantes dão cotas
+    # 3.2, 2.4, 1.6, 0.8 e 0, e as 2 sobras vão para os restos 0.8 e 0.6
+    assert _vectorized(df, 10, 1)[:, 0].tolist() == [4, 2, 2, 1, 1]
+
+
+def test_ties_go_to_the_first_row():
+    # Três restos iguais a 1/3: a única sobra vai para a primeira linha, qualquer que seja o índice
+    df = pd.DataFrame({'IP': [1.0, 1.0, 1.0], 'obrigatorio_generalista': 0, 'matriculados': 1}, index=[7, 2, 5])
+    assert distribute_reference(df, 4, 'IP').tolist() == [2, 1, 1]
+    assert _vectorized(df, 4)[:, 0].tolist() == [2, 1, 1]
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_random_inputs_match_pandas(seed):
+    rng = np.random.default_rng(seed)
+    df = _random_frame(rng, int(rng.integers(1, 60)))
+    totals = np.unique(rng.integers(0, 200, size=12))
+    minimo = int(rng.integers(0, 2))
+    if df['IP'].sum() == 0:
+        df.iloc[0, 0] = 1.0
+    matriz = _vectorized(df, totals, minimo)
+    pisos = compulsory_floors(df['obrigatorio_generalista'], df['matriculados'], totals, minimo)
+    sem_peso = df['IP'].to_numpy() == 0
+    for j, total in enumerate(totals):
+        np.testing.assert_array_equal(matriz[:, j], distribute_reference(df, int(total), 'IP', minimo))
+        assert matriz[:, j].sum() == total
+    # Linhas com peso zero ficam só com o piso
+    np.testing.assert_array_equal(matriz[sem_peso], pisos[sem_peso])
+
+
+def test_weights_per_budget():
+    rng = np.random.default_rng(3)
+    weights = rng.random((15, 4))
+    totals = np.array([5, 17, 40, 41])
+    matriz = largest_remainder(weights, totals)
+    for j, total in enumerate(totals):
+        np.testing.assert_array_equal(matriz[:, j], largest_remainder(weights[:, j], total)[:, 0])
+
+
+def test_compulsory_floors_activation():
+    obrigatorio = np.array([1, 1, 0, 1])
+    matriculados = np.array([10, 0, 5, 3])
+    pisos = compulsory_floors(obrigatorio, matriculados, [2, 3, 4, 10], min_by_compulsory=1)
+    # Ativo apenas para orçamentos maiores que o número de obrigatórias (3)
+    assert pisos.T.tolist() == [[0, 0, 0, 0], [0, 0, 0, 0], [1, 0, 0, 1], [1, 0, 0, 1]]
+    assert not compulsory_floors(obrigatorio, matriculados, [10], min_by_compulsory=0).any()
+
+
+def test_alabama_paradox():
+    # Exemplo clássico: com 11 bolsas o terceiro perde uma das 2 que tinha com 10
+    totals = np.array([11, 10, 12])
+    allocation = largest_remainder([6.0, 6.0, 2.0], totals)
+    assert allocation.T.tolist() == [[5, 5, 1], [4, 4, 2], [5, 5, 2]]
+    assert alabama_paradox(allocation, totals).tolist() == [[False, False, False], [False, False, False], [True, False, False]]
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_alabama_paradox_matches_loop(seed):
+    rng = np.random.default_rng(seed)
+    totals = rng.permutation(np.arange(1, 60))
+    allocation = largest_remainder(rng.random(8), totals)
+    esperado = np.zeros(allocation.shape, dtype=bool)
+    coluna = {total: j for j, total in enumerate(totals)}
+    for total in range(2, 60):
+        esperado[:, coluna[total]] = allocation[:, coluna[total]] < allocation[:, coluna[total - 1]]
+    np.testing.assert_array_equal(alabama_paradox(allocation, totals), esperado)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_descending_order_matches_sort_values(seed):
+    rng = np.random.default_rng(seed)
+    values = rng.choice([0.0, 0.1, 0.25, 0.5], size=(4, 300))
+    ordem = descending_order(values)
+    for linha, valores in enumerate(values):
+        esperado = pd.DataFrame({'IP': valores}).sort_values(by='IP', ascending=False).index.to_numpy()
+        np.testing.assert_array_equal(ordem[linha], esperado)
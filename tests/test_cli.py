@@ -0,0 +1,40 @@
+import os
+import subprocess
+import sys
+from src.__main__ import main
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PESADOS = ('matplotlib', 'seaborn', 'camelot', 'lxml')
+# Folga para máquinas lentas: hoje 'import src.sim' custa ~0,4 s, quase tudo pandas
+ORCAMENTO_IMPORT_SEGUNDOS = 3.0
+
+
+def _import_times(module):
+    resultado = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    tempos = {}
+    for linha in resultado.stderr.splitlines():
+        if not linha.startswith('import time:') or 'cumulative' in linha:
+            continue
+        # 'import time:  <próprio> | <cumulativo> | <módulo>', em microssegundos
+        _, cumulativo, nome = linha[len('import time:'):].split('|')
+        tempos[nome.strip()] = int(cumulativo) / 1e6
+    return tempos
+
+
+def test_import_sim_skips_heavy_dependencies():
+    tempos = _import_times('src.sim')
+    carregados = {nome.split('.')[0] for nome in tempos}
+    assert not carregados & set(PESADOS)
+    assert tempos['src.sim'] < ORCAMENTO_IMPORT_SEGUNDOS
+
+
+def test_rejects_array_index(capsys):
+    assert main(['simulate', '--total', '10', '--index', 'IP_TEORICA_ARRAY']) == 2
+    assert 'IP_TEORICA_ARRAY' in capsys.readouterr().out
+
+
+def test_rejects_unknown_index(capsys):
+    assert main(['simulate', '--total', '10', '--index', 'NAO_EXISTE']) == 2
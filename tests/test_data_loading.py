@@ -0,0 +1,49 @@
+import os
+import shutil
+import pandas as pd
+import pytest
+from src.data_loaders import Data, DataLoadError
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STUDY2 = os.path.join(ROOT, 'data', 'cleaned', 'study2')
+
+
+def _paths(directory):
+    return {
+        'demand_file_path': os.path.join(directory, 'demanda.xlsx'),
+        'curriculum_file_path': os.path.join(directory, 'curriculo.xlsx'),
+        'camaras_file_path': os.path.join(directory, 'camaras.xlsx'),
+    }
+
+
+@pytest.mark.parametrize('concurrent', [False, True])
+def test_missing_inputs_are_all_reported(tmp_path, concurrent):
+    shutil.copyfile(os.path.join(STUDY2, 'camaras.xlsx'), tmp_path / 'camaras.xlsx')
+    with pytest.raises(DataLoadError) as erro:
+        Data(**_paths(tmp_path), use_file_cache=False, concurrent=concurrent)
+    assert [f['entrada'] for f in erro.value.failures] == ['curriculo', 'demanda']
+
+
+@pytest.mark.parametrize('concurrent', [False, True])
+def test_pre_process_errors_are_wrapped(tmp_path, concurrent):
+    for nome in ('demanda.xlsx', 'camaras.xlsx'):
+        shutil.copyfile(os.path.join(STUDY2, nome), tmp_path / nome)
+    # Currículo sem 'ch_pratica': pre_process_curriculum falha com KeyError
+    pd.read_excel(os.path.join(STUDY2, 'curriculo.xlsx')).drop(columns=['ch_pratica']).to_excel(tmp_path / 'curriculo.xlsx', index=False)
+    with pytest.raises(DataLoadError) as erro:
+        Data(**_paths(tmp_path), use_file_cache=False, concurrent=concurrent)
+    assert [f['entrada'] for f in erro.value.failures] == ['curriculo']
+    assert 'KeyError' in erro.value.failures[0]['erro']
+
+
+def test_from_frames_wraps_pre_process_errors():
+    curriculo = pd.read_excel(os.path.join(STUDY2, 'curriculo.xlsx')).drop(columns=['ch_pratica'])
+    with pytest.raises(DataLoadError):
+        Data.from_frames(pd.read_excel(os.path.join(STUDY2, 'demanda.xlsx')), curriculo, pd.read_excel(os.path.join(STUDY2, 'camaras.xlsx')))
+
+
+def test_serial_and_concurrent_load_the_same_frames():
+    serial = Data(**_paths(STUDY2), use_file_cache=False)
+    concorrente = Data(**_paths(STUDY2), use_file_cache=False, concurrent=True)
+    for _, attr, _ in Data.INPUTS:
+        pd.testing.assert_frame_equal(getattr(serial, attr), getattr(concorrente, attr))
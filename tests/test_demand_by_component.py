@@ -0,0 +1,106 @@
+"""
+Regressão de Data.get_demand_by_component (agregação vetorizada) contra a
+implementação original, com groupby().apply() por componente.
+"""
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+from src.data_loaders import Data
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COLUNAS_OBRIGATORIO = ['obrigatorio_generalista', 'obrigatorio_enfase']
+# prop_obrigatorio passou a usar a cobertura das 16 trilhas (obrigatorio_trilhas) e
+# não é comparada; as demais colunas vêm da agregação original
+COLUNAS = [
+    'codigo', 'titulo', 'camara', 'matriculados', 'n_turmas', 'n_subturmas', 'ch_teorica',
+    'ch_pratica', 'obrigatorio_generalista', 'obrigatorio_enfase', 'ch_pratica_base', 'ch_total',
+    'pre_requisito', 'n_professores', 'n_componentes', 'prop_matriculados', 'prop_ch_total',
+    'prop_pre_requisito', 'prop_forca_trabalho'
+]
+
+
+def load_study(study, compact=True):
+    directory = os.path.join(ROOT, 'data', 'cleaned', study)
+    curriculo = pd.read_excel(os.path.join(directory, 'curriculo.xlsx'))
+    faltando = [coluna for coluna in COLUNAS_OBRIGATORIO if coluna not in curriculo.columns]
+    if faltando:
+        pytest.skip(f"{study}/curriculo.xlsx não tem {', '.join(faltando)}, exigidas por get_demand_by_component")
+    return Data(
+        os.path.join(directory, 'demanda.xlsx'),
+        os.path.join(directory, 'curriculo.xlsx'),
+        os.path.join(directory, 'camaras.xlsx'),
+        use_file_cache=False,
+        compact=compact
+    )
+
+
+def reference_demand_by_component(data, use_elective=False):
+    """Cópia da implementação original, com apply por componente."""
+    demand_df = data.demand_df.copy()
+    curriculum_df = data.curriculum_df
+    demand_df['turma_principal'] = demand_df['turma'].astype(str).str.extract(r'(\d+)').fillna('0')
+    target_demand_df = demand_df
+    if not use_elective:
+        curriculum_codes = curriculum_df['codigo'].unique()
+        target_demand_df = demand_df[demand_df['codigo'].isin(curriculum_codes)].copy()
+    curriculum_info = curriculum_df[[
+        'codigo', 'nome', 'camara', 'ch_teorica', 'ch_pratica',
+        'obrigatorio_generalista', 'obrigatorio_enfase'
+    ]].drop_duplicates(subset=['codigo']).rename(columns={'ch_pratica': 'carga_horaria_pratica_base'})
+
+    demand_with_info = pd.merge(target_demand_df, curriculum_info, on='codigo', how='left')
+    demand_with_info['nome'] = np.where(
+        demand_with_info['nome_y'].notna(),
+        demand_with_info['nome_y'],
+        demand_with_info['nome_x']
+    )
+    demand_with_info.drop(columns=['nome_x', 'nome_y'], inplace=True)
+    demand_with_info[['ch_teorica', 'carga_horaria_pratica_base', 'obrigatorio_generalista', 'obrigatorio_enfase']] = \
+        demand_with_info[['ch_teorica', 'carga_horaria_pratica_base', 'obrigatorio_generalista', 'obrigatorio_enfase']].fillna(0)
+    demand_with_info['camara'] = demand_with_info['camara'].fillna('Não definida')
+
+    def aggregate_component(group):
+        n_turmas = group.drop_duplicates(subset=['periodo', 'turma_principal']).shape[0]
+        grupo_pratico = group[group['carga_horaria_pratica_base'] > 0]
+        n_subturmas = grupo_pratico.drop_duplicates(subset=['periodo', 'turma']).shape[0]
+        ch_teorica_base = group['ch_teorica'].iloc[0]
+        carga_horaria_pratica_base = group['carga_horaria_pratica_base'].iloc[0]
+        return pd.Series({
+            'matriculados': group['matriculados'].sum(),
+            'n_turmas': n_turmas,
+            'n_subturmas': n_subturmas,
+            'ch_teorica': n_turmas * ch_teorica_base,
+            'ch_pratica': n_subturmas * carga_horaria_pratica_base,
+            'obrigatorio_generalista': group['obrigatorio_generalista'].iloc[0],
+            'obrigatorio_enfase': group['obrigatorio_enfase'].iloc[0],
+            'ch_pratica_base': carga_horaria_pratica_base
+        })
+    summary_df = demand_with_info.groupby(['codigo', 'nome', 'camara']).apply(aggregate_component, include_groups=False).reset_index()
+    summary_df = summary_df.rename(columns={'nome': 'titulo'})
+    int_columns = ['matriculados', 'n_turmas', 'n_subturmas', 'ch_teorica', 'ch_pratica', 'ch_pratica_base', 'obrigatorio_generalista', 'obrigatorio_enfase']
+    summary_df[int_columns] = summary_df[int_columns].astype(int)
+    summary_df.loc[summary_df['ch_teorica'] == 0, 'n_turmas'] = 0
+    summary_df = summary_df.sort_values(by='matriculados', ascending=False)
+    summary_df['ch_total'] = summary_df['ch_teorica'] + summary_df['ch_pratica']
+    summary_df = summary_df.sort_values(by='matriculados', ascending=False)
+    all_prereqs = curriculum_df['pre_requisitos'].dropna().str.split(';').explode()
+    summary_df['pre_requisito'] = summary_df['codigo'].map(all_prereqs.value_counts()).fillna(0).astype(int)
+    summary_df = pd.merge(summary_df, data.camaras_df, on='camara', how='left')
+    summary_df['n_professores'] = summary_df['n_professores'].fillna(0).astype(int)
+    summary_df['n_componentes'] = 1
+    summary_df['prop_matriculados'] = summary_df['matriculados'] / summary_df['matriculados'].sum()
+    summary_df['prop_ch_total'] = summary_df['ch_total'] / summary_df['ch_total'].sum()
+    summary_df['prop_pre_requisito'] = summary_df['pre_requisito'] / curriculum_df['codigo'].count()
+    summary_df['prop_forca_trabalho'] = summary_df['n_professores'] / data.camaras_df['n_professores'].sum()
+    return summary_df
+
+
+@pytest.mark.parametrize('study', ['study1', 'study2'])
+@pytest.mark.parametrize('use_elective', [False, True])
+def test_matches_reference(study, use_elective):
+    esperado = reference_demand_by_component(load_study(study, compact=False), use_elective)
+    for compact in (False, True):
+        obtido = load_study(study, compact=compact).get_demand_by_component(use_elective=use_elective)
+        assert_frame_equal(obtido[COLUNAS], esperado[COLUNAS])
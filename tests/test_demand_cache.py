@@ -0,0 +1,89 @@
+import os
+import shutil
+import pytest
+from pandas.testing import assert_frame_equal
+from src.data_loaders import Data
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STUDY2 = os.path.join(ROOT, 'data', 'cleaned', 'study2')
+ARQUIVOS = ('demanda.xlsx', 'curriculo.xlsx', 'camaras.xlsx')
+
+
+def _data(directory=STUDY2):
+    return Data(*(os.path.join(directory, arquivo) for arquivo in ARQUIVOS), use_file_cache=False)
+
+
+def _matriculados(df, codigo):
+    return int(df.loc[df['codigo'] == codigo, 'matriculados'].iloc[0])
+
+
+def test_hits_and_misses():
+    data = _data()
+    componentes = data.get_demand_by_component()
+    data.get_demand_by_component()
+    data.get_demand_by_component(use_elective=True)
+    data.get_demand_by_area()
+    data.get_demand_by_area()
+    # A tabela por área parte da tabela por componente (mais um acerto)
+    assert data.cache_info() == {'hits': 3, 'misses': 3, 'entries': 3}
+    # Alterar a cópia devolvida não corrompe o cache
+    componentes['matriculados'] = 0
+    assert (data.get_demand_by_component()['matriculados'] > 0).any()
+
+
+def test_in_place_mutation_needs_invalidate():
+    data = _data()
+    codigo = data.get_demand_by_component()['codigo'].iloc[0]
+    antes = _matriculados(data.get_demand_by_component(), codigo)
+    linhas = data.demand_df['codigo'] == codigo
+    data.demand_df.loc[linhas, 'matriculados'] = data.demand_df.loc[linhas, 'matriculados'] + 100
+    data.invalidate()
+    misses = data.cache_misses
+    depois = _matriculados(data.get_demand_by_component(), codigo)
+    assert data.cache_misses == misses + 1
+    assert depois == antes + 100 * int(linhas.sum())
+
+
+def test_replaced_frames_and_new_columns_invalidate():
+    data = _data()
+    original = data.get_demand_by_component()
+    data.camaras_df = data.camaras_df.assign(n_professores=data.camaras_df['n_professores'] * 2)
+    dobrado = data.get_demand_by_component()
+    assert data.cache_info()['misses'] == 2
+    assert (dobrado['n_professores'] == 2 * original['n_professores']).all()
+    data.demand_df['extra'] = 1
+    data.get_demand_by_component()
+    assert data.cache_info()['misses'] == 3
+
+
+def test_reload_and_source_change_invalidate(tmp_path):
+    for arquivo in ARQUIVOS:
+        shutil.copy(os.path.join(STUDY2, arquivo), tmp_path / arquivo)
+    data = _data(str(tmp_path))
+    original = data.get_demand_by_component()
+    data.load_data()
+    assert_frame_equal(data.get_demand_by_component(), original)
+    assert data.cache_info()['misses'] == 2
+    # Arquivo de origem alterado em disco: recarrega na próxima consulta
+    caminho = tmp_path / 'camaras.xlsx'
+    stat = os.stat(caminho)
+    os.utime(caminho, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    data.get_demand_by_component()
+    assert data.cache_info()['misses'] == 3
+
+
+def test_frames_signature_follows_content():
+    data = _data()
+    assinatura = data.frames_signature()
+    data.demand_df.loc[0, 'matriculados'] = data.demand_df.loc[0, 'matriculados'] + 1
+    assert data.frames_signature() != assinatura
+
+
+@pytest.mark.parametrize('compact', [True, False])
+def test_from_frames_starts_empty(compact):
+    data = _data()
+    copia = Data.from_frames(data.demand_df, data.curriculum_df, data.camaras_df, compact=compact)
+    assert copia.cache_info() == {'hits': 0, 'misses': 0, 'entries': 0}
+    copia.get_demand_by_component()
+    copia.get_demand_by_component()
+    assert copia.cache_info() == {'hits': 1, 'misses': 1, 'entries': 1}
@@ -0,0 +1,67 @@
+import json
+import os
+import shutil
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from src.demand_store import DemandStore
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RAW = os.path.join(ROOT, 'data', 'raw')
+
+
+def _copy(origem, destino):
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    shutil.copyfile(os.path.join(RAW, origem), destino)
+    return str(destino)
+
+
+def _parts(store):
+    return sorted(os.path.relpath(os.path.join(d, f), store.root)
+                  for d, _, files in os.walk(store.root) for f in files if f.endswith('.parquet'))
+
+
+def test_same_content_from_two_paths_is_stored_once(tmp_path):
+    a = _copy('2024-2.html', tmp_path / 'a' / '2024-2.html')
+    b = _copy('2024-2.html', tmp_path / 'b' / '2024-2.html')
+    store = DemandStore(tmp_path / 'store')
+    assert store.ingest(a, n_jobs=1) == [a]
+    linhas = len(store.load())
+    assert store.ingest(b, n_jobs=1) == []
+    assert len(store.manifest) == 1 and len(_parts(store)) == 1
+    assert len(store.load()) == linhas
+
+    # Reingerir um dos caminhos com outro conteúdo não apaga a parte do outro
+    _copy('2025-1.html', b)
+    os.utime(b)
+    store.ingest(b, n_jobs=1)
+    assert len(_parts(store)) == 2
+    assert sorted(store.periods()) == ['2024-2']
+    assert all(os.path.exists(os.path.join(store.root, e['parte'])) for e in store.manifest.values())
+
+
+def test_changed_known_file_is_refreshed_on_any_ingest(tmp_path):
+    a = _copy('2024-2.html', tmp_path / '2024-2.html')
+    outro = _copy('2025-1.html', tmp_path / '2025-1.html')
+    store = DemandStore(tmp_path / 'store')
+    store.ingest(a, n_jobs=1)
+    parte_antiga = _parts(store)
+
+    with open(a, 'ab') as f:
+        f.write(b'\n')
+    assert set(store.ingest(outro, n_jobs=1)) == {a, outro}
+    assert not set(parte_antiga) & set(_parts(store))
+    assert len(store.manifest) == 2
+
+
+def test_old_path_keyed_manifest_is_upgraded(tmp_path):
+    a = _copy('2024-2.html', tmp_path / 'a' / '2024-2.html')
+    store = DemandStore(tmp_path / 'store')
+    store.ingest(a, n_jobs=1)
+    file_hash, entrada = next(iter(store.manifest.items()))
+    with open(store.manifest_path, 'w', encoding='utf-8') as f:
+        json.dump({a: {'hash': file_hash, 'periodo': entrada['periodo'], 'parte': entrada['parte']}}, f)
+    store = DemandStore(tmp_path / 'store')
+    assert store.manifest == {file_hash: {'periodo': entrada['periodo'], 'parte': entrada['parte'], 'arquivos': [a]}}
+    assert store.ingest(a, n_jobs=1) == []
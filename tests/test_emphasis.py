@@ -0,0 +1,45 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from src.emphasis import N_TRILHAS, TRILHAS, masks_from_columns, parse_grade, popcount, unpack
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_merged_cells_are_split_per_trilha():
+    # Como o camelot entrega obrigatorias.pdf: marcas de várias trilhas na mesma célula
+    df = pd.DataFrame({
+        'Componente Curricular': ['QUÍMICA GERAL', 'continuação do nome', 'OPTATIVA'],
+        'Correquisito': ['@  @  @', np.nan, '*  *  *'],
+        'Equivalência': ['@  @  @  @  @  @  *  @  @', np.nan, '*  *  *  *  *  *  *  *  *'],
+        'Generalista Diurno': ['@  @', np.nan, '*  @'],
+        'Generalista Noturno': ['@  @', np.nan, '*  *'],
+    })
+    masks = masks_from_columns(df)
+    assert popcount(masks).tolist() == [15, 0, 1]
+    assert not unpack(masks)[0, TRILHAS.index('Tecnologia de Computação')]
+    assert unpack(masks)[2, 13]
+
+
+@pytest.mark.parametrize('celulas', [['@  @  @'], ['@@  @  @  @  @  @  @  @  @  @  @  @  @  @  @']])
+def test_rows_with_missing_marks_fail(celulas):
+    with pytest.raises(ValueError, match=str(N_TRILHAS)):
+        masks_from_columns(pd.DataFrame({'Equivalência': celulas}))
+
+
+def test_real_pdf_matches_curated_curriculum():
+    pytest.importorskip('camelot')
+    from src.data_loaders import extrair_tabela_pdf_robusto
+    df = extrair_tabela_pdf_robusto(os.path.join(ROOT, 'data', 'raw', 'obrigatorias.pdf'))
+    assert df is not None
+    assert (df['mascara_obrigatorio'] > 0).sum() > 100
+
+    # Nomes que o camelot não quebrou em duas linhas, comparados com origem_pdf_grade de study2
+    nome = (df['Código'].fillna('') + df['Componente Curricular'].fillna('')).str.replace(r'\s+\d+\s+.*$', '', regex=True).str.strip()
+    pdf = pd.DataFrame({'nome': nome, 'pdf': df['mascara_obrigatorio']})[df['mascara_obrigatorio'] > 0]
+    curriculo = pd.read_excel(os.path.join(ROOT, 'data', 'cleaned', 'study2', 'curriculo.xlsx'))
+    curriculo['esperado'] = parse_grade(curriculo['origem_pdf_grade'], curriculo['obrigatorio_generalista'])
+    comparados = curriculo.merge(pdf.drop_duplicates('nome', keep=False), on='nome')
+    assert len(comparados) >= 20
+    assert (comparados['pdf'] == comparados['esperado']).all()
@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+import pytest
+from statistics import NormalDist
+from src.forecast import MODELS, backtest, forecast
+
+Z95 = NormalDist().inv_cdf(0.975)
+
+
+def _matrix(rows):
+    return pd.DataFrame(rows, index=[f'C{i}' for i in range(len(rows))], dtype=float)
+
+
+def _bounds(result):
+    return result['previsao'].to_numpy(), result['li'].to_numpy(), result['ls'].to_numpy()
+
+
+def test_seasonal_naive_hand_computed():
+    # Resíduos sazonais 14 - 10 e 22 - 20: sigma = sqrt((16 + 4) / 2)
+    matrix = _matrix([[10, 20, 14, 22]])
+    previsao, li, ls = _bounds(forecast(matrix, 'sazonal_ingenuo', horizon=3))
+    sigma = np.sqrt(10) * np.array([1, 1, np.sqrt(2)])
+    np.testing.assert_allclose(previsao, [14, 22, 14])
+    np.testing.assert_allclose(ls - previsao, Z95 * sigma)
+    # Passos 1 e 3 partilham um choque: variância do total 10 * (1 + 1 + 2 + 2 * 1)
+    previsao, li, ls = _bounds(forecast(matrix, 'sazonal_ingenuo', horizon=3, acumulado=True))
+    np.testing.assert_allclose(previsao, [50])
+    np.testing.assert_allclose(ls - previsao, Z95 * np.sqrt(60))
+    np.testing.assert_allclose(previsao - li, Z95 * np.sqrt(60))
+
+
+def test_ses_hand_computed():
+    # Com dois semestres todo alfa erra 1 no ajuste: fica o primeiro da grade (0.05)
+    matrix = _matrix([[0, 1]])
+    previsao, li, ls = _bounds(forecast(matrix, 'ses', horizon=2))
+    np.testing.assert_allclose(previsao, [0.05, 0.05])
+    np.testing.assert_allclose(ls - previsao, Z95 * np.sqrt([1, 1 + 0.05 ** 2]))
+    # Variância do total: 1 + (1 + 0.05²) + 2 * 0.05
+    previsao, li, ls = _bounds(forecast(matrix, 'ses', horizon=2, acumulado=True))
+    np.testing.assert_allclose(previsao, [0.1])
+    np.testing.assert_allclose(ls - previsao, Z95 * np.sqrt(2.1025))
+    # Passeio aleatório: alfa = 1, nível = último valor, sigma = 1
+    previsao, _, ls = _bounds(forecast(_matrix([[1, 2, 3, 4]]), 'ses', horizon=2, acumulado=True))
+    np.testing.assert_allclose(previsao, [8])
+    np.testing.assert_allclose(ls - previsao, Z95 * np.sqrt(1 + 2 + 2 * 1))
+
+
+def test_linear_trend_hand_computed():
+    # y = 1.3 + 0.8 t, resíduos (-0.3, 0.9, -0.9, 0.3): sigma² = 1.8 / 2
+    matrix = _matrix([[1, 3, 2, 4]])
+    previsao, li, ls = _bounds(forecast(matrix, 'tendencia_linear', horizon=2))
+    np.testing.assert_allclose(previsao, [4.5, 5.3])
+    np.testing.assert_allclose(ls - previsao, Z95 * np.sqrt(0.9 * np.array([2.5, 3.7])))
+    # Variância do total: 0.9 * (2 + 2² / 4 + (2.5 + 3.5)² / 5)
+    previsao, li, ls = _bounds(forecast(matrix, 'tendencia_linear', horizon=2, acumulado=True))
+    np.testing.assert_allclose(previsao, [9.8])
+    np.testing.assert_allclose(ls - previsao, Z95 * np.sqrt(0.9 * 10.2))
+
+
+def test_bounds_are_not_negative_and_nan_without_variance():
+    result = forecast(_matrix([[5, 0, 5, 0], [3, 4, 0, 0]]), 'tendencia_linear', horizon=2)
+    assert (result[['previsao', 'li', 'ls']] >= 0).all().all()
+    result = forecast(_matrix([[1, 2]]), 'tendencia_linear', horizon=2, acumulado=True)
+    assert np.isnan(result['li']).all() and np.isnan(result['ls']).all()
+
+
+def test_unknown_model():
+    with pytest.raises(ValueError):
+        forecast(_matrix([[1, 2]]), 'arima')
+
+
+def test_backtest_hand_computed():
+    # Origens 2 e 3: o sazonal erra -2 nas duas, a tendência acerta as duas
+    result = backtest(_matrix([[1, 2, 3, 4]]), horizon=1, min_train=2).set_index('modelo')
+    assert result.index[0] == 'tendencia_linear'
+    assert result.loc['tendencia_linear', 'mae'] == pytest.approx(0)
+    assert result.loc['sazonal_ingenuo', 'n'] == 2
+    assert result.loc['sazonal_ingenuo', 'mae'] == pytest.approx(2)
+    assert result.loc['sazonal_ingenuo', 'rmse'] == pytest.approx(2)
+    assert result.loc['sazonal_ingenuo', 'mape'] == pytest.approx((2 / 3 + 2 / 4) / 2)
+
+
+def test_backtest_with_short_history(capsys):
+    result = backtest(_matrix([[1, 2]]), min_train=2)
+    assert (result['n'] == 0).all() and result['mae'].isna().all()
+    assert 'AVISO' in capsys.readouterr().out
+
+
+def _simulate(model, rng, n, t):
+    ruido = rng.normal(0, 10, size=(n, t))
+    if model == 'sazonal_ingenuo':
+        y = np.empty((n, t))
+        y[:, :2] = 1000 + ruido[:, :2]
+        for j in range(2, t):
+            y[:, j] = y[:, j - 2] + ruido[:, j]
+        return y
+    if model == 'ses':
+        return 1000 + np.cumsum(ruido, axis=1)
+    return 1000 + 5 * np.arange(t)[None, :] + ruido
+
+
+@pytest.mark.parametrize('model', MODELS)
+def test_cumulative_interval_coverage(model):
+    # Séries geradas pelo próprio modelo: o intervalo do total de 4 semestres deve
+    # cobrir ~95% (somar os limites dos passos cobriria bem mais)
+    rng = np.random.default_rng(0)
+    n, t, horizon = 4000, 40, 4
+    y = _simulate(model, rng, n, t + horizon)
+    result = forecast(_matrix(y[:, :t]), model, horizon=horizon, acumulado=True)
+    total = y[:, t:].sum(axis=1)
+    coberto = (result['li'].to_numpy() <= total) & (total <= result['ls'].to_numpy())
+    assert 0.92 <= coberto.mean() <= 0.975
@@ -0,0 +1,77 @@
+import os
+import numpy as np
+import pytest
+from pandas.testing import assert_frame_equal
+from src.data_loaders import Data
+from src.partitions import partition_frames, simulate_partitions, split_budget, turno_key
+from src.sim import Indexes, Simulator
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STUDY2 = os.path.join(ROOT, 'data', 'cleaned', 'study2')
+
+
+@pytest.fixture(scope='module')
+def data():
+    return Data(
+        os.path.join(STUDY2, 'demanda.xlsx'),
+        os.path.join(STUDY2, 'curriculo.xlsx'),
+        os.path.join(STUDY2, 'camaras.xlsx'),
+        use_file_cache=False
+    )
+
+
+def test_split_budget_conserves_the_total():
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        weights = dict(enumerate(rng.random(rng.integers(1, 8)) * (rng.random() > 0.1)))
+        weights[0] = weights[0] + 0.1
+        total = int(rng.integers(0, 200))
+        bolsas = split_budget(total, weights)
+        assert list(bolsas) == list(weights)
+        assert sum(bolsas.values()) == total
+        assert all(b >= 0 for b in bolsas.values())
+
+
+def test_split_budget_hand_computed():
+    # Cotas 6.25, 2.5 e 1.25: a sobra vai para o maior resto
+    assert split_budget(10, {'a': 5, 'b': 2, 'c': 1}) == {'a': 6, 'b': 3, 'c': 1}
+
+
+@pytest.mark.parametrize('weights', [{'a': 0, 'b': 0}, {'a': 3, 'b': -1}, {'a': np.nan, 'b': 1}])
+def test_split_budget_rejects_invalid_weights(weights):
+    with pytest.raises(ValueError):
+        split_budget(10, weights)
+    assert split_budget(0, weights) == {'a': 0, 'b': 0}
+
+
+def test_single_partition_matches_simulator(data):
+    partitions = partition_frames(data.demand_df, data.curriculum_df, data.camaras_df, np.full(len(data.demand_df), 'todos'))
+    df, resumo = simulate_partitions(partitions, total=80, min_by_compulsory=1, backend='serial')
+    esperado = Simulator(data).simulate_by_component_and_practice(Indexes.IP_TEORICA, 80, min_by_compulsory=1)
+    esperado.attrs = {}
+    assert (df.pop('particao') == 'todos').all()
+    assert_frame_equal(df, esperado.reset_index(drop=True))
+    assert resumo['orcamento'].tolist() == [80]
+    assert resumo['bolsas_total'].tolist() == [esperado['bolsas_total'].sum()]
+
+
+def test_backends_give_the_same_result(data):
+    partitions = partition_frames(data.demand_df, data.curriculum_df, data.camaras_df, turno_key(data.demand_df))
+    assert len(partitions) > 1
+    serial = simulate_partitions(partitions, total=80, min_by_compulsory=1, backend='serial')
+    for backend in ('thread', 'process'):
+        df, resumo = simulate_partitions(partitions, total=80, min_by_compulsory=1, backend=backend, max_workers=2)
+        assert_frame_equal(df, serial[0])
+        assert_frame_equal(resumo, serial[1])
+    assert serial[1]['orcamento'].sum() == 80
+    assert (serial[1]['bolsas_total'] <= serial[1]['orcamento']).all()
+
+
+def test_budgets_and_total_are_exclusive(data):
+    partitions = {'todos': data}
+    with pytest.raises(ValueError):
+        simulate_partitions(partitions)
+    with pytest.raises(ValueError):
+        simulate_partitions(partitions, total=10, budgets={'todos': 10})
+    with pytest.raises(ValueError):
+        simulate_partitions(partitions, budgets={'outra': 10})
@@ -0,0 +1,43 @@
+import collections
+import os
+import pytest
+
+pytest.importorskip('matplotlib')
+pytest.importorskip('seaborn')
+
+from src import plotter
+from src.data_loaders import Data
+from src.sim import Indexes, Simulator
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope='module')
+def simulacao():
+    directory = os.path.join(ROOT, 'data', 'cleaned', 'study2')
+    data = Data(
+        os.path.join(directory, 'demanda.xlsx'),
+        os.path.join(directory, 'curriculo.xlsx'),
+        os.path.join(directory, 'camaras.xlsx'),
+        use_file_cache=False
+    )
+    df = Simulator(data).simulate_by_component_and_practice(Indexes.IP_TEORICA, 80, min_by_compulsory=1)
+    return df, Simulator.aggregate_by_area(df)
+
+
+@pytest.mark.parametrize('formats', [('png',), ('png', 'pdf')])
+def test_pdf_report_renders_each_chart_once(simulacao, tmp_path, monkeypatch, formats):
+    chamadas = collections.Counter()
+
+    def contando(name, chart):
+        def wrapper(frames, subplots):
+            chamadas[name] += 1
+            return chart(frames, subplots)
+        return wrapper
+
+    monkeypatch.setattr(plotter, 'CHARTS', {name: contando(name, chart) for name, chart in plotter.CHARTS.items()})
+    report = tmp_path / 'relatorio.pdf'
+    paths = plotter.render_all_simulation_visualizations(*simulacao, tmp_path, formats=formats, n_jobs=1, pdf_report=str(report))
+    assert chamadas == {name: 1 for name in plotter.CHARTS}
+    assert len(paths) == len(plotter.CHARTS) * len(formats) + 1
+    assert report.stat().st_size > 0
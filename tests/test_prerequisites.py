@@ -0,0 +1,129 @@
+from collections import deque
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+import pytest
+from src.data_loaders import Data
+from src.prerequisites import PrerequisiteGraph
+
+# Ciclo A -> B -> C -> A, S exige a si mesmo, losango D1 -> (D2, D3) -> D4, com o
+# ciclo e S levando ao losango e X citado apenas como pré-requisito
+CURRICULO = {
+    'A': 'C',
+    'B': 'A',
+    'C': 'B',
+    'S': 'S',
+    'D1': 'C;S',
+    'D2': 'D1',
+    'D3': 'D1',
+    'D4': 'D2;D3;X',
+    'E': np.nan,
+}
+
+
+def _graph(curriculo):
+    return PrerequisiteGraph(list(curriculo), list(curriculo.values()))
+
+
+def _reference(curriculo):
+    """Métricas por BFS: alcance, componentes fortes por alcance mútuo e profundidade."""
+    dependentes = {}
+    for codigo, pre in curriculo.items():
+        for p in ([] if pd.isna(pre) else pre.split(';')):
+            dependentes.setdefault(p, set()).add(codigo)
+            dependentes.setdefault(codigo, set())
+    nos = set(curriculo) | set(dependentes)
+
+    def alcance(origem):
+        vistos, fila = set(), deque([origem])
+        while fila:
+            for v in dependentes.get(fila.popleft(), ()):
+                if v not in vistos:
+                    vistos.add(v)
+                    fila.append(v)
+        return vistos
+
+    alcances = {u: alcance(u) for u in nos}
+    forte = {u: frozenset({u} | {v for v in alcances[u] if u in alcances[v]}) for u in nos}
+    pre_requisitos = {u: {p for p in nos if u in dependentes.get(p, ())} for u in nos}
+
+    @lru_cache(maxsize=None)
+    def profundidade(componente):
+        acima = {p for u in componente for p in pre_requisitos[u]} - componente
+        return max((profundidade(forte[p]) + 1 for p in acima), default=0)
+
+    direto = {u: sum(u in ([] if pd.isna(pre) else pre.split(';')) for pre in curriculo.values()) for u in nos}
+    return {
+        u: {
+            'transitive': len(alcances[u] - {u}),
+            'depth': profundidade(forte[u]),
+            'in_cycle': len(forte[u]) > 1 or u in dependentes.get(u, ()),
+            'direct': direto[u],
+            'scc': forte[u],
+        }
+        for u in nos
+    }
+
+
+def _check(graph, reference):
+    assert sorted(graph.codes) == sorted(reference)
+    for feature in ('direct', 'transitive', 'depth', 'in_cycle'):
+        esperado = [reference[codigo][feature] for codigo in graph.codes]
+        np.testing.assert_array_equal(getattr(graph, feature), esperado, err_msg=feature)
+    for i, codigo in enumerate(graph.codes):
+        mesmos = set(graph.codes[graph.scc == graph.scc[i]])
+        assert mesmos == reference[codigo]['scc']
+
+
+def test_cycle_self_loop_and_diamond():
+    graph = _graph(CURRICULO)
+    _check(graph, _reference(CURRICULO))
+    assert sorted(sorted(ciclo) for ciclo in graph.cycles()) == [['A', 'B', 'C'], ['S']]
+    # D4 depende de D1 pelos dois lados do losango, mas conta uma vez
+    assert graph.lookup(['A', 'S', 'D1', 'D4', 'X', 'E'], 'transitive').tolist() == [6, 4, 3, 0, 1, 0]
+    assert graph.lookup(['A', 'S', 'D1', 'D4', 'X', 'E'], 'depth').tolist() == [0, 0, 1, 3, 0, 0]
+    assert graph.lookup(['S', 'D1', 'desconhecido'], 'direct').tolist() == [2, 2, 0]
+    assert sorted(graph.dependents('D1')) == ['D2', 'D3']
+    assert sorted(graph.prerequisites('D4')) == ['D2', 'D3', 'X']
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_random_graphs_match_bfs(seed):
+    rng = np.random.default_rng(seed)
+    codigos = [f"C{i}" for i in range(40)]
+    curriculo = {}
+    for codigo in codigos:
+        k = rng.integers(0, 4)
+        pre = rng.choice(codigos + ['EXT1', 'EXT2'], size=k, replace=False)
+        curriculo[codigo] = ';'.join(pre) if k else np.nan
+    _check(_graph(curriculo), _reference(curriculo))
+
+
+def test_cycle_warning_is_printed_once_per_curriculum(capsys):
+    curriculo = pd.DataFrame({
+        'periodo': 1,
+        'codigo': ['WARN1', 'WARN2'],
+        'nome': ['UM', 'DOIS'],
+        'pre_requisitos': ['WARN2', 'WARN1'],
+        'ch_total': [60, 60],
+        'ch_pratica': [0, 30],
+        'obrigatorio_generalista': [1, 0],
+        'obrigatorio_enfase': [14, 0],
+        'camara': ['Matemática', 'Física'],
+    })
+    demanda = pd.DataFrame({
+        'codigo': ['WARN1', 'WARN2'],
+        'nome': ['UM', 'DOIS'],
+        'turma': ['01', '01A'],
+        'horario': ['35M12', '24T34'],
+        'capacidade': [50, 25],
+        'matriculados': [40, 20],
+        'periodo': ['2024-2', '2024-2'],
+    })
+    camaras = pd.DataFrame({'camara': ['Matemática', 'Física'], 'n_professores': [10, 5]})
+    for _ in range(3):
+        Data.from_frames(demanda, curriculo, camaras)
+    assert capsys.readouterr().out.count('Ciclo de pré-requisitos') == 1
+    curriculo.loc[1, 'pre_requisitos'] = 'WARN1;WARN2'
+    Data.from_frames(demanda, curriculo, camaras)
+    assert capsys.readouterr().out.count('Ciclo de pré-requisitos') == 1
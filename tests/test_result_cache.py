@@ -0,0 +1,47 @@
+import os
+import pandas as pd
+import pytest
+from src.result_cache import ResultCache, code_modules
+
+
+def test_code_signature_covers_data_pipeline():
+    modulos = code_modules()
+    for nome in ('sim.py', 'apportionment.py', 'allocation.py', 'data_loaders.py', 'emphasis.py', 'schema.py'):
+        assert nome in modulos
+
+
+def _entry(cache):
+    chave, meta = ResultCache.key('entradas', len, total=10)
+    cache.put(chave, pd.DataFrame({'bolsas_total': [1, 2]}), meta)
+    return chave
+
+
+@pytest.mark.parametrize('conteudo', [b'', b'\x80\x05garbage', b'not a pickle at all'])
+def test_corrupt_entry_is_a_miss_and_removed(tmp_path, conteudo):
+    cache = ResultCache(tmp_path)
+    chave = _entry(cache)
+    path = os.path.join(tmp_path, f"{chave}.pkl")
+    with open(path, 'wb') as f:
+        f.write(conteudo)
+    assert cache.get(chave) is None
+    assert cache.stats()['misses'] == 1
+    assert not os.path.exists(path) and not os.path.exists(os.path.join(tmp_path, f"{chave}.json"))
+
+
+def test_truncated_entry_is_a_miss(tmp_path):
+    cache = ResultCache(tmp_path)
+    chave = _entry(cache)
+    path = os.path.join(tmp_path, f"{chave}.pkl")
+    with open(path, 'rb') as f:
+        dados = f.read()
+    with open(path, 'wb') as f:
+        f.write(dados[:len(dados) // 2])
+    assert cache.get(chave) is None
+    assert cache.entries().empty
+
+
+def test_hit_returns_stored_frame(tmp_path):
+    cache = ResultCache(tmp_path)
+    chave = _entry(cache)
+    assert cache.get(chave)['bolsas_total'].tolist() == [1, 2]
+    assert cache.stats()['hits'] == 1
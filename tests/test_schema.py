@@ -0,0 +1,49 @@
+import os
+import pandas as pd
+import pytest
+from pandas.testing import assert_series_equal
+from src.data_loaders import Components, Data
+from src.forecast import demand_matrix, forecast
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STUDY2 = os.path.join(ROOT, 'data', 'cleaned', 'study2')
+
+
+def _data(compact):
+    return Data(
+        os.path.join(STUDY2, 'demanda.xlsx'),
+        os.path.join(STUDY2, 'curriculo.xlsx'),
+        os.path.join(STUDY2, 'camaras.xlsx'),
+        use_file_cache=False,
+        compact=compact
+    )
+
+
+def test_stacked_df_keeps_plain_dtypes():
+    pytest.importorskip('lxml')
+    components = Components(os.path.join(ROOT, 'data', 'raw', '2024-2.html'), n_jobs=1)
+    dtypes = components.stacked_df.dtypes
+    assert not any(isinstance(dtype, pd.CategoricalDtype) for dtype in dtypes)
+    assert dtypes['matriculados'] == 'int64' and dtypes['capacidade'] == 'int64'
+
+
+def test_compact_frames_give_the_same_tables():
+    compacto, texto = _data(True), _data(False)
+    assert isinstance(compacto.demand_df['codigo'].dtype, pd.CategoricalDtype)
+    for use_elective in (False, True):
+        pd.testing.assert_frame_equal(
+            compacto.get_demand_by_component(use_elective=use_elective),
+            texto.get_demand_by_component(use_elective=use_elective)
+        )
+    pd.testing.assert_frame_equal(compacto.get_demand_by_area(), texto.get_demand_by_area())
+
+
+def test_partial_forecast_over_categorical_codigo_keeps_other_components():
+    data = _data(True)
+    observado = data.get_demand_by_component().set_index('codigo')['matriculados']
+    previsao = forecast(demand_matrix(data.demand_df), 'sazonal_ingenuo', horizon=2, acumulado=True)
+    assert isinstance(previsao['codigo'].dtype, pd.CategoricalDtype)
+    alguns = previsao[previsao['codigo'].astype(str).isin(observado.index[:3])]
+    obtido = data.get_demand_by_component(matriculados=alguns).set_index('codigo')['matriculados']
+    resto = observado.index[3:]
+    assert_series_equal(obtido.loc[resto], observado.loc[resto])
@@ -0,0 +1,86 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from src.data_loaders import Data
+from src.session import SimulationSession
+from src.sim import IP_TEORICA_PESOS, Indexes, Simulator
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STUDY2 = os.path.join(ROOT, 'data', 'cleaned', 'study2')
+COLUNAS_IP = ['prop_matriculados', 'ch_teorica', 'prop_obrigatorio', 'prop_pre_requisito', 'prop_forca_trabalho']
+
+
+@pytest.fixture(scope='module')
+def data():
+    return Data(
+        os.path.join(STUDY2, 'demanda.xlsx'),
+        os.path.join(STUDY2, 'curriculo.xlsx'),
+        os.path.join(STUDY2, 'camaras.xlsx'),
+        use_file_cache=False
+    )
+
+
+def _indices():
+    # Inclui componente sem matriculados, sem carga teórica e câmara sem professores
+    return pd.DataFrame({
+        'prop_matriculados': [0.5, 0.3, 0.0, 0.2, 0.0],
+        'ch_teorica': [60, 30, 60, 0, 90],
+        'prop_obrigatorio': [1.0, 0.5, 0.0, 0.2, 1.0],
+        'prop_pre_requisito': [0.1, 0.0, 0.4, 0.3, 0.2],
+        'prop_forca_trabalho': [0.4, 0.0, 0.3, 0.3, 0.5],
+    })
+
+
+def _ip_ponderado(pesos):
+    """Indexes.IP_TEORICA com os pesos de IP_TEORICA_ARRAY, para o Simulator."""
+    def index_function(df):
+        df['IP'] = Indexes.IP_TEORICA_ARRAY(*(df[coluna].to_numpy(dtype=float) for coluna in COLUNAS_IP), pesos)
+        return df.sort_values(by='IP', ascending=False)
+    return index_function
+
+
+def test_default_pesos_reproduce_ip_teorica():
+    df = _indices()
+    esperado = Indexes.IP_TEORICA(df.copy()).sort_index()['IP'].to_numpy()
+    np.testing.assert_allclose(Indexes.IP_TEORICA_ARRAY(*(df[coluna] for coluna in COLUNAS_IP)), esperado)
+    np.testing.assert_allclose(Indexes.IP_TEORICA_ARRAY(*(df[coluna] for coluna in COLUNAS_IP), dict(IP_TEORICA_PESOS)), esperado)
+
+
+@pytest.mark.parametrize('nome', ['matriculados', 'ch_teorica', 'forca_trabalho'])
+def test_zero_exponent_keeps_zero_factors(nome):
+    # Expoente 0 tira o peso do fator, mas componente com fator nulo continua sem índice
+    df = _indices()
+    ip = Indexes.IP_TEORICA_ARRAY(*(df[coluna] for coluna in COLUNAS_IP), {nome: 0.0})
+    padrao = Indexes.IP_TEORICA_ARRAY(*(df[coluna] for coluna in COLUNAS_IP))
+    np.testing.assert_array_equal(ip == 0, padrao == 0)
+    assert ip.sum() == pytest.approx(1)
+
+
+def test_session_matches_simulator(data):
+    session = SimulationSession(Simulator(data), 80, min_by_compulsory=1)
+    esperado = Simulator(data).simulate_by_component_and_practice(Indexes.IP_TEORICA, 80, min_by_compulsory=1)
+    obtido = session.to_frame().set_index('codigo').sort_index()
+    esperado = esperado.set_index('codigo').sort_index()
+    np.testing.assert_allclose(obtido['IP'], esperado['IP'])
+    for coluna in ('bolsas_pratica', 'bolsas_teorica', 'bolsas_total'):
+        np.testing.assert_array_equal(obtido[coluna], esperado[coluna])
+
+
+@pytest.mark.parametrize('pesos', [{'obrigatorio': 2.0}, {'matriculados': 0.0, 'forca_trabalho': 0.5}, {'ch_teorica': 0.0, 'pre_requisito': 3.0}])
+def test_set_params_matches_a_fresh_simulator(data, pesos):
+    session = SimulationSession(Simulator(data), 80, min_by_compulsory=1)
+    session.set_params(total=120, MAX_ANUAL_MONITOR=300, pesos=pesos)
+    esperado = Simulator(data, MAX_ANUAL_MONITOR=300).simulate_by_component_and_practice(
+        _ip_ponderado(dict(IP_TEORICA_PESOS, **pesos)), 120, min_by_compulsory=1)
+    obtido = session.to_frame().set_index('codigo').sort_index()
+    esperado = esperado.set_index('codigo').sort_index()
+    np.testing.assert_allclose(obtido['IP'], esperado['IP'])
+    for coluna in ('bolsas_pratica', 'bolsas_teorica', 'bolsas_total'):
+        np.testing.assert_array_equal(obtido[coluna], esperado[coluna])
+
+
+def test_set_params_rejects_unknown_pesos(data):
+    session = SimulationSession(Simulator(data), 80)
+    with pytest.raises(ValueError):
+        session.set_params(pesos={'desconhecido': 1.0})
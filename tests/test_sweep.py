@@ -0,0 +1,51 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pytest
+from pandas.testing import assert_frame_equal
+from src.data_loaders import Data
+from src.sim import Indexes, Simulator
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STUDY2 = os.path.join(ROOT, 'data', 'cleaned', 'study2')
+GRID = {'total': [40, 80], 'min_by_compulsory': [0, 1]}
+
+
+@pytest.fixture(scope='module')
+def data():
+    return Data(
+        os.path.join(STUDY2, 'demanda.xlsx'),
+        os.path.join(STUDY2, 'curriculo.xlsx'),
+        os.path.join(STUDY2, 'camaras.xlsx'),
+        use_file_cache=False
+    )
+
+
+@pytest.fixture(scope='module')
+def serial(data):
+    return Simulator(data).sweep(GRID, backend='serial')
+
+
+def test_scenario_matches_simulator(data, serial):
+    cenario = serial[(serial['total'] == 80) & (serial['min_by_compulsory'] == 1)]
+    esperado = Simulator(data).simulate_by_component_and_practice(Indexes.IP_TEORICA, 80, min_by_compulsory=1)
+    assert cenario[esperado.columns].reset_index(drop=True).equals(esperado.reset_index(drop=True))
+
+
+@pytest.mark.parametrize('backend', ['thread', 'process'])
+def test_backends_match_serial(data, serial, backend):
+    assert_frame_equal(Simulator(data).sweep(GRID, backend=backend, max_workers=2), serial)
+
+
+def test_concurrent_sweeps_do_not_share_state(data):
+    # Sweeps simultâneos sobre demandas diferentes: cada um vê apenas a sua
+    fator = np.where(np.arange(len(data.camaras_df)) % 2 == 1, 3, 1)
+    camaras = data.camaras_df.assign(n_professores=data.camaras_df['n_professores'].to_numpy() * fator)
+    outro = Data.from_frames(data.demand_df, data.curriculum_df, camaras)
+    simulators = [Simulator(data), Simulator(outro)] * 4
+    esperados = [simulator.sweep(GRID, backend='serial') for simulator in simulators[:2]]
+    assert not esperados[0]['bolsas_total'].equals(esperados[1]['bolsas_total'])
+    with ThreadPoolExecutor(max_workers=len(simulators)) as executor:
+        resultados = list(executor.map(lambda simulator: simulator.sweep(GRID, backend='thread', max_workers=2), simulators))
+    for i, resultado in enumerate(resultados):
+        assert_frame_equal(resultado, esperados[i % 2])
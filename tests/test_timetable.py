@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+from src.timetable import conflict_pairs, overlaps, parse_horarios, slot_labels, slot_matrix
+
+
+def _labels(horario):
+    return list(np.array(slot_labels())[slot_matrix(parse_horarios([horario]))[0]])
+
+
+def test_night_does_not_spill_into_next_morning():
+    # Segunda à noite (2N34) e terça de manhã (3M12) não se sobrepõem
+    masks = parse_horarios(['2N34', '3M12', '2N1234', '2345M123456 2345T123456 2345N1234'])
+    assert not overlaps(masks[[0]], masks[[1]])[0, 0]
+    assert _labels('2N34') == ['2N3', '2N4']
+    assert _labels('3M12') == ['3M1', '3M2']
+    assert conflict_pairs(masks[:2]).size == 0
+
+
+def test_last_slot_of_each_day_stays_in_its_day():
+    for dia in range(1, 8):
+        assert _labels(f'{dia}N4') == [f'{dia}N4']
+        assert _labels(f'{dia}M1') == [f'{dia}M1']
+
+
+@pytest.mark.parametrize('horario', ['2N5', '2N56', '24N1256 (17/03/2025 - 26/07/2025)'])
+def test_rejects_night_slots_after_n4(horario):
+    with pytest.raises(ValueError, match='N1 a N4'):
+        parse_horarios(['35T12', horario])
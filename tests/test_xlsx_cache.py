@@ -0,0 +1,27 @@
+import pandas as pd
+import pytest
+from src.xlsx_cache import read_excel_cached
+
+pytest.importorskip('pyarrow')
+
+
+def test_sibling_workbooks_keep_their_caches(tmp_path):
+    # 'demanda.2024' começa com o stem 'demanda.': os caches não podem se invalidar
+    for nome, valor in (('demanda.xlsx', 1), ('demanda.2024.xlsx', 2)):
+        pd.DataFrame({'matriculados': [valor]}).to_excel(tmp_path / nome, index=False)
+    for nome in ('demanda.2024.xlsx', 'demanda.xlsx'):
+        assert read_excel_cached(tmp_path / nome)[1]['cache'] == 'miss'
+    for nome, valor in (('demanda.xlsx', 1), ('demanda.2024.xlsx', 2)):
+        df, record = read_excel_cached(tmp_path / nome)
+        assert record['cache'] == 'hit'
+        assert df['matriculados'].tolist() == [valor]
+
+
+def test_changed_workbook_replaces_its_cache(tmp_path):
+    path = tmp_path / 'demanda.xlsx'
+    pd.DataFrame({'matriculados': [1]}).to_excel(path, index=False)
+    read_excel_cached(path)
+    pd.DataFrame({'matriculados': [1, 2]}).to_excel(path, index=False)
+    df, record = read_excel_cached(path)
+    assert record['cache'] == 'miss' and len(df) == 2
+    assert len(list((tmp_path / '.cache').glob('demanda.*.feather'))) == 1